@@ -57,7 +57,12 @@ async def on_ready():
 
     bot.owner_id = int(os.getenv("DISCORD_BOT_OWNER_ID")) if os.getenv("DISCORD_BOT_OWNER_ID") else None
 
+    # Parse the large data files on the store's I/O thread before the cogs start using them.
+    await utils.preload_data()
+
     cogs_to_load = [
+        "cogs.message_router",
+        "cogs.resolver",
         "cogs.economy",
         "cogs.timerole",
         #"cogs.modmail_core",
@@ -144,4 +149,8 @@ async def sync_commands(interaction: discord.Interaction):
 # --- Run the Bot ---
 bot.run(os.getenv("DISCORD_BOT_TOKEN"))
 
+# Write out any data changes still waiting in the store before the process exits.
+utils.activity.save()
+utils.store.close()
+
 
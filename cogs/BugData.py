@@ -137,10 +137,16 @@ SHINY_INSECT_LIST = [
 
 
 def load_bug_collection():
-    return utils.load_data(BUG_COLLECTION_FILE, {})
+    return utils.load_bug_collection()
 
 def save_bug_collection(data):
-    utils.save_data(data, BUG_COLLECTION_FILE)
+    utils.save_bug_collection(data)
+
+def load_user_bug_data(user_id, default_value=None):
+    return utils.load_user_bug_data(user_id, default_value)
+
+def save_user_bug_data(user_id, user_data):
+    utils.save_user_bug_data(user_id, user_data)
 
 def load_shop_items():
     return utils.load_data(SHOP_ITEMS_FILE, [])
@@ -4,7 +4,8 @@ import os
 import json
 import math
 from typing import List, Dict, Any, Union, Optional
-from cogs.BugData import load_bug_collection, save_bug_collection, INSECT_LIST
+from cogs.BugData import load_user_bug_data, save_user_bug_data, INSECT_LIST
+import cogs.utils as utils
 
 class BugbookListView(discord.ui.View):
     def __init__(self, target_user: discord.Member, unique_bugs, total_unique_bugs, bugs_per_page, total_pages, cog):
@@ -24,8 +25,8 @@ class BugbookListView(discord.ui.View):
         bugs_to_display = self.unique_bugs[start_index:end_index]
         
         bug_list_text = []
-        bug_collection = load_bug_collection()
-        caught_bugs_all = bug_collection.get(str(self.target_user.id), {}).get('caught', [])
+        user_data = load_user_bug_data(self.target_user.id, {})
+        caught_bugs_all = user_data.get('caught', [])
         
         for bug_name in bugs_to_display:
             count = caught_bugs_all.count(bug_name)
@@ -33,7 +34,6 @@ class BugbookListView(discord.ui.View):
             emoji = bug_info['emoji'] if bug_info else "⭐"
             bug_list_text.append(f"{emoji} {bug_name} (x{count})")
 
-        user_data = load_bug_collection().get(str(self.target_user.id), {})
         shinies_caught_count = len(user_data.get('shinies_caught', []))
         total_bugs_in_list = len(INSECT_LIST)
 
@@ -114,24 +114,22 @@ class TradeConfirmationView(discord.ui.View):
         
         await interaction.response.defer()
 
-        bug_collection = load_bug_collection()
-        proposer_data = bug_collection.get(str(self.proposer.id), {"caught": []})
-        target_data = bug_collection.get(str(self.target.id), {"caught": []})
+        # Both bug books are checked and swapped in one transaction and saved together.
+        with utils.economy_transaction(self.proposer.id, self.target.id) as txn:
+            proposer_entry = txn.bug_data(self.proposer.id)
+            target_entry = txn.bug_data(self.target.id)
 
-        if self.proposer_bug not in proposer_data['caught'] or self.target_bug not in target_data['caught']:
+            trade_possible = self.proposer_bug in proposer_entry.caught and self.target_bug in target_entry.caught
+            if not trade_possible:
+                txn.abort()
+            else:
+                proposer_entry.swap_bug(self.proposer_bug, self.target_bug)
+                target_entry.swap_bug(self.target_bug, self.proposer_bug)
+
+        if not trade_possible:
             await self.disable_buttons()
             return await interaction.followup.send("The trade could not be completed because one of the bugs is no longer available.", ephemeral=False)
 
-        proposer_data['caught'].remove(self.proposer_bug)
-        proposer_data['caught'].append(self.target_bug)
-
-        target_data['caught'].remove(self.target_bug)
-        target_data['caught'].append(self.proposer_bug)
-        
-        bug_collection[str(self.proposer.id)] = proposer_data
-        bug_collection[str(self.target.id)] = target_data
-        save_bug_collection(bug_collection)
-
         await self.disable_buttons()
         await interaction.followup.send(f"✅ **{self.target.mention}** has accepted the trade! **{self.proposer_bug}** has been traded for **{self.target_bug}**!", ephemeral=False)
 
@@ -0,0 +1,146 @@
+# cogs/activity.py
+
+import collections
+import datetime
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from cogs.data_store import store
+from cogs.message_router import RoutedMessage
+
+# The summary file is rewritten at most this often; on_message never waits on it.
+DEFAULT_SAVE_INTERVAL = 5 * 60
+# Per-minute message counts kept for the recent rate.
+RATE_MINUTES = 60
+
+
+class ActivityTracker:
+    """When each channel last saw a message, and how busy it is, from the gateway stream.
+
+    Every message (bots' too, as the channel history would show them) updates its
+    channel's last-activity time, so "how long has this chat been quiet" is a dict
+    lookup instead of a history request. Channels with histograms also count messages
+    per minute over the last hour, for the current rate, and per hour of the day (UTC),
+    for the peak hours. Histograms are kept for every channel unless a set of channel
+    ids is configured.
+
+    The summary (last activity and hour-of-day counts) is saved to a small file every
+    save_interval seconds and read back on first use, e.g.
+    {"last": {"123": 1760000000}, "hours": {"123": [0, 4, ...]}}. The minute counts only
+    live in memory.
+    """
+
+    def __init__(self, file_path: str, save_interval: float = DEFAULT_SAVE_INTERVAL):
+        self.file_path = file_path
+        self.save_interval = save_interval
+        self.histogram_channels: Optional[Set[int]] = None
+        self._last: Optional[Dict[int, float]] = None
+        self._hours: Dict[int, List[int]] = {}
+        # channel id -> [minute, messages in it], oldest first
+        self._minutes: Dict[int, Deque[List[int]]] = {}
+        self._next_save = 0.0
+        self.messages = 0
+
+    # --- Summary file ---
+
+    def load(self):
+        """Reads the saved summary. Called on first use; later calls do nothing."""
+        if self._last is not None:
+            return
+        data = store.load(self.file_path) or {}
+        self._last = {int(channel_id): when for channel_id, when in data.get("last", {}).items()}
+        self._hours = {int(channel_id): counts for channel_id, counts in data.get("hours", {}).items()
+                       if isinstance(counts, list) and len(counts) == 24}
+        self._next_save = time.monotonic() + self.save_interval
+
+    def save(self):
+        if self._last is None:
+            return
+        self._next_save = time.monotonic() + self.save_interval
+        store.put({
+            "last": {str(channel_id): int(when) for channel_id, when in self._last.items()},
+            "hours": {str(channel_id): list(counts) for channel_id, counts in self._hours.items()}
+        }, self.file_path)
+
+    def reset(self):
+        """Forgets everything in memory, e.g. after a snapshot restore replaced the summary file."""
+        self._last = None
+        self._hours = {}
+        self._minutes = {}
+
+    def configure(self, histogram_channels: Optional[Iterable[int]] = None):
+        """Keeps histograms for these channels only, or for every channel if None."""
+        self.histogram_channels = None if histogram_channels is None else {int(channel_id) for channel_id in histogram_channels}
+
+    # --- Recording ---
+
+    def record(self, channel_id: int, when: Optional[float] = None, count: bool = True):
+        """Notes activity in a channel; count=False only moves the last-activity time (e.g. from history)."""
+        self.load()
+        when = time.time() if when is None else when
+        if when > self._last.get(channel_id, 0):
+            self._last[channel_id] = when
+        if count and (self.histogram_channels is None or channel_id in self.histogram_channels):
+            self.messages += 1
+            self._hours.setdefault(channel_id, [0] * 24)[int(when // 3600 % 24)] += 1
+            minute = int(when // 60)
+            minutes = self._minutes.get(channel_id)
+            if minutes is None:
+                minutes = self._minutes[channel_id] = collections.deque(maxlen=RATE_MINUTES)
+            if minutes and minutes[-1][0] == minute:
+                minutes[-1][1] += 1
+            else:
+                minutes.append([minute, 1])
+        if time.monotonic() >= self._next_save:
+            self.save()
+
+    async def on_message(self, routed: RoutedMessage):
+        self.record(routed.channel_id, routed.message.created_at.timestamp())
+
+    # --- Queries ---
+
+    def last_activity(self, channel_id: int) -> Optional[float]:
+        """Epoch seconds of the channel's last message, or None if none was seen yet."""
+        self.load()
+        return self._last.get(int(channel_id))
+
+    def idle_seconds(self, channel_id: int, now: Optional[float] = None) -> Optional[float]:
+        last = self.last_activity(channel_id)
+        if last is None:
+            return None
+        return max(0.0, (time.time() if now is None else now) - last)
+
+    def quiet_channels(self, channel_ids: Iterable[int], seconds: float, now: Optional[float] = None) -> List[int]:
+        """The channels that have been idle for at least `seconds` (or never seen a message)."""
+        now = time.time() if now is None else now
+        quiet = []
+        for channel_id in channel_ids:
+            idle = self.idle_seconds(channel_id, now)
+            if idle is None or idle >= seconds:
+                quiet.append(channel_id)
+        return quiet
+
+    def message_count(self, channel_id: int, minutes: int = RATE_MINUTES, now: Optional[float] = None) -> int:
+        """Messages in the last `minutes` (at most an hour) in a channel with histograms."""
+        start = int((time.time() if now is None else now) // 60) - minutes + 1
+        return sum(count for minute, count in self._minutes.get(int(channel_id), ()) if minute >= start)
+
+    def peak_hours(self, channel_id: int, top: int = 3) -> List[Tuple[int, int]]:
+        """The busiest (UTC hour, messages) pairs of the channel, busiest first."""
+        self.load()
+        counts = self._hours.get(int(channel_id))
+        if not counts:
+            return []
+        ranked = sorted(range(24), key=lambda hour: counts[hour], reverse=True)
+        return [(hour, counts[hour]) for hour in ranked[:top] if counts[hour]]
+
+    def get_stats(self, channel_id: int) -> Dict[str, Any]:
+        last = self.last_activity(channel_id)
+        return {
+            "last_activity": datetime.datetime.fromtimestamp(last, datetime.timezone.utc) if last else None,
+            "idle_seconds": self.idle_seconds(channel_id),
+            "last_hour": self.message_count(channel_id),
+            "peak_hours": self.peak_hours(channel_id),
+            "total": sum(self._hours.get(int(channel_id), ()))
+        }
+
@@ -160,7 +160,7 @@ class CurrencyGroup(app_commands.Group):
             await interaction.followup.send("Amount must be a positive number.", ephemeral=False)
             return
 
-        utils.update_user_money(member.id, amount)
+        utils.update_user_money(member.id, amount, source="admin")
         await interaction.followup.send(f"Successfully added {amount} coins to {member.mention}'s balance.", ephemeral=False)
 
     @app_commands.command(name="remove", description="Removes currency from a user's balance.")
@@ -171,9 +171,218 @@ class CurrencyGroup(app_commands.Group):
             await interaction.followup.send("Amount must be a positive number.", ephemeral=False)
             return
 
-        utils.update_user_money(member.id, -amount)
+        utils.update_user_money(member.id, -amount, source="admin")
         await interaction.followup.send(f"Successfully removed {amount} coins from {member.mention}'s balance.", ephemeral=False)
 
+    @app_commands.command(name="bulk", description="Adds or removes currency for many users at once.")
+    @app_commands.describe(
+        amount="Coins per user; negative to remove. Wallets never go below 0.",
+        members="Members to include, as mentions or IDs separated by spaces.",
+        role="Include everyone who has this role.",
+        leaderboard="Include a slice of this leaderboard.",
+        ranks="The leaderboard ranks to include, e.g. 1-10.",
+        dry_run="Only preview the changes; nothing is saved."
+    )
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def currency_bulk(self, interaction: discord.Interaction, amount: int, members: Optional[str] = None,
+                            role: Optional[discord.Role] = None,
+                            leaderboard: Optional[Literal["coins", "bugbook", "swears", "sorry", "bumps_sub", "bumps_dom", "hangry_wins"]] = None,
+                            ranks: str = "1-10", dry_run: bool = False):
+        # Mistakes are answered before deferring: once a public response is deferred, the
+        # first followup replaces it and can't be ephemeral.
+        if amount == 0:
+            await interaction.response.send_message("Amount can't be 0.", ephemeral=True)
+            return
+
+        user_ids = set()
+        if members:
+            user_ids.update(int(user_id) for user_id in re.findall(r"\d{15,20}", members))
+        if role:
+            user_ids.update(member.id for member in role.members if not member.bot)
+        if leaderboard:
+            match = re.fullmatch(r"\s*(\d+)\s*(?:-\s*(\d+))?\s*", ranks)
+            if not match or int(match.group(1)) < 1:
+                await interaction.response.send_message("Ranks must look like `1-10` or `5`.", ephemeral=True)
+                return
+            first = int(match.group(1))
+            last = max(first, int(match.group(2) or first))
+            page = utils.leaderboards.get(leaderboard).page(first - 1, last - first + 1)
+            user_ids.update(int(user_id) for _, user_id, _ in page)
+        if not user_ids:
+            await interaction.response.send_message("No users matched. Give members, a role or a leaderboard.", ephemeral=True)
+            return
+
+        await interaction.response.defer(ephemeral=dry_run)
+        result = utils.bulk_update_money({user_id: amount for user_id in user_ids}, dry_run=dry_run)
+
+        title = "Bulk Currency Preview" if dry_run else "Bulk Currency Update"
+        embed = discord.Embed(title=title, color=discord.Color.orange() if dry_run else discord.Color.green())
+        embed.add_field(name="Users changed", value=str(len(result)), inline=True)
+        embed.add_field(name="Coins added", value=str(result.credited), inline=True)
+        embed.add_field(name="Coins removed", value=str(result.debited), inline=True)
+        if result.capped:
+            embed.add_field(name="Stopped at 0", value=f"{len(result.capped)} users didn't have {abs(amount)} coins.", inline=False)
+        lines = [f"<@{user_id}>: {before} → {after}" for user_id, (before, after) in list(result.changes.items())[:15]]
+        if len(result) > len(lines):
+            lines.append(f"...and {len(result) - len(lines)} more.")
+        if lines:
+            embed.add_field(name="Wallets", value="\n".join(lines), inline=False)
+        if dry_run:
+            embed.set_footer(text="Dry run: nothing was saved. Run it again without dry_run to apply it.")
+        await interaction.followup.send(embed=embed, ephemeral=dry_run)
+
+    @app_commands.command(name="report", description="[Staff Only] Shows where coins came from and went to.")
+    @app_commands.describe(period="How far back the report goes.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def currency_report(self, interaction: discord.Interaction, period: Literal["24h", "7d", "30d", "90d"] = "7d"):
+        hours = {"24h": 24, "7d": 7 * 24, "30d": 30 * 24, "90d": 90 * 24}[period]
+        totals = utils.ledger.totals(hours * 60 * 60)
+        added = sum(entry[0] for entry in totals.values())
+        removed = sum(entry[1] for entry in totals.values())
+
+        embed = discord.Embed(title=f"Economy Report ({period})", color=discord.Color.gold())
+        embed.add_field(name="Coins added", value=f"{added:,}", inline=True)
+        embed.add_field(name="Coins removed", value=f"{removed:,}", inline=True)
+        embed.add_field(name="Net", value=f"{added - removed:+,}", inline=True)
+        lines = [
+            f"**{source}**: +{source_added:,} / -{source_removed:,} (net {source_added - source_removed:+,}, {count:,} changes)"
+            for source, (source_added, source_removed, count)
+            in sorted(totals.items(), key=lambda item: abs(item[1][0] - item[1][1]), reverse=True)
+        ]
+        embed.add_field(name="By source", value="\n".join(lines[:10]) or "No coins changed hands.", inline=False)
+        if hours > 24:
+            trend = [
+                f"{datetime.datetime.fromtimestamp(start, datetime.timezone.utc):%a %d %b}: {day_added - day_removed:+,}"
+                for start, day_added, day_removed in utils.ledger.series("daily", 7)
+            ]
+            embed.add_field(name="Net per day", value="\n".join(trend), inline=False)
+        embed.set_footer(text="Totals are kept per hour for 7 days and per day for 90 days.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# Extensions that keep their own in-memory copy of data files and can be reloaded safely.
+SNAPSHOT_RELOADED_EXTENSIONS = ("cogs.counting_game", "cogs.tree")
+
+class StorageGroup(app_commands.Group):
+    def __init__(self):
+        super().__init__(name="storage", description="Inspect the bot's data storage.")
+
+    @app_commands.command(name="stats", description="[Staff Only] Shows how many data file saves were queued, coalesced and written.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def storage_stats(self, interaction: discord.Interaction):
+        stats = utils.store.get_stats()
+        embed = discord.Embed(title="Data Storage", color=discord.Color.blue())
+        embed.add_field(name="Pending files", value=str(stats["pending"]), inline=True)
+        embed.add_field(name="Saves requested", value=str(stats["saves"]), inline=True)
+        embed.add_field(name="Coalesced saves", value=str(stats["coalesced"]), inline=True)
+        embed.add_field(name="Files written", value=str(stats["written"]), inline=True)
+        embed.add_field(name="Flushes", value=str(stats["flushes"]), inline=True)
+        embed.add_field(name="Write errors", value=str(stats["errors"]), inline=True)
+        embed.add_field(name="Economy backend", value=utils.STORAGE_BACKEND, inline=True)
+        embed.add_field(name="Cache hits / misses", value=f"{stats['hits']} / {stats['misses']}", inline=True)
+        embed.add_field(name="Reloaded after hand edits", value=str(stats["reloads"]), inline=True)
+        journal_stats = utils.journal.get_stats()
+        embed.add_field(name="Journal records", value=f"{journal_stats['appended']} appended, {journal_stats['pending']} awaiting compaction", inline=True)
+        lock_stats = utils.key_locks.get_stats()
+        embed.add_field(name="Key locks", value=f"{lock_stats['acquired']} taken, {lock_stats['contended']} contended, {lock_stats['active']} held", inline=True)
+        embed.set_footer(text=f"Flushing every {utils.store.flush_interval:g}s or at {utils.store.max_pending} pending saves. fsync policy: {utils.store.fsync_policy}.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="migrate_sqlite", description="[Staff Only] Imports balances, inventories and bug books from JSON into SQLite.")
+    @app_commands.describe(switch_backend="Switch STORAGE_BACKEND to sqlite once the import has finished.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def migrate_sqlite(self, interaction: discord.Interaction, switch_backend: bool = True):
+        await interaction.response.defer(ephemeral=True)
+        if utils.using_sqlite():
+            await interaction.followup.send("The bot is already using the SQLite backend; re-importing the JSON files would overwrite newer data.", ephemeral=True)
+            return
+
+        try:
+            # Runs on the event loop on purpose: no command can change a balance between the
+            # import and the backend switch.
+            counts = utils.migrate_json_to_sqlite()
+            if switch_backend:
+                utils.update_dynamic_config("STORAGE_BACKEND", "sqlite")
+        except Exception as e:
+            await interaction.followup.send(f"Migration failed: {e}", ephemeral=True)
+            return
+
+        summary = ", ".join(f"{count} {table}" for table, count in counts.items())
+        status = "The bot now uses SQLite." if switch_backend else "Set STORAGE_BACKEND to \"sqlite\" to start using it."
+        await interaction.followup.send(f"Imported {summary} into `{utils.get_sqlite_store().db_path}`. {status}", ephemeral=True)
+
+    @app_commands.command(name="snapshot", description="[Staff Only] Takes a snapshot of every data file now.")
+    @app_commands.describe(reason="A note to find the snapshot by later.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def take_snapshot(self, interaction: discord.Interaction, reason: Optional[str] = None):
+        await interaction.response.defer(ephemeral=True)
+        try:
+            manifest = await utils.take_snapshot_async(reason or f"manual, by {interaction.user}")
+        except Exception as e:
+            await interaction.followup.send(f"Snapshot failed: {e}", ephemeral=True)
+            return
+        await interaction.followup.send(f"Took snapshot `{manifest['name']}` of {len(manifest['files'])} files.", ephemeral=True)
+
+    @app_commands.command(name="snapshots", description="[Staff Only] Lists the kept data snapshots.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def list_snapshots(self, interaction: discord.Interaction):
+        manifests = utils.list_snapshots()
+        if not manifests:
+            await interaction.response.send_message("No snapshots have been taken yet.", ephemeral=True)
+            return
+        lines = []
+        for manifest in manifests[:20]:
+            copied = sum(1 for entry in manifest["files"].values() if entry["stored"] == "copy")
+            lines.append(f"`{manifest['name']}` - {manifest['reason']} ({len(manifest['files'])} files, {copied} copied)")
+        embed = discord.Embed(title="Data Snapshots", description="\n".join(lines), color=discord.Color.blue())
+        embed.set_footer(text=f"Keeping the newest {utils.snapshots.keep}. Restore one with /storage restore.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    async def snapshot_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        return [
+            app_commands.Choice(name=f"{manifest['name']} ({manifest['reason']})"[:100], value=manifest["name"])
+            for manifest in utils.list_snapshots() if current in manifest["name"]
+        ][:25]
+
+    @app_commands.command(name="restore", description="[Staff Only] Puts every data file back to a snapshot, without a restart.")
+    @app_commands.describe(name="The snapshot to restore. The current state is snapshotted first.")
+    @app_commands.autocomplete(name=snapshot_name_autocomplete)
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def restore_snapshot(self, interaction: discord.Interaction, name: str):
+        await interaction.response.defer(ephemeral=True)
+        # These cogs keep state in memory and write it back when unloaded, so they are
+        # unloaded before the files are swapped (their last write lands in the safety
+        # snapshot) and loaded again from the restored files afterwards.
+        unloaded = []
+        for extension in SNAPSHOT_RELOADED_EXTENSIONS:
+            if extension in interaction.client.extensions:
+                try:
+                    await interaction.client.unload_extension(extension)
+                    unloaded.append(extension)
+                except commands.ExtensionError as e:
+                    print(f"Error unloading {extension} before a restore: {e}")
+        try:
+            # Runs on the event loop on purpose: no command may touch the data files
+            # while they are being swapped.
+            restored = utils.restore_snapshot(name)
+        except Exception as e:
+            restored = None
+            error = e
+
+        reloaded = []
+        for extension in unloaded:
+            try:
+                await interaction.client.load_extension(extension)
+                reloaded.append(extension)
+            except commands.ExtensionError as e:
+                print(f"Error loading {extension} after a restore: {e}")
+        if restored is None:
+            await interaction.followup.send(f"Restore failed: {error}", ephemeral=True)
+            return
+        await interaction.followup.send(
+            f"Restored {len(restored)} files from `{name}`. Reloaded: {', '.join(reloaded) or 'nothing'}.",
+            ephemeral=True
+        )
+
 class EmbedConfirmView(ui.View):
     def __init__(self, user_id):
         super().__init__(timeout=180)
@@ -219,12 +428,89 @@ class AdminTools(commands.Cog):
         self.bot = bot
         self.bot.tree.add_command(EmojiGroup())
         self.bot.tree.add_command(CurrencyGroup())
+        self.bot.tree.add_command(StorageGroup())
+        self.snapshot_task.change_interval(minutes=utils.bot_config.get("SNAPSHOT_INTERVAL_MINUTES", 60))
+        self.snapshot_task.start()
+
+    def cog_unload(self):
+        self.snapshot_task.cancel()
+
+    @tasks.loop(minutes=60)
+    async def snapshot_task(self):
+        """Takes the periodic data snapshot; the oldest ones beyond SNAPSHOT_KEEP are pruned."""
+        try:
+            manifest = await utils.take_snapshot_async("scheduled")
+            print(f"Took data snapshot {manifest['name']}.")
+        except Exception as e:
+            print(f"Error taking data snapshot: {e}")
 
     @commands.Cog.listener()
     async def on_ready(self):
         await self.bot.tree.sync()
         print("Commands synced.")
 
+    @app_commands.command(name="messagestats", description="[Staff Only] Shows how often each message handler ran and the time it took.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def message_stats(self, interaction: discord.Interaction):
+        router = utils.message_router
+        embed = discord.Embed(title="Message Handlers", color=discord.Color.blue())
+        for entry in router.get_stats()[:25]:
+            average = entry["seconds"] / entry["calls"] * 1000 if entry["calls"] else 0
+            embed.add_field(
+                name=f"{entry['name']} ({entry['kind']})",
+                value=f"{entry['calls']} calls, {entry['seconds']:.2f}s total, {average:.1f}ms avg, {entry['errors']} errors",
+                inline=False
+            )
+        embed.set_footer(text=f"{router.messages} messages seen, {router.routed_channels()} channels with handlers.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="phrasepools", description="[Staff Only] Shows the pre-generated AI phrase pools for /work and /crime.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def phrase_pool_stats(self, interaction: discord.Interaction):
+        embed = discord.Embed(title="AI Phrase Pools", color=discord.Color.blue())
+        for name, pool in utils.phrase_pools.items():
+            stats = pool.get_stats()
+            embed.add_field(
+                name=f"{name} ({stats['size']}/{pool.capacity})",
+                value=(f"{stats['hit_rate']:.0%} hit rate ({stats['hits']} hits, {stats['misses']} misses)\n"
+                       f"{stats['refills']} refills, {stats['failed_refills']} failed, {stats['generated']} phrases\n"
+                       f"{stats['average_refill_seconds']:.1f}s avg refill, {stats['last_refill_seconds']:.1f}s last"),
+                inline=False
+            )
+        embed.set_footer(text="A miss falls back to the hardcoded phrases.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="resolverstats", description="[Staff Only] Shows how many channel and user lookups were served without the API.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def resolver_stats(self, interaction: discord.Interaction):
+        stats = utils.resolver.get_stats()
+        embed = discord.Embed(title="Channel, Role and User Resolver", color=discord.Color.blue())
+        embed.add_field(name="Lookups", value=str(stats["lookups"]), inline=True)
+        embed.add_field(name="Cache hits", value=f"{stats['hits']} ({stats['hit_rate']:.0%})", inline=True)
+        embed.add_field(name="Gateway cache", value=str(stats["gateway"]), inline=True)
+        embed.add_field(name="REST requests", value=f"{stats['rest']} ({stats['rest_errors']} failed)", inline=True)
+        embed.add_field(name="Invalidations", value=str(stats["invalidations"]), inline=True)
+        embed.add_field(name="Cached objects", value=str(stats["cached"]), inline=True)
+        embed.set_footer(text="Only a miss in both caches costs a REST request.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="chatactivity", description="[Staff Only] Shows when a channel was last active and its busiest hours.")
+    @app_commands.describe(channel="The channel to look at. Defaults to this one.")
+    @app_commands.checks.has_any_role(*utils.ROLE_IDS.get("Staff", []))
+    async def chat_activity(self, interaction: discord.Interaction, channel: Optional[discord.TextChannel] = None):
+        channel = channel or interaction.channel
+        stats = utils.activity.get_stats(channel.id)
+        embed = discord.Embed(title=f"Activity in #{channel.name}", color=discord.Color.blue())
+        if stats["last_activity"] is None:
+            embed.description = "No messages seen in this channel yet."
+        else:
+            embed.add_field(name="Last message", value=discord.utils.format_dt(stats["last_activity"], "R"), inline=True)
+            embed.add_field(name="Last hour", value=f"{stats['last_hour']} messages", inline=True)
+            embed.add_field(name="Counted", value=f"{stats['total']} messages", inline=True)
+            peaks = "\n".join(f"{hour:02d}:00-{hour:02d}:59 UTC: {count} messages" for hour, count in stats["peak_hours"])
+            embed.add_field(name="Busiest hours", value=peaks or "No histogram for this channel.", inline=False)
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="littleaccess", description="[Staff Only] Add or remove the 'Little Access' role from a user.")
     @app_commands.describe(
         user="The user to add or remove the 'Little Access' role from."
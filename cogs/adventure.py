@@ -173,6 +173,11 @@ class Adventure(commands.Cog):
             "Visitor": "Visitor",
             "CrossVerify": "CrossVerify",
         }
+        # Only the channels with a game in them; invalidated whenever active_games changes.
+        utils.message_router.add_route("adventure", self._on_message, lambda: self.active_games.keys(), owner=self)
+
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
 
     async def load_ai_restrictions(self):
         print("DEBUG: Loading AI restrictions for adventure game...")
@@ -202,6 +207,7 @@ class Adventure(commands.Cog):
                 game.current_choices = game_data.get('current_choices', [])
 
                 self.active_games[channel_id] = game
+                utils.message_router.invalidate()
                 print(f"DEBUG: Loaded active game in channel {channel_id} for player {game.player_name}")
             except Exception as e:
                 print(f"ERROR: Error loading game for channel {channel_id_str}: {e}")
@@ -251,6 +257,7 @@ class Adventure(commands.Cog):
         game = self.active_games.get(channel_id)
         if game:
             self.active_games.pop(channel_id, None)
+            utils.message_router.invalidate()
             utils.remove_active_adventure_channel(channel_id)
             self._remove_game_state(channel_id)
 
@@ -333,6 +340,7 @@ class Adventure(commands.Cog):
         )
         game.waiting_for_consent = True
         self.active_games[channel_id] = game
+        utils.message_router.invalidate()
         self._save_game_state(game)
 
         channel = self.bot.get_channel(channel_id)
@@ -551,6 +559,7 @@ class Adventure(commands.Cog):
             game.waiting_for_consent = True
 
             self.active_games[new_thread.id] = game
+            utils.message_router.invalidate()
             utils.set_active_adventure_channel(new_thread.id, game)
             print(f"DEBUG: Game state initialized and added to active games.")
 
@@ -710,8 +719,8 @@ class Adventure(commands.Cog):
             await interaction.followup.send(f"Successfully ended the adventure game for {user.mention}.", ephemeral=True)
         print("DEBUG: End adventure routine finished.")
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    async def _on_message(self, routed):
+        message = routed.message
         print(f"DEBUG: Message received from {message.author.name} in channel {message.channel.id}.")
         if message.author.id == self.bot.user.id:
             print("DEBUG: Message is from this bot, ignoring.")
@@ -23,9 +23,14 @@ class AIFeatures(commands.Cog):
         # FIX: Get the main guild ID from utils to filter events.
         # This assumes utils.py defines MAIN_GUILD_ID.
         self.main_guild_id = utils.MAIN_GUILD_ID
+        # Help queries can come from any channel (or a DM), so this sees every message.
+        utils.message_router.add_scanner("ai help", self._on_message, owner=self, allow_bots=True, guild_only=False)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
+
+    async def _on_message(self, routed):
+        message = routed.message
         if message.author == self.bot.user:
             return
         
@@ -63,6 +68,8 @@ class AIFeatures(commands.Cog):
             - **emoji delete**: "Deletes a custom emoji from the server. A staff member with manage_emojis permissions uses /emoji delete with the emoji they want to remove. The bot verifies the emoji belongs to the server and then deletes it."
             - **currency add**: "Adds a specified amount of currency to a user's balance. A staff member uses /currency add with a member and a positive integer amount. The bot updates the user's balance and sends a confirmation."
             - **currency remove**: "Removes a specified amount of currency from a user's balance. A staff member uses /currency remove with a member and a positive integer amount. The bot deducts the currency from the user's balance and sends a confirmation."
+            - **currency bulk**: "Adds or removes currency for many users at once. A staff member uses /currency bulk with an amount (negative to remove) and any mix of members, a role, and a leaderboard with a rank range like 1-10. Wallets never go below 0. With dry_run the bot only previews the changes; otherwise it saves them all in one go and posts a summary."
+            - **currency report**: "Shows where coins came from and went to. A staff member uses /currency report with a period (24h, 7d, 30d or 90d). The bot lists the coins added and removed by each source (work, crime, daily, admin, ...), the net change, and the net per day for the last week."
             - **set_channel**: "Sets a specific channel ID dynamically for bot functions. An administrator uses /set_channel with a configuration key name and a channel. The bot saves the channel's ID to its dynamic configuration."
             - **unset_channel**: "Removes a specific channel ID from the bot's configuration. An administrator uses /unset_channel with the name of a configuration key, and the bot removes the corresponding channel ID from its dynamic configuration."
             - **set_role**: "Sets a specific role ID dynamically for bot functions. An administrator uses /set_role with a configuration key name and a role. The bot updates the role's ID in its dynamic configuration."
@@ -9,39 +9,27 @@ from typing import List, Dict, Any, Union, Optional
 import datetime
 import random
 import cogs.utils as utils
-from cogs.BugData import INSECT_LIST, SHINY_INSECT_LIST, load_bug_collection, save_bug_collection
+from cogs.models import Inventory, BugBookEntry
+from cogs.BugData import INSECT_LIST, SHINY_INSECT_LIST
 from cogs.BugbookViews import BugbookListView, TradeConfirmationView
 
 
-# The file to store user inventory data
-INVENTORY_FILE = os.path.join("data", "user_inventory.json")
 SHOP_ITEMS_FILE = os.path.join("data", "shop_items.json")
 
-def load_inventory(user_id: int) -> Dict[str, Any]:
-    inventory_data = utils.load_data(INVENTORY_FILE, {})
-    user_inventory = inventory_data.get(str(user_id), {"nets": [{"name": "Basic Net", "durability": 10}], "equipped_net": "Basic Net"})
-    # Initialize the 'stars' key if it doesn't exist
-    if 'stars' not in user_inventory:
-        user_inventory['stars'] = 0
-    # Initialize the 'items' dictionary if it doesn't exist
-    if 'items' not in user_inventory:
-        user_inventory['items'] = {}
-    if 'apple' not in user_inventory['items']:
-        user_inventory['items']['apple'] = 0
-    if 'compost' not in user_inventory['items']:
-        user_inventory['items']['compost'] = 0
-    if 'beehive' not in user_inventory['items']:
-        user_inventory['items']['beehive'] = 0
-    if 'bees' not in user_inventory['items']:
-        user_inventory['items']['bees'] = 0
-    if 'honey' not in user_inventory['items']:
-        user_inventory['items']['honey'] = 0
-    return user_inventory
-
-def save_inventory(user_id: int, inventory: Dict[str, Any]):
-    inventory_data = utils.load_data(INVENTORY_FILE, {})
-    inventory_data[str(user_id)] = inventory
-    utils.save_data(inventory_data, INVENTORY_FILE)
+# New players start out with a basic net.
+STARTER_INVENTORY = {"nets": [{"name": "Basic Net", "durability": 10}], "equipped_net": "Basic Net"}
+
+def load_inventory(user_id: int) -> Inventory:
+    return utils.load_inventory(user_id, STARTER_INVENTORY)
+
+def save_inventory(user_id: int, inventory: Inventory):
+    utils.save_inventory(user_id, inventory)
+
+def load_bug_book_entry(user_id) -> BugBookEntry:
+    return utils.load_bug_book_entry(user_id)
+
+def save_bug_book_entry(user_id, entry: BugBookEntry):
+    utils.save_bug_book_entry(user_id, entry)
 
 def load_shop_items():
     return utils.load_data(SHOP_ITEMS_FILE, [])
@@ -68,6 +56,9 @@ class Bugbook(commands.Cog):
             "Master Net": 0.99
         }
 
+    def cog_unload(self):
+        utils.flush_data()
+
     class ShinyCatchView(View):
         def __init__(self, cog, interaction: discord.Interaction, bug_info: dict):
             # Set timeout to None to make the view permanent
@@ -104,19 +95,15 @@ class Bugbook(commands.Cog):
             self.last_attempt_time = utils.now()
             user_id = str(interaction.user.id)
             
-            bug_collection = load_bug_collection()
-            user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
+            user_data = load_bug_book_entry(user_id)
             
             if random.random() < self.cog.SHINY_CATCH_SUCCESS_CHANCE:
                 caught_bug_name = f"Shiny {self.bug_info['name']}"
                 caught_bug_xp = self.bug_info['xp'] * 2
                 caught_bug_emoji = self.bug_info['emoji']
                 
-                user_data['shinies_caught'].append(caught_bug_name)
-                user_data['caught'].append(caught_bug_name)
-                user_data['xp'] = user_data.get('xp', 0) + caught_bug_xp
-                bug_collection[user_id] = user_data
-                save_bug_collection(bug_collection)
+                user_data.add_catch(caught_bug_name, caught_bug_xp, shiny=True)
+                save_bug_book_entry(user_id, user_data)
 
                 embed = discord.Embed(
                     title="🎉 Shiny Catch Successful!",
@@ -152,10 +139,7 @@ class Bugbook(commands.Cog):
 
     async def _autocomplete_my_bugs(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         user_id = str(interaction.user.id)
-        bug_collection = load_bug_collection()
-        user_data = bug_collection.get(user_id, {"caught": []})
-        caught_bugs = user_data.get('caught', [])
-        unique_bugs = sorted(list(set(caught_bugs)))
+        unique_bugs = sorted(set(load_bug_book_entry(user_id).caught))
         
         return [
             app_commands.Choice(name=bug, value=bug)
@@ -167,10 +151,7 @@ class Bugbook(commands.Cog):
         if not target_user:
             return []
 
-        bug_collection = load_bug_collection()
-        target_user_data = bug_collection.get(str(target_user.id), {"caught": []})
-        caught_bugs = target_user_data.get('caught', [])
-        unique_bugs = sorted(list(set(caught_bugs)))
+        unique_bugs = sorted(set(load_bug_book_entry(target_user.id).caught))
 
         return [
             app_commands.Choice(name=bug, value=bug)
@@ -180,13 +161,7 @@ class Bugbook(commands.Cog):
     async def _autocomplete_nets(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
         user_id = int(interaction.user.id)
         inventory = load_inventory(user_id)
-        nets_list = inventory.get("nets", [])
-        
-        # We need to get the net names from the list of dictionaries and ensure they are unique
-        net_names = sorted(list(set([
-            net['name'] for net in nets_list 
-            if isinstance(net, dict) and 'name' in net
-        ])))
+        net_names = sorted({net.name for net in inventory.nets if net.name})
 
         # Filter the nets based on the current user input
         matching_nets = [net for net in net_names if current.lower() in net.lower()]
@@ -205,13 +180,11 @@ class Bugbook(commands.Cog):
         user_id = str(interaction.user.id)
         inventory = load_inventory(int(user_id))
         
-        # We need to check if the net name exists in the inventory list of dictionaries
-        nets_list = inventory.get("nets", [])
-        if not any(net_item['name'] == net for net_item in nets_list):
+        if inventory.find_net(net) is None:
             await interaction.followup.send(f"❌ You don't own a net named **{net}**!", ephemeral=True)
             return
 
-        inventory["equipped_net"] = net
+        inventory.equipped_net = net
         save_inventory(int(user_id), inventory)
 
         await interaction.followup.send(f"✅ You have equipped the **{net}**!", ephemeral=True)
@@ -222,16 +195,15 @@ class Bugbook(commands.Cog):
         await interaction.response.defer()
         target_user = user or interaction.user
         user_id = str(target_user.id)
-        bug_collection = load_bug_collection()
-        user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
-        caught_bugs = user_data.get('caught', [])
+        user_data = load_bug_book_entry(user_id)
+        caught_bugs = user_data.caught
         
         # Load user inventory to check for the cat and stars
         user_inventory = load_inventory(target_user.id)
         
         if not caught_bugs:
             # Check for cat and stars even if bug book is empty
-            if not user_inventory.get('items', {}).get('caught cat') and user_inventory.get('stars', 0) == 0:
+            if not user_inventory.count('caught cat') and user_inventory.stars == 0:
                 embed = discord.Embed(
                     title=f"Bug Book for {target_user.display_name}",
                     description="This bug book is empty! Go catch some insects at the Tree of Life! 🪲",
@@ -239,7 +211,7 @@ class Bugbook(commands.Cog):
                 )
                 return await interaction.followup.send(embed=embed)
         
-        total_xp = user_data.get('xp', 0)
+        total_xp = user_data.xp
         total_bugs = len(caught_bugs)
         unique_bugs_count = len(set(caught_bugs))
         last_caught_name = caught_bugs[-1] if caught_bugs else "None"
@@ -263,16 +235,16 @@ class Bugbook(commands.Cog):
             embed.add_field(name="Last Insect Caught", value=f"{last_caught_emoji} {last_caught_name}", inline=False)
         
         # Add the dedicated "Caught a Cat" and "Stars" field if the item exists in the inventory
-        if user_inventory.get('items', {}).get('caught cat'):
+        if user_inventory.count('caught cat'):
             embed.add_field(name="Caught a Cat", value="🐱 **Yes!**", inline=False)
         
-        if user_inventory.get('stars', 0) > 0:
-            embed.add_field(name="Stars Collected", value=f"✨ **{user_inventory['stars']}**", inline=False)
+        if user_inventory.stars > 0:
+            embed.add_field(name="Stars Collected", value=f"✨ **{user_inventory.stars}**", inline=False)
         
         # Add a field for apples and compost
-        apples_count = user_inventory.get('items', {}).get('apple', 0)
-        compost_count = user_inventory.get('items', {}).get('compost', 0)
-        honey_count = user_inventory.get('items', {}).get('honey', 0)
+        apples_count = user_inventory.count('apple')
+        compost_count = user_inventory.count('compost')
+        honey_count = user_inventory.count('honey')
         
         resource_text = f"🍎 Apples: **{apples_count}**\n♻️ Compost: **{compost_count}**"
         if honey_count > 0:
@@ -291,9 +263,7 @@ class Bugbook(commands.Cog):
         await interaction.response.defer()
         target_user = user or interaction.user
         user_id = str(target_user.id)
-        bug_collection = load_bug_collection()
-        user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
-        caught_bugs = user_data.get('caught', [])
+        caught_bugs = load_bug_book_entry(user_id).caught
         if not caught_bugs:
             embed = discord.Embed(
                 title=f"Bug Book for {target_user.display_name}",
@@ -303,9 +273,9 @@ class Bugbook(commands.Cog):
             
             # Check for apples and compost even if bug book is empty
             user_inventory = load_inventory(target_user.id)
-            apples_count = user_inventory.get('items', {}).get('apple', 0)
-            compost_count = user_inventory.get('items', {}).get('compost', 0)
-            honey_count = user_inventory.get('items', {}).get('honey', 0)
+            apples_count = user_inventory.count('apple')
+            compost_count = user_inventory.count('compost')
+            honey_count = user_inventory.count('honey')
             
             resource_text = f"🍎 Apples: **{apples_count}**\n♻️ Compost: **{compost_count}**"
             if honey_count > 0:
@@ -351,13 +321,10 @@ class Bugbook(commands.Cog):
         await interaction.response.defer()
         if interaction.user.id == target_user.id:
             return await interaction.followup.send("You cannot trade with yourself!", ephemeral=True)
-        bug_collection = load_bug_collection()
         user_id = str(interaction.user.id)
         target_id = str(target_user.id)
-        user_data = bug_collection.get(user_id, {"caught": []})
-        target_data = bug_collection.get(target_id, {"caught": []})
-        user_bugs = user_data.get('caught', [])
-        target_bugs = target_data.get('caught', [])
+        user_bugs = load_bug_book_entry(user_id).caught
+        target_bugs = load_bug_book_entry(target_id).caught
         if your_bug not in user_bugs:
             return await interaction.followup.send(f"You don't own a **{your_bug}** to trade!", ephemeral=True)
         if their_bug not in target_bugs:
@@ -389,28 +356,26 @@ class Bugbook(commands.Cog):
 
     async def catch_bug(self, interaction: discord.Interaction, tree_cog, tree_state: dict):
         user_id = str(interaction.user.id)
-        bug_collection = load_bug_collection()
-        user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
+        user_data = load_bug_book_entry(user_id)
         user_inventory = load_inventory(interaction.user.id)
         
-        equipped_net_name = user_inventory.get('equipped_net')
+        equipped_net_name = user_inventory.equipped_net
         if not equipped_net_name:
             await interaction.followup.send("❌ You don't have a net equipped! Use `/equip_net` to equip one.", ephemeral=True)
             tree_cog.update_last_used_time(interaction.user.id, "bug_catch")
             return
             
-        equipped_net = next((net for net in user_inventory.get('nets', []) if net['name'] == equipped_net_name), None)
+        equipped_net = user_inventory.equipped()
         
         if not equipped_net:
-            user_inventory['equipped_net'] = None
+            user_inventory.equipped_net = None
             save_inventory(interaction.user.id, user_inventory)
             await interaction.followup.send("❌ Your equipped net could not be found. It has been unequipped. Please equip a new net.", ephemeral=True)
             tree_cog.update_last_used_time(interaction.user.id, "bug_catch")
             return
 
-        if equipped_net['durability'] <= 0:
-            user_inventory['nets'].remove(equipped_net)
-            user_inventory['equipped_net'] = None
+        if equipped_net.broken:
+            user_inventory.discard_net(equipped_net)
             save_inventory(interaction.user.id, user_inventory)
             await interaction.followup.send(f"Your **{equipped_net_name}** has broken! You must purchase and equip a new net.", ephemeral=False)
             tree_cog.update_last_used_time(interaction.user.id, "bug_catch")
@@ -421,13 +386,13 @@ class Bugbook(commands.Cog):
         is_night_time = self.NIGHT_HOURS_UTC[0] <= current_hour_utc or current_hour_utc < self.NIGHT_HOURS_UTC[1]
         
         if is_night_time and random.random() < self.FAIRY_GRANT_CHANCE:
-            user_inventory['stars'] = user_inventory.get('stars', 0) + 1
+            user_inventory.stars += 1
             # Get max durability of the net from the shop items list
             shop_items = load_shop_items()
             equipped_net_shop_data = next((item for item in shop_items if item.get('name') == equipped_net_name), None)
             
             if equipped_net_shop_data:
-                equipped_net['durability'] = equipped_net_shop_data.get('durability', equipped_net['durability'])
+                equipped_net.durability = equipped_net_shop_data.get('durability', equipped_net.durability)
                 
             save_inventory(interaction.user.id, user_inventory)
             
@@ -451,7 +416,7 @@ class Bugbook(commands.Cog):
             return
             
         # Reduce durability for regular catch attempts
-        equipped_net['durability'] -= 1
+        equipped_net.durability -= 1
         save_inventory(interaction.user.id, user_inventory)
 
         # Get the catch chance from the net's name, with a default of 0.85
@@ -493,32 +458,28 @@ class Bugbook(commands.Cog):
             caught_bug_emoji = caught_bug_info['emoji']
             
             apples_found = random.randint(self.MIN_APPLES_PER_CATCH, self.MAX_APPLES_PER_CATCH)
-            user_inventory['items']['apple'] = user_inventory.get('items', {}).get('apple', 0) + apples_found
+            user_inventory.add_item('apple', apples_found)
             save_inventory(interaction.user.id, user_inventory)
             
-            user_data['caught'].append(caught_bug_name)
-            user_data['xp'] = user_data.get('xp', 0) + caught_bug_xp
-            bug_collection[user_id] = user_data
-            save_bug_collection(bug_collection)
+            user_data.add_catch(caught_bug_name, caught_bug_xp)
+            save_bug_book_entry(user_id, user_data)
 
             # Check for broken net after durability is reduced
-            if equipped_net['durability'] <= 0:
-                user_inventory['nets'].remove(equipped_net)
-                user_inventory['equipped_net'] = None
+            if equipped_net.broken:
+                user_inventory.discard_net(equipped_net)
                 save_inventory(interaction.user.id, user_inventory)
                 await interaction.followup.send(f"**{interaction.user.mention}** caught a **{caught_bug_name}** {caught_bug_emoji} and earned **{caught_bug_xp}** XP! They also found **{apples_found}** apples 🍎! Their net, a **{equipped_net_name}**, has **broken!** You must purchase and equip a new net.", ephemeral=False)
             else:
-                await interaction.followup.send(f"**{interaction.user.mention}** caught a **{caught_bug_name}** {caught_bug_emoji} and earned **{caught_bug_xp}** XP! They also found **{apples_found}** apples 🍎! Their net, a **{equipped_net_name}**, has **{equipped_net['durability']}** durability left.")
+                await interaction.followup.send(f"**{interaction.user.mention}** caught a **{caught_bug_name}** {caught_bug_emoji} and earned **{caught_bug_xp}** XP! They also found **{apples_found}** apples 🍎! Their net, a **{equipped_net_name}**, has **{equipped_net.durability}** durability left.")
         
         else:
             # Check for broken net after durability is reduced
-            if equipped_net['durability'] <= 0:
-                user_inventory['nets'].remove(equipped_net)
-                user_inventory['equipped_net'] = None
+            if equipped_net.broken:
+                user_inventory.discard_net(equipped_net)
                 save_inventory(interaction.user.id, user_inventory)
                 await interaction.followup.send(f"**{interaction.user.mention}** tried to catch a bug with their **{equipped_net_name}**, but it got away! Their net has **broken!** You must purchase and equip a new net.")
             else:
-                await interaction.followup.send(f"**{interaction.user.mention}** tried to catch a bug with their **{equipped_net_name}**, but it got away! Their net has **{equipped_net['durability']}** durability left.")
+                await interaction.followup.send(f"**{interaction.user.mention}** tried to catch a bug with their **{equipped_net_name}**, but it got away! Their net has **{equipped_net.durability}** durability left.")
         
         # Bee Decay Logic: Remove a bee with every catch attempt
         beehive_state = tree_state.get('beehive', {})
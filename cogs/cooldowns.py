@@ -0,0 +1,121 @@
+# cogs/cooldowns.py
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from cogs import journal
+
+# Expired entries are swept out of the file at most this often.
+DEFAULT_COMPACT_INTERVAL = 6 * 60 * 60
+
+
+class CooldownBook:
+    """Per-user cooldowns for every command, in one journaled file that survives restarts.
+
+    The file maps bucket -> user id -> the epoch second the user last used it, e.g.
+    {"crime": {"1234": 1760000000}}. It is read once; checks are dict lookups and each
+    use is one journal append. Entries whose cooldown has run out are ignored on sight
+    and swept from the file every compact_interval seconds.
+
+    A bucket is defined with its cooldown. Buckets whose cooldown changes at run time
+    (the tree's shrinks as it grows) are defined with the longest one, which is how long
+    their entries are kept, and pass the current cooldown to each check.
+    """
+
+    def __init__(self, file_path: str, legacy: Optional[Callable[[], Dict[str, Dict[str, int]]]] = None,
+                 compact_interval: float = DEFAULT_COMPACT_INTERVAL):
+        self.file_path = file_path
+        self.compact_interval = compact_interval
+        self._legacy = legacy
+        self._journal = journal.register(file_path)
+        self._seconds: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        self._next_compaction = 0.0
+
+    def define(self, bucket: str, seconds: float):
+        self._seconds[bucket] = seconds
+
+    def load(self):
+        """Reads the file now, importing the legacy cooldowns if this is its first run."""
+        with self._lock:
+            self._data()
+
+    def _data(self) -> Dict[str, Dict[str, int]]:
+        data = self._journal.load(None)
+        if not data and self._legacy is not None:
+            # First run with this file: carry over the cooldowns the old files held.
+            legacy, self._legacy = self._legacy, None
+            imported = legacy()
+            if imported:
+                self._journal.save(imported)
+                data = self._journal.load(None)
+        return data
+
+    def _maybe_compact(self, now: float):
+        if now >= self._next_compaction:
+            self._next_compaction = now + self.compact_interval
+            self.compact(now)
+
+    def last_used(self, bucket: str, user_id: Any) -> Optional[int]:
+        with self._lock:
+            return self._data().get(bucket, {}).get(str(user_id))
+
+    def remaining(self, bucket: str, user_id: Any, seconds: Optional[float] = None, now: Optional[float] = None) -> float:
+        """Seconds until the user may use the bucket again; 0 if they may now."""
+        now = time.time() if now is None else now
+        seconds = self._seconds[bucket] if seconds is None else seconds
+        with self._lock:
+            self._maybe_compact(now)
+            last_used = self._data().get(bucket, {}).get(str(user_id))
+        if last_used is None:
+            return 0.0
+        return max(0.0, last_used + seconds - now)
+
+    def use(self, bucket: str, user_id: Any, now: Optional[float] = None):
+        """Starts the user's cooldown for the bucket."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._data()
+            self._journal.set([bucket, str(user_id)], int(now))
+
+    def try_use(self, bucket: str, user_id: Any, seconds: Optional[float] = None) -> float:
+        """Starts the cooldown if it has run out and returns 0, or returns the seconds left.
+
+        Checking and starting happen under one lock, so two uses at once can't both pass.
+        """
+        now = time.time()
+        with self._lock:
+            remaining = self.remaining(bucket, user_id, seconds, now)
+            if remaining <= 0:
+                self.use(bucket, user_id, now)
+            return remaining
+
+    def reset(self, bucket: str, user_id: Any = None):
+        """Clears one user's cooldown for the bucket, or everyone's."""
+        with self._lock:
+            data = self._data()
+            if user_id is None:
+                data.pop(bucket, None)
+            else:
+                data.get(bucket, {}).pop(str(user_id), None)
+            self._journal.save(data)
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Removes the entries whose cooldown has run out and returns how many there were."""
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock:
+            data = self._data()
+            for bucket, users in data.items():
+                # Undefined buckets keep their entries: nothing says when those expire.
+                seconds = self._seconds.get(bucket)
+                if seconds is None:
+                    continue
+                expired = [user_id for user_id, last_used in users.items() if last_used + seconds <= now]
+                for user_id in expired:
+                    del users[user_id]
+                removed += len(expired)
+            if removed:
+                self._journal.save(data)
+        return removed
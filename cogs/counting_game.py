@@ -1,28 +1,105 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 import random
 import datetime
 import cogs.utils as utils
 import asyncio
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
+
+class CountingChannel:
+    """The state of one counting channel, kept in memory between checkpoints.
+
+    Every change to it is made without awaiting anything, so messages that arrive in a
+    burst are judged one after the other against an up-to-date count.
+    """
+
+    __slots__ = ("channel_id", "current_count", "last_counter_id", "guess_game_active", "guess_game_number",
+                 "guess_attempts", "lucky_number", "lucky_number_active")
+
+    def __init__(self, channel_id: int, state: Dict[str, Any]):
+        self.channel_id = channel_id
+        self.current_count = state.get('current_count', 0)
+        self.last_counter_id = state.get('last_counter_id')
+        self.guess_game_active = state.get('guess_game_active', False)
+        self.guess_game_number = state.get('guess_game_number', 0)
+        self.guess_attempts = state.get('guess_attempts', 0)
+        self.lucky_number = state.get('lucky_number', 0)
+        self.lucky_number_active = state.get('lucky_number_active', False)
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "current_count": self.current_count,
+            "last_counter_id": self.last_counter_id,
+            "guess_game_active": self.guess_game_active,
+            "guess_game_number": self.guess_game_number,
+            "guess_attempts": self.guess_attempts,
+            "lucky_number": self.lucky_number,
+            "lucky_number_active": self.lucky_number_active
+        }
+
+    def next_count(self, mode: str) -> int:
+        return self.current_count + 1 if mode == 'incremental' else self.current_count - 1
+
+    def end_side_games(self):
+        self.guess_game_active = False
+        self.guess_game_number = 0
+        self.guess_attempts = 0
+        self.lucky_number = 0
+        self.lucky_number_active = False
+
+    def reset(self, sudden_death: bool = True):
+        if sudden_death:
+            self.current_count = 0
+        self.last_counter_id = None
+        self.end_side_games()
+
 
 class CountingGame(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Load the initial state from the saved file
-        counting_state = utils.load_counting_game_state()
-        self.bot.counting_channel_id = counting_state.get('counting_channel_id')
-        self.bot.current_count = counting_state.get('current_count', 0)
-        self.bot.last_counter_id = counting_state.get('last_counter_id')
-        self.bot.guess_game_active = counting_state.get('guess_game_active', False)
-        self.bot.guess_game_number = counting_state.get('guess_game_number', 0)
-        self.bot.guess_attempts = counting_state.get('guess_attempts', 0)
-        self.bot.lucky_number = counting_state.get('lucky_number', 0)
-        self.bot.lucky_number_active = counting_state.get('lucky_number_active', False)
-        print("DEBUG: Loaded counting game state:", counting_state)
+        self.channels: Dict[int, CountingChannel] = {
+            channel_id: CountingChannel(channel_id, state) for channel_id, state in utils.load_counting_channels().items()
+        }
+        print(f"DEBUG: Loaded counting game state for channels: {list(self.channels)}")
         self.main_guild_id = utils.MAIN_GUILD_ID
+        # Read once and dropped by /countpref, instead of looked up for every number.
+        self._preferences: Optional[Dict[str, Any]] = None
+        # Counts are written every COUNTING_CHECKPOINT_SECONDS, every COUNTING_CHECKPOINT_EVERY
+        # counts and straight away when a game event or a miscount changes the state.
+        self._dirty = False
+        self.checkpoint_every = max(1, int(utils.bot_config.get("COUNTING_CHECKPOINT_EVERY", 25)))
+        # Other bots' messages count too, as they always have.
+        utils.message_router.add_route("counting", self._on_message, lambda: self.channels.keys(), owner=self, allow_bots=True)
+        self.checkpoint_task.change_interval(seconds=utils.bot_config.get("COUNTING_CHECKPOINT_SECONDS", 10))
+        self.checkpoint_task.start()
+
+    def cog_unload(self):
+        self.checkpoint_task.cancel()
+        utils.message_router.remove_owner(self)
+        self._checkpoint()
+        utils.flush_data()
+
+    def _checkpoint(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        utils.save_counting_channels({channel_id: channel.to_state() for channel_id, channel in self.channels.items()})
+
+    def _changed(self, checkpoint: bool = False):
+        self._dirty = True
+        if checkpoint:
+            self._checkpoint()
+
+    @tasks.loop(seconds=10)
+    async def checkpoint_task(self):
+        self._checkpoint()
+
+    def _get_preferences(self) -> Dict[str, Any]:
+        if self._preferences is None:
+            self._preferences = dict(utils.load_counting_preferences())
+        return self._preferences
 
     async def setup_game_state(self):
         # The state is already loaded in __init__
@@ -37,259 +114,201 @@ class CountingGame(commands.Cog):
         await self.setup_game_state()
 
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
+    async def _on_message(self, routed):
+        message = routed.message
         if message.guild and message.guild.id != self.main_guild_id:
             return
             
-        if message.author == self.bot.user or self.bot.counting_channel_id is None:
+        if message.author == self.bot.user:
             return
 
-        if message.channel.id == self.bot.counting_channel_id:
-            preferences = utils.load_counting_preferences()
-            consecutive_counting_enabled = preferences.get('consecutive_counting', False)
-            role_on_miscount_enabled = preferences.get('role_on_miscount', True)
-            delete_incorrect_enabled = preferences.get('delete_incorrect', False)
-            sudden_death_enabled = preferences.get('sudden_death', True)
-            mode = preferences.get('mode', 'incremental')
+        channel = self.channels.get(routed.channel_id)
+        if channel is None:
+            return
 
-            try:
-                msg_number = int(message.content)
-            except ValueError:
-                return
+        try:
+            msg_number = int(message.content)
+        except ValueError:
+            return
 
-            # Check for lucky number first if it's active
-            if self.bot.lucky_number_active and msg_number == self.bot.lucky_number:
-                utils.update_user_money(message.author.id, 25)
-
-                await message.channel.send(f"🍀 **LUCKY NUMBER!** {message.author.mention} hit the lucky number **{self.bot.lucky_number}** and earned a bonus of **25 coins**!")
-                
-                self.bot.lucky_number_active = False
-                self.bot.lucky_number = 0
-                
-                # Update the count to the lucky number and continue
-                self.bot.current_count = msg_number
-                self.bot.last_counter_id = message.author.id
-
-                utils.save_counting_game_state(
-                    {
-                        "counting_channel_id": self.bot.counting_channel_id,
-                        "current_count": self.bot.current_count,
-                        "last_counter_id": self.bot.last_counter_id,
-                        "guess_game_active": self.bot.guess_game_active,
-                        "guess_game_number": self.bot.guess_game_number,
-                        "guess_attempts": self.bot.guess_attempts,
-                        "lucky_number": self.bot.lucky_number,
-                        "lucky_number_active": self.bot.lucky_number_active
-                    }
-                )
-                await message.add_reaction('🍀')
-                return
+        preferences = self._get_preferences()
+        consecutive_counting_enabled = preferences.get('consecutive_counting', False)
+        role_on_miscount_enabled = preferences.get('role_on_miscount', True)
+        delete_incorrect_enabled = preferences.get('delete_incorrect', False)
+        sudden_death_enabled = preferences.get('sudden_death', True)
+        mode = preferences.get('mode', 'incremental')
 
-            if self.bot.guess_game_active:
-                if msg_number == self.bot.guess_game_number:
-                    utils.update_user_money(message.author.id, 50)
-                    next_count_after_guess = self.bot.current_count + 1 if mode == 'incremental' else self.bot.current_count - 1
-                    
-                    await message.channel.send(f"🎉 **Congratulations {message.author.mention}!** You guessed **{self.bot.guess_game_number}** and won **50 coins**! Let's continue counting from **{next_count_after_guess}**!")
-                    
-                    self.bot.guess_game_active = False
-                    # The count does not advance here; the next count should be the sequential one.
-                    # self.bot.current_count remains the same
-                    # self.bot.last_counter_id remains the same as the last person who counted
-                    self.bot.guess_game_number = 0
-                    self.bot.guess_attempts = 0
-                    self.bot.lucky_number = 0
-                    self.bot.lucky_number_active = False
-                    utils.save_counting_game_state(
-                        {
-                            "counting_channel_id": self.bot.counting_channel_id,
-                            "current_count": self.bot.current_count,
-                            "last_counter_id": self.bot.last_counter_id,
-                            "guess_game_active": self.bot.guess_game_active,
-                            "guess_game_number": self.bot.guess_game_number,
-                            "guess_attempts": self.bot.guess_attempts,
-                            "lucky_number": self.bot.lucky_number,
-                            "lucky_number_active": self.bot.lucky_number_active
-                        }
-                    )
-                    await message.add_reaction('🎯')
+        # Check for lucky number first if it's active
+        if channel.lucky_number_active and msg_number == channel.lucky_number:
+            lucky_number = channel.lucky_number
+            channel.lucky_number_active = False
+            channel.lucky_number = 0
+            # Update the count to the lucky number and continue
+            channel.current_count = msg_number
+            channel.last_counter_id = message.author.id
+            self._changed(checkpoint=True)
+
+            utils.update_user_money(message.author.id, 25, source="lucky_number")
+            await message.channel.send(f"🍀 **LUCKY NUMBER!** {message.author.mention} hit the lucky number **{lucky_number}** and earned a bonus of **25 coins**!")
+            await message.add_reaction('🍀')
+            return
+
+        if channel.guess_game_active:
+            if msg_number == channel.guess_game_number:
+                guessed_number = channel.guess_game_number
+                # The count does not advance here; the next count should be the sequential one.
+                next_count_after_guess = channel.next_count(mode)
+                channel.end_side_games()
+                self._changed(checkpoint=True)
+
+                utils.update_user_money(message.author.id, 50, source="guess_game")
+                await message.channel.send(f"🎉 **Congratulations {message.author.mention}!** You guessed **{guessed_number}** and won **50 coins**! Let's continue counting from **{next_count_after_guess}**!")
+                await message.add_reaction('🎯')
+            else:
+                channel.guess_attempts += 1
+                remaining_attempts = 3 - channel.guess_attempts
+
+                if remaining_attempts <= 0:
+                    guessed_number = channel.guess_game_number
+                    channel.reset()
+                    self._changed(checkpoint=True)
+                    await message.channel.send(f"❌ **Sorry, {message.author.mention}**, you're out of chances! The number was **{guessed_number}**. The count is now reset to **1**.")
                 else:
-                    self.bot.guess_attempts += 1
-                    remaining_attempts = 3 - self.bot.guess_attempts
-
-                    if remaining_attempts <= 0:
-                        await message.channel.send(f"❌ **Sorry, {message.author.mention}**, you're out of chances! The number was **{self.bot.guess_game_number}**. The count is now reset to **1**.")
-                        self.bot.current_count = 0
-                        self.bot.last_counter_id = None
-                        self.bot.guess_game_active = False
-                        self.bot.guess_game_number = 0
-                        self.bot.guess_attempts = 0
-                        self.bot.lucky_number = 0
-                        self.bot.lucky_number_active = False
-                        utils.save_counting_game_state(
-                            {
-                                "counting_channel_id": self.bot.counting_channel_id,
-                                "current_count": self.bot.current_count,
-                                "last_counter_id": self.bot.last_counter_id,
-                                "guess_game_active": self.bot.guess_game_active,
-                                "guess_game_number": self.bot.guess_game_number,
-                                "guess_attempts": self.bot.guess_attempts,
-                                "lucky_number": self.bot.lucky_number,
-                                "lucky_number_active": self.bot.lucky_number_active
-                            }
-                        )
-                    else:
-                        hint = "higher" if self.bot.guess_game_number > msg_number else "lower"
-                        await message.channel.send(f"❌ **Incorrect guess, {message.author.mention}**! The number is **{hint}** than your guess. You have **{remaining_attempts}** chances left.")
-                        utils.save_counting_game_state(
-                            {
-                                "counting_channel_id": self.bot.counting_channel_id,
-                                "current_count": self.bot.current_count,
-                                "last_counter_id": self.bot.last_counter_id,
-                                "guess_game_active": self.bot.guess_game_active,
-                                "guess_game_number": self.bot.guess_game_number,
-                                "guess_attempts": self.bot.guess_attempts,
-                                "lucky_number": self.bot.lucky_number,
-                                "lucky_number_active": self.bot.lucky_number_active
-                            }
-                        )
-                return
+                    hint = "higher" if channel.guess_game_number > msg_number else "lower"
+                    self._changed(checkpoint=True)
+                    await message.channel.send(f"❌ **Incorrect guess, {message.author.mention}**! The number is **{hint}** than your guess. You have **{remaining_attempts}** chances left.")
+            return
 
-            next_count = self.bot.current_count + 1 if mode == 'incremental' else self.bot.current_count - 1
-
-            if not consecutive_counting_enabled and message.author.id == self.bot.last_counter_id:
-                try:
-                    if delete_incorrect_enabled:
-                        await message.delete()
-                except discord.Forbidden:
-                    pass
-                
-                utils.update_user_money(message.author.id, -10)
-                current_balance = utils.get_user_money(message.author.id)
-                await message.channel.send(f"🚫 **{message.author.mention}**, you can't count twice in a row! You lost 10 coins. Your new balance is {current_balance}.")
-                return
+        next_count = channel.next_count(mode)
+
+        if not consecutive_counting_enabled and message.author.id == channel.last_counter_id:
+            try:
+                if delete_incorrect_enabled:
+                    await message.delete()
+            except discord.Forbidden:
+                pass
+            
+            utils.update_user_money(message.author.id, -10, source="counting")
+            current_balance = utils.get_user_money(message.author.id)
+            await message.channel.send(f"🚫 **{message.author.mention}**, you can't count twice in a row! You lost 10 coins. Your new balance is {current_balance}.")
+            return
+
+        if msg_number != next_count:
+            channel.reset(sudden_death_enabled)
+            self._changed(checkpoint=True)
 
-            if msg_number != next_count:
-                if role_on_miscount_enabled:
-                    role_name = "I can't count"
-                    role = discord.utils.get(message.guild.roles, name=role_name)
-                    if not role:
-                        try:
-                            role = await message.guild.create_role(name=role_name, reason="Role for miscounting in the counting game.")
-                            print(f"Created new role: {role_name}")
-                        except discord.Forbidden:
-                            print(f"Failed to create role '{role_name}'. Bot lacks permissions.")
-                            role = None
-
-                    if role and message.guild.me.top_role > role:
-                        try:
-                            await message.author.add_roles(role, reason="Miscounted in counting game.")
-                            await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**. You now have the '{role_name}' role for 60 seconds.")
-                            self.bot.loop.create_task(self.remove_role_after_delay(message.author, role, 60))
-                        except discord.Forbidden:
-                            print(f"Failed to add role '{role_name}' to {message.author}. Bot lacks permissions or role hierarchy is wrong.")
-                            await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**.")
-                    else:
+            if role_on_miscount_enabled:
+                role_name = "I can't count"
+                role = discord.utils.get(message.guild.roles, name=role_name)
+                if not role:
+                    try:
+                        role = await message.guild.create_role(name=role_name, reason="Role for miscounting in the counting game.")
+                        print(f"Created new role: {role_name}")
+                    except discord.Forbidden:
+                        print(f"Failed to create role '{role_name}'. Bot lacks permissions.")
+                        role = None
+
+                if role and message.guild.me.top_role > role:
+                    try:
+                        await message.author.add_roles(role, reason="Miscounted in counting game.")
+                        await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**. You now have the '{role_name}' role for 60 seconds.")
+                        self.bot.loop.create_task(self.remove_role_after_delay(message.author, role, 60))
+                    except discord.Forbidden:
+                        print(f"Failed to add role '{role_name}' to {message.author}. Bot lacks permissions or role hierarchy is wrong.")
                         await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**.")
                 else:
                     await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**.")
-                
-                if sudden_death_enabled:
-                    self.bot.current_count = 0
-                
-                self.bot.last_counter_id = None
-                self.bot.guess_game_active = False
-                self.bot.guess_game_number = 0
-                self.bot.guess_attempts = 0
-                self.bot.lucky_number = 0
-                self.bot.lucky_number_active = False
-                utils.save_counting_game_state(
-                    {
-                        "counting_channel_id": self.bot.counting_channel_id,
-                        "current_count": self.bot.current_count,
-                        "last_counter_id": self.bot.last_counter_id,
-                        "guess_game_active": self.bot.guess_game_active,
-                        "guess_game_number": self.bot.guess_game_number,
-                        "guess_attempts": self.bot.guess_attempts,
-                        "lucky_number": self.bot.lucky_number,
-                        "lucky_number_active": self.bot.lucky_number_active
-                    }
-                )
-                return
-            
-            user_counted_before = utils.check_if_user_counted(message.author.id)
-            if not user_counted_before:
-                utils.update_user_money(message.author.id, utils.FIRST_COUNT_REWARD)
-                await utils.add_role_to_member(message.author, utils.FIRST_COUNT_ROLE)
-                
-                embed = discord.Embed(
-                    title="🏆 Achievement Unlocked: First Count!",
-                    description=f"Congratulations, {message.author.mention}! You've made your first count in the server's counting game. Many more to come!",
-                    color=discord.Color.gold()
-                )
-                embed.add_field(name="Reward", value=f"<a:starcoin:1280590254935380038> {utils.FIRST_COUNT_REWARD} coins")
-                embed.set_thumbnail(url=message.author.display_avatar.url)
-                embed.set_footer(text="Keep counting!")
-                await message.channel.send(embed=embed)
-                
-                utils.set_user_counted(message.author.id)
-
-            self.bot.current_count = next_count
-            self.bot.last_counter_id = message.author.id
-            
-            await message.add_reaction('✅')
-            
-            utils.update_user_money(message.author.id, 1)
-
-            if not self.bot.lucky_number_active:
-                if self.bot.current_count == 1:
-                    self.bot.lucky_number = random.randint(1, 20)
-                    self.bot.lucky_number_active = True
-                    await message.channel.send(f"✨ A new lucky number has been chosen! The next person to count **{self.bot.lucky_number}** will win **25 coins**!")
-                elif self.bot.current_count > 0 and self.bot.current_count % 20 == 0:
-                    self.bot.lucky_number = random.randint(self.bot.current_count + 1, self.bot.current_count + 20)
-                    self.bot.lucky_number_active = True
-                    await message.channel.send(f"✨ A new lucky number has been chosen! The next person to count **{self.bot.lucky_number}** will win **25 coins**!")
+            else:
+                await message.channel.send(f"💔 **Oh no, {message.author.mention} ruined the count!** The correct number was **{next_count}**.")
+            return
+
+        channel.current_count = next_count
+        channel.last_counter_id = message.author.id
+
+        # Marked before the first await, so a burst can't reward the same first count twice.
+        first_count = not utils.check_if_user_counted(message.author.id)
+        if first_count:
+            utils.set_user_counted(message.author.id)
+
+        new_lucky_number = False
+        if not channel.lucky_number_active:
+            if channel.current_count == 1:
+                channel.lucky_number = random.randint(1, 20)
+                channel.lucky_number_active = True
+                new_lucky_number = True
+            elif channel.current_count > 0 and channel.current_count % 20 == 0:
+                channel.lucky_number = random.randint(channel.current_count + 1, channel.current_count + 20)
+                channel.lucky_number_active = True
+                new_lucky_number = True
+
+        guess_bounds = None
+        if not channel.guess_game_active and random.randint(1, 10) == 1:
+            if channel.current_count >= 10:
+                channel.guess_game_active = True
+                guess_bounds = (max(1, channel.current_count - 10), channel.current_count + 10)
+                channel.guess_game_number = random.randint(*guess_bounds)
+                channel.guess_attempts = 0
+
+        milestone = channel.current_count % self.checkpoint_every == 0
+        self._changed(checkpoint=milestone or new_lucky_number or guess_bounds is not None)
+
+        if first_count:
+            utils.update_user_money(message.author.id, utils.FIRST_COUNT_REWARD, source="counting")
+            await utils.add_role_to_member(message.author, utils.FIRST_COUNT_ROLE)
             
-            utils.save_counting_game_state(
-                {
-                    "counting_channel_id": self.bot.counting_channel_id,
-                    "current_count": self.bot.current_count,
-                    "last_counter_id": self.bot.last_counter_id,
-                    "guess_game_active": self.bot.guess_game_active,
-                    "guess_game_number": self.bot.guess_game_number,
-                    "guess_attempts": self.bot.guess_attempts,
-                    "lucky_number": self.bot.lucky_number,
-                    "lucky_number_active": self.bot.lucky_number_active
-                }
+            embed = discord.Embed(
+                title="🏆 Achievement Unlocked: First Count!",
+                description=f"Congratulations, {message.author.mention}! You've made your first count in the server's counting game. Many more to come!",
+                color=discord.Color.gold()
             )
+            embed.add_field(name="Reward", value=f"<a:starcoin:1280590254935380038> {utils.FIRST_COUNT_REWARD} coins")
+            embed.set_thumbnail(url=message.author.display_avatar.url)
+            embed.set_footer(text="Keep counting!")
+            await message.channel.send(embed=embed)
 
-            if not self.bot.guess_game_active and random.randint(1, 10) == 1:
-                if self.bot.current_count >= 10:
-                    self.bot.guess_game_active = True
-                    lower_bound = max(1, self.bot.current_count - 10)
-                    upper_bound = self.bot.current_count + 10
-                    self.bot.guess_game_number = random.randint(lower_bound, upper_bound)
-                    self.bot.guess_attempts = 0
-                    
-                    await message.channel.send(f"✨ **Time for a guessing game!** I've chosen a number between **{lower_bound}** and **{upper_bound}**. "
-                                               f"The first person to guess it correctly wins **50 coins** and continues the count! You have 3 chances.")
-                    
-                    utils.save_counting_game_state(
-                        {
-                            "counting_channel_id": self.bot.counting_channel_id,
-                            "current_count": self.bot.current_count,
-                            "last_counter_id": self.bot.last_counter_id,
-                            "guess_game_active": self.bot.guess_game_active,
-                            "guess_game_number": self.bot.guess_game_number,
-                            "guess_attempts": self.bot.guess_attempts,
-                            "lucky_number": self.bot.lucky_number,
-                            "lucky_number_active": self.bot.lucky_number_active
-                        }
-                    )
+        await message.add_reaction('✅')
+        
+        utils.update_user_money(message.author.id, 1, source="counting")
+
+        if new_lucky_number:
+            await message.channel.send(f"✨ A new lucky number has been chosen! The next person to count **{channel.lucky_number}** will win **25 coins**!")
+
+        if guess_bounds is not None:
+            lower_bound, upper_bound = guess_bounds
+            await message.channel.send(f"✨ **Time for a guessing game!** I've chosen a number between **{lower_bound}** and **{upper_bound}**. "
+                                       f"The first person to guess it correctly wins **50 coins** and continues the count! You have 3 chances.")
+
+    @app_commands.command(name="countchannel", description="Adds or removes a counting channel.")
+    @app_commands.describe(
+        action="Whether to start or stop counting in the channel.",
+        channel="The channel to count in."
+    )
+    @app_commands.choices(action=[
+        app_commands.Choice(name="Add", value="add"),
+        app_commands.Choice(name="Remove", value="remove")
+    ])
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def count_channel(self, interaction: discord.Interaction, action: str, channel: discord.TextChannel):
+        if interaction.guild and interaction.guild.id != self.main_guild_id:
+            await interaction.response.send_message("This command is only available on the main server.", ephemeral=True)
             return
 
+        if action == "add":
+            if channel.id in self.channels:
+                await interaction.response.send_message(f"{channel.mention} is already a counting channel.", ephemeral=True)
+                return
+            self.channels[channel.id] = CountingChannel(channel.id, {})
+            message = f"Counting has started in {channel.mention}. The first number is **1**."
+        else:
+            if self.channels.pop(channel.id, None) is None:
+                await interaction.response.send_message(f"{channel.mention} is not a counting channel.", ephemeral=True)
+                return
+            message = f"{channel.mention} is no longer a counting channel."
+
+        utils.message_router.invalidate()
+        self._changed(checkpoint=True)
+        await interaction.response.send_message(message, ephemeral=True)
+
     async def remove_role_after_delay(self, member: discord.Member, role: discord.Role, delay: int):
         await asyncio.sleep(delay)
         try:
@@ -344,6 +363,7 @@ class CountingGame(commands.Cog):
             updated_prefs['Mode'] = mode.capitalize()
 
         utils.save_counting_preferences(preferences)
+        self._preferences = None
         
         if updated_prefs:
             message = "Updated counting game preferences:\n" + "\n".join(
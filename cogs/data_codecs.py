@@ -0,0 +1,328 @@
+# cogs/data_codecs.py
+"""Snapshot formats for the data files.
+
+"json" is the default, indented and easy to edit by hand. The others trade that for size
+and speed and can be chosen per file with DATA_FILE_FORMATS in bot_config.json, e.g.
+{"balances.json": "columnar", "bug_collection.json": "keyed"}. The file name stays the
+same; reading detects the format from the first bytes, so switching a file's format
+needs no migration.
+
+To look at or edit a binary file, convert it:
+    python -m cogs.data_codecs convert data/balances.json /tmp/balances.json --format json
+and back with --format columnar. `python -m cogs.data_codecs bench` times every format.
+"""
+
+import argparse
+import itertools
+import json
+import struct
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Binary snapshots start with MAGIC, a format version and a codec id.
+MAGIC = b"GADS"
+VERSION = 1
+_HEADER = struct.Struct("<4sBB")
+_COLUMNAR_ID = 1
+_KEYED_ID = 2
+_MSGPACK_ID = 3
+
+DEFAULT_FORMAT = "json"
+
+
+class CodecError(ValueError):
+    """Raised when data doesn't fit a format or a snapshot can't be decoded."""
+
+
+def _snowflake_ids(data: Any) -> array:
+    """Returns the dict's keys as unsigned 64-bit ints, or raises CodecError."""
+    if not isinstance(data, dict):
+        raise CodecError("Only dicts keyed by user or guild ids can be packed.")
+    try:
+        ids = array("Q", map(int, data.keys()))
+    except (ValueError, OverflowError, TypeError):
+        raise CodecError("Every key must be a numeric id.")
+    if any(str(user_id) != key for user_id, key in zip(ids, data.keys())):
+        raise CodecError("Keys must be canonical numeric strings.")
+    return ids
+
+
+def _native_to_le(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _le_to_native(typecode: str, raw: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(raw)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+class JsonCodec:
+    name = "json"
+
+    def __init__(self, indent: Optional[int] = 4):
+        self.indent = indent
+        self.separators = None if indent else (",", ":")
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, indent=self.indent, separators=self.separators).encode("utf-8")
+
+    def decode(self, raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
+
+
+class CompactJsonCodec(JsonCodec):
+    name = "compact"
+
+    def __init__(self):
+        super().__init__(indent=None)
+
+
+class ColumnarCodec:
+    """Struct-packed columns for {id: {field: int, ...}} maps such as balances.json.
+
+    Layout after the header: row count (u32), field count (u16), each field name
+    (u8 length + UTF-8), the ids as u64s, then one i64 column per field.
+    """
+
+    name = "columnar"
+    _counts = struct.Struct("<IH")
+
+    def encode(self, data: Any) -> bytes:
+        ids = _snowflake_ids(data)
+        fields: Optional[List[str]] = None
+        for record in data.values():
+            if not isinstance(record, dict):
+                raise CodecError("Every value must be a dict of integer fields.")
+            if fields is None:
+                fields = list(record.keys())
+            if list(record.keys()) != fields:
+                raise CodecError("Every record must have the same fields in the same order.")
+        fields = fields or []
+        parts = [_HEADER.pack(MAGIC, VERSION, _COLUMNAR_ID), self._counts.pack(len(ids), len(fields))]
+        for field in fields:
+            encoded = field.encode("utf-8")
+            parts.append(struct.pack("<B", len(encoded)) + encoded)
+        parts.append(_native_to_le(ids))
+        for field in fields:
+            column = [record[field] for record in data.values()]
+            if any(type(value) is not int for value in column):
+                raise CodecError(f"Field '{field}' holds values that aren't integers.")
+            try:
+                parts.append(_native_to_le(array("q", column)))
+            except OverflowError:
+                raise CodecError(f"Field '{field}' holds values that don't fit in 64 bits.")
+        return b"".join(parts)
+
+    def decode(self, raw: bytes) -> Dict[str, Dict[str, int]]:
+        offset = _HEADER.size
+        try:
+            rows, field_count = self._counts.unpack_from(raw, offset)
+            offset += self._counts.size
+            fields = []
+            for _ in range(field_count):
+                length = raw[offset]
+                fields.append(raw[offset + 1:offset + 1 + length].decode("utf-8"))
+                offset += 1 + length
+            ids = _le_to_native("Q", raw[offset:offset + rows * 8])
+            offset += rows * 8
+            columns = []
+            for _ in fields:
+                columns.append(_le_to_native("q", raw[offset:offset + rows * 8]))
+                offset += rows * 8
+        except (struct.error, IndexError, UnicodeDecodeError) as e:
+            raise CodecError(f"Truncated columnar snapshot: {e}")
+        if len(ids) != rows or any(len(column) != rows for column in columns):
+            raise CodecError("Truncated columnar snapshot.")
+        records = map(dict, map(zip, itertools.repeat(fields), zip(*columns)))
+        return dict(zip(map(str, ids), records))
+
+
+class KeyedCodec:
+    """Free-form per-user documents (bug books, inventories) keyed by packed ids.
+
+    Layout after the header: row count (u32), the ids as u64s, then every value as one
+    compact JSON array in id order. Keys are no longer repeated as quoted strings and
+    there is no indentation, so the file shrinks to a fraction of the indented JSON.
+    """
+
+    name = "keyed"
+    _count = struct.Struct("<I")
+
+    def encode(self, data: Any) -> bytes:
+        ids = _snowflake_ids(data)
+        values = json.dumps(list(data.values()), separators=(",", ":")).encode("utf-8")
+        return b"".join([_HEADER.pack(MAGIC, VERSION, _KEYED_ID), self._count.pack(len(ids)), _native_to_le(ids), values])
+
+    def decode(self, raw: bytes) -> Dict[str, Any]:
+        offset = _HEADER.size
+        try:
+            (rows,) = self._count.unpack_from(raw, offset)
+        except struct.error as e:
+            raise CodecError(f"Truncated keyed snapshot: {e}")
+        offset += self._count.size
+        ids = _le_to_native("Q", raw[offset:offset + rows * 8])
+        values = json.loads(raw[offset + rows * 8:].decode("utf-8"))
+        if len(ids) != rows or len(values) != rows:
+            raise CodecError("Truncated keyed snapshot.")
+        return dict(zip(map(str, ids), values))
+
+
+class MsgpackCodec:
+    """MessagePack, if the optional msgpack package is installed."""
+
+    name = "msgpack"
+
+    def encode(self, data: Any) -> bytes:
+        return _HEADER.pack(MAGIC, VERSION, _MSGPACK_ID) + msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, raw: bytes) -> Any:
+        try:
+            return msgpack.unpackb(raw[_HEADER.size:], raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData) as e:
+            raise CodecError(f"Unreadable msgpack snapshot: {e}")
+
+
+CODECS = {
+    "json": JsonCodec(),
+    "compact": CompactJsonCodec(),
+    "columnar": ColumnarCodec(),
+    "keyed": KeyedCodec(),
+}
+if msgpack is not None:
+    CODECS["msgpack"] = MsgpackCodec()
+
+_BINARY_CODECS = {_COLUMNAR_ID: CODECS["columnar"], _KEYED_ID: CODECS["keyed"]}
+if msgpack is not None:
+    _BINARY_CODECS[_MSGPACK_ID] = CODECS["msgpack"]
+
+
+def get_codec(name: Optional[str]):
+    """Returns the codec for a format name, falling back to indented JSON for unknown ones."""
+    if not name:
+        return CODECS[DEFAULT_FORMAT]
+    codec = CODECS.get(name)
+    if codec is None:
+        hint = " (pip install msgpack)" if name == "msgpack" else ""
+        print(f"Unknown or unavailable data file format '{name}'{hint}, using JSON.")
+        return CODECS[DEFAULT_FORMAT]
+    return codec
+
+
+def detect_codec(raw: bytes):
+    """Picks the codec a snapshot was written with from its first bytes."""
+    if raw[:4] != MAGIC:
+        return CODECS["json"]
+    try:
+        _, version, codec_id = _HEADER.unpack_from(raw)
+    except struct.error:
+        raise CodecError("Truncated snapshot header.")
+    codec = _BINARY_CODECS.get(codec_id)
+    if version != VERSION or codec is None:
+        raise CodecError(f"Unsupported snapshot format {version}/{codec_id}.")
+    return codec
+
+
+def decode(raw: bytes) -> Any:
+    return detect_codec(raw).decode(raw)
+
+
+def encode(data: Any, format_name: Optional[str] = None) -> Tuple[bytes, str]:
+    """Encodes data in the given format and returns (bytes, format actually used).
+
+    Data that doesn't fit a packed format (a legacy integer balance, a non-numeric key)
+    is written as compact JSON instead, so a save never fails because of the format.
+    """
+    codec = get_codec(format_name)
+    try:
+        return codec.encode(data), codec.name
+    except CodecError:
+        if codec.name in ("json", "compact"):
+            raise
+        return CODECS["compact"].encode(data), "compact"
+
+
+# --- Command line: converter and benchmark ---
+
+def _convert(source: str, destination: str, format_name: str):
+    with open(source, "rb") as f:
+        data = decode(f.read())
+    payload, used = encode(data, format_name)
+    with open(destination, "wb") as f:
+        f.write(payload)
+    print(f"Wrote {destination} as {used} ({len(payload):,} bytes).")
+
+
+def _sample_balances(users: int) -> Dict[str, Any]:
+    base = 400_000_000_000_000_000
+    return {str(base + i * 7919): {"wallet": (i * 37) % 50_000, "bank": (i * 91) % 200_000} for i in range(users)}
+
+
+def _sample_bug_collection(users: int) -> Dict[str, Any]:
+    bugs = ["Giant Weta", "Walking Stick", "Monarch Butterfly", "Stag Beetle", "Ladybug", "Firefly"]
+    base = 400_000_000_000_000_000
+    return {
+        str(base + i * 7919): {"caught": bugs[:1 + i % len(bugs)], "xp": (i * 13) % 5000, "shinies_caught": bugs[:i % 2]}
+        for i in range(users)
+    }
+
+
+def _time(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _bench(sizes: List[int], formats: List[str]):
+    print(f"{'file':<16}{'users':>9}  {'format':<9}{'size':>13}{'save':>10}{'load':>10}")
+    for label, make in (("balances", _sample_balances), ("bug_collection", _sample_bug_collection)):
+        for users in sizes:
+            data = make(users)
+            repeat = 3 if users <= 100_000 else 1
+            for name in formats:
+                if name not in CODECS:
+                    continue
+                payload, used = encode(data, name)
+                if used != name:
+                    continue
+                save_time = _time(lambda: encode(data, name), repeat)
+                load_time = _time(lambda: decode(payload), repeat)
+                assert decode(payload) == data
+                print(f"{label:<16}{users:>9,}  {name:<9}{len(payload):>13,}{save_time * 1000:>8.0f}ms{load_time * 1000:>8.0f}ms")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m cogs.data_codecs", description="Convert or benchmark data file formats.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="Rewrite a data file in another format.")
+    convert.add_argument("source")
+    convert.add_argument("destination")
+    convert.add_argument("--format", default="json", choices=sorted(CODECS))
+    bench = commands.add_parser("bench", help="Time saving and loading synthetic data in every format.")
+    bench.add_argument("--sizes", default="10000,100000,1000000")
+    bench.add_argument("--formats", default=",".join(CODECS))
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        _convert(args.source, args.destination, args.format)
+    else:
+        _bench([int(size) for size in args.sizes.split(",")], args.formats.split(","))
+
+
+if __name__ == "__main__":
+    main()
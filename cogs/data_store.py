@@ -0,0 +1,549 @@
+# cogs/data_store.py
+
+import asyncio
+import atexit
+import collections.abc
+import concurrent.futures
+import copy
+import datetime
+import functools
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from cogs import data_codecs
+
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_MAX_PENDING = 50
+
+# "always":  fsync every file before it is renamed into place, and fsync its directory
+#            afterwards so the rename itself survives a power cut.
+# "batched": fsync each file before the rename, but fsync each directory only once per
+#            flush. After a crash a file is either its old or its new version, never a
+#            torn mix, but the newest renames of that batch may be lost.
+# "never":   leave it to the OS. Atomic against crashes of the bot, not of the machine.
+FSYNC_POLICIES = ("always", "batched", "never")
+DEFAULT_FSYNC_POLICY = "batched"
+
+
+def _fsync_directory(directory: str):
+    try:
+        fd = os.open(directory or ".", os.O_RDONLY)
+    except OSError:
+        return  # Not supported on this platform (e.g. Windows).
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(file_path: str, text: str, fsync: bool = True, sync_directory: bool = True):
+    """Replaces file_path with text without ever leaving a partially written file behind."""
+    atomic_write_bytes(file_path, text.encode('utf-8'), fsync, sync_directory)
+
+
+def atomic_write_bytes(file_path: str, payload: bytes, fsync: bool = True, sync_directory: bool = True):
+    """Replaces file_path with payload without ever leaving a partially written file behind.
+
+    The payload is written to a temporary file in the same directory, which is then renamed
+    over the target. Readers see either the old or the new contents.
+    """
+    directory = os.path.dirname(file_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(file_path)}.", suffix=".tmp", dir=directory or ".")
+    try:
+        # mkstemp creates the file as 0600; keep the permissions the data file already had.
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    if fsync and sync_directory:
+        _fsync_directory(directory)
+
+
+def _signature(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """Returns (mtime_ns, size, inode) for a file, or None if it doesn't exist."""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class ReadOnlyDict(collections.abc.Mapping):
+    """A read-only view of a cached dict. Nested dicts and lists are wrapped as they are read."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return read_only(self._data[key])
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"ReadOnlyDict({self._data!r})"
+
+    def copy(self) -> dict:
+        """Returns a private, writable deep copy."""
+        return copy.deepcopy(self._data)
+
+
+class ReadOnlyList(collections.abc.Sequence):
+    """A read-only view of a cached list. Nested dicts and lists are wrapped as they are read."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: list):
+        self._data = data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ReadOnlyList(self._data[index])
+        return read_only(self._data[index])
+
+    def __contains__(self, value):
+        return value in self._data
+
+    def __iter__(self):
+        return (read_only(value) for value in self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"ReadOnlyList({self._data!r})"
+
+    def copy(self) -> list:
+        """Returns a private, writable deep copy."""
+        return copy.deepcopy(self._data)
+
+
+def read_only(value: Any) -> Any:
+    """Wraps dicts and lists in read-only views; other values are immutable already."""
+    if isinstance(value, dict):
+        return ReadOnlyDict(value)
+    if isinstance(value, list):
+        return ReadOnlyList(value)
+    return value
+
+
+class DataStore:
+    """Process-wide cache for the bot's JSON data files.
+
+    Each file is parsed once, the first time it is loaded. After that every caller
+    receives the same live object. put() marks a file dirty and returns straight away.
+
+    All disk work runs on one dedicated I/O thread, which takes jobs in FIFO order, so
+    writes to a file always land in the order they were requested. Dirty files are
+    written together, either every flush_interval seconds or as soon as max_pending
+    saves have built up, so several saves of the same file in between cost one write.
+    Coroutines can `await store.save(...)` to wait until their data is on disk without
+    blocking the event loop.
+
+    Files can still be edited by hand while the bot runs. Each load of a clean cached file
+    compares the file's mtime, size and inode with what was last read or written. If
+    they differ, the file is parsed again.
+    """
+
+    def __init__(self, flush_interval: float = DEFAULT_FLUSH_INTERVAL, max_pending: int = DEFAULT_MAX_PENDING,
+                 fsync_policy: str = DEFAULT_FSYNC_POLICY):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync_policy = fsync_policy
+        # Snapshot format per file name, see cogs/data_codecs.py. Unlisted files are indented JSON.
+        self.formats: Dict[str, str] = {}
+        self._cache: Dict[str, Any] = {}
+        self._dirty: Dict[str, str] = {}
+        # What each cached file looked like on disk when we last read or wrote it.
+        self._signatures: Dict[str, Optional[Tuple[int, int, int]]] = {}
+        # Files being written right now, whose on-disk signature is about to change.
+        self._in_flight: Set[str] = set()
+        self._pending_saves = 0
+        self._flush_requested = False
+        self._lock = threading.RLock()
+        # Only used for writes made inline once the I/O thread has been shut down.
+        self._write_lock = threading.Lock()
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._io_thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._last_full_flush = time.monotonic()
+        self.stats = {"saves": 0, "coalesced": 0, "written": 0, "flushes": 0, "errors": 0,
+                      "hits": 0, "misses": 0, "reloads": 0}
+
+    @staticmethod
+    def _key(file_path: str) -> str:
+        # Cogs build their paths differently ("data/x.json" vs an absolute path from __file__).
+        return os.path.abspath(file_path)
+
+    def configure(self, flush_interval: Optional[float] = None, max_pending: Optional[int] = None,
+                  fsync_policy: Optional[str] = None, formats: Optional[Dict[str, str]] = None):
+        """Updates the flush thresholds, fsync policy and file formats, e.g. after bot_config.json is reloaded."""
+        with self._lock:
+            if formats is not None:
+                self.formats = {name: data_codecs.get_codec(format_name).name for name, format_name in formats.items()}
+            if flush_interval is not None:
+                self.flush_interval = max(0.1, float(flush_interval))
+            if max_pending is not None:
+                self.max_pending = max(1, int(max_pending))
+            if fsync_policy is not None:
+                if fsync_policy in FSYNC_POLICIES:
+                    self.fsync_policy = fsync_policy
+                else:
+                    print(f"Unknown fsync policy '{fsync_policy}', keeping '{self.fsync_policy}'.")
+
+    def format_for(self, file_path: str) -> str:
+        """Returns the snapshot format a file is written in, looked up by file name."""
+        return self.formats.get(os.path.basename(file_path), data_codecs.DEFAULT_FORMAT)
+
+    def _read(self, file_path: str) -> Optional[Any]:
+        """Parses a file from disk in whatever format it was written, returning None if it is missing or unreadable."""
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'rb') as f:
+                return data_codecs.decode(f.read())
+        except (json.JSONDecodeError, UnicodeDecodeError, data_codecs.CodecError) as e:
+            print(f"Decode error in {file_path}: {e}. Returning default value.")
+            self._quarantine(file_path)
+        except Exception as e:
+            print(f"Error loading data from {file_path}: {e}. Returning default value.")
+        return None
+
+    @staticmethod
+    def _quarantine(file_path: str):
+        """Moves a corrupt file aside so the next save cannot overwrite what is left of it."""
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        corrupt_path = f"{file_path}.corrupt-{stamp}"
+        try:
+            os.replace(file_path, corrupt_path)
+            print(f"Moved corrupt data file {file_path} to {corrupt_path}.")
+        except OSError as e:
+            print(f"Could not move corrupt data file {file_path} aside: {e}")
+
+    def _serialize(self, data: Any, file_path: str) -> bytes:
+        # The I/O thread runs beside the event loop, which may be changing the object while
+        # we read it. If that happens, try again. Any change made by a caller is followed by
+        # a put(), which marks the file dirty again, so a snapshot taken mid-change is always
+        # overwritten by the next flush.
+        for attempt in range(3):
+            try:
+                return data_codecs.encode(data, self.format_for(file_path))[0]
+            except RuntimeError:
+                if attempt == 2:
+                    raise
+
+    def _write(self, file_path: str, data: Any, synced_directories: Optional[Set[str]] = None) -> bool:
+        """Serializes data and atomically replaces the file on disk."""
+        policy = self.fsync_policy
+        try:
+            payload = self._serialize(data, file_path)
+            atomic_write_bytes(file_path, payload, fsync=policy != "never", sync_directory=policy == "always")
+            if policy == "batched" and synced_directories is not None:
+                synced_directories.add(os.path.dirname(os.path.abspath(file_path)))
+            return True
+        except Exception as e:
+            print(f"Error saving data to {file_path}: {e}")
+            return False
+
+    def _is_stale(self, key: str, file_path: str) -> bool:
+        """True if a cached file was changed on disk by someone other than the store."""
+        if key in self._dirty or key in self._in_flight:
+            # Our own copy is newer than the disk.
+            return False
+        return _signature(file_path) != self._signatures.get(key)
+
+    def load(self, file_path: str, default_value: Any = None) -> Any:
+        """Returns the live cached object for a file, reading it from disk on first use.
+
+        Missing or corrupt files are not cached, so the default handed back stays the
+        caller's own object until it is saved with put(). Callers that only read should
+        prefer view().
+        """
+        key = self._key(file_path)
+        with self._lock:
+            cached = key in self._cache
+            if cached and not self._is_stale(key, file_path):
+                self.stats["hits"] += 1
+                return self._cache[key]
+            self.stats["misses"] += 1
+            signature = _signature(file_path)
+            data = self._read(file_path)
+            if data is None:
+                if cached:
+                    # Deleted or broken by hand: keep serving what we had.
+                    print(f"Could not reload {file_path} after it changed on disk; keeping the cached data.")
+                    self._signatures[key] = _signature(file_path)
+                    return self._cache[key]
+                return default_value if default_value is not None else {}
+            if cached:
+                self.stats["reloads"] += 1
+                print(f"Reloaded {file_path} after it changed on disk.")
+            self._cache[key] = data
+            self._signatures[key] = signature
+            return data
+
+    def view(self, file_path: str, default_value: Any = None) -> Any:
+        """Returns a read-only view of a file's contents, for callers that never modify it.
+
+        The view is not a copy, so taking one costs the same as load(). Writing through it
+        raises TypeError; use .copy() on it for a private writable copy.
+        """
+        return read_only(self.load(file_path, default_value))
+
+    def put(self, data: Any, file_path: str):
+        """Makes data the cached object for a file and schedules it to be written."""
+        key = self._key(file_path)
+        with self._lock:
+            self._cache[key] = data
+            self.stats["saves"] += 1
+            if key in self._dirty:
+                self.stats["coalesced"] += 1
+            self._dirty[key] = file_path
+            self._pending_saves += 1
+            closed = self._closed
+            if not closed:
+                self._ensure_io_thread()
+                if self._pending_saves >= self.max_pending and not self._flush_requested:
+                    self._flush_requested = True
+                    self._jobs.put((self._flush_now, None))
+        if closed:
+            # After shutdown there is no I/O thread left, so write straight away.
+            self._flush_now(file_path)
+
+    def adopt(self, data: Any, file_path: str):
+        """Makes data the cached object for a file without scheduling a write.
+
+        For callers that persist changes themselves, like cogs/journal.py.
+        """
+        key = self._key(file_path)
+        with self._lock:
+            self._cache[key] = data
+            if key not in self._signatures:
+                self._signatures[key] = _signature(file_path)
+
+    def _flush_now(self, file_path: Optional[str] = None) -> int:
+        """Writes dirty files on the calling thread and returns how many were written."""
+        with self._write_lock:
+            with self._lock:
+                if file_path is None:
+                    batch = list(self._dirty.items())
+                    self._dirty.clear()
+                    self._pending_saves = 0
+                    self._flush_requested = False
+                    self._last_full_flush = time.monotonic()
+                else:
+                    key = self._key(file_path)
+                    batch = [(key, self._dirty.pop(key))] if key in self._dirty else []
+                    if not self._dirty:
+                        self._pending_saves = 0
+                batch = [(key, path, self._cache.get(key)) for key, path in batch]
+                if batch:
+                    self.stats["flushes"] += 1
+                self._in_flight.update(key for key, _, _ in batch)
+
+            written = 0
+            synced_directories: Set[str] = set()
+            for key, path, data in batch:
+                if self._write(path, data, synced_directories):
+                    written += 1
+                    with self._lock:
+                        self._signatures[key] = _signature(path)
+                        self._in_flight.discard(key)
+                else:
+                    # Keep the file dirty so the next flush retries it.
+                    with self._lock:
+                        self.stats["errors"] += 1
+                        self._dirty.setdefault(key, path)
+                        self._in_flight.discard(key)
+            for directory in synced_directories:
+                _fsync_directory(directory)
+            with self._lock:
+                self.stats["written"] += written
+            return written
+
+    # --- I/O thread ---
+
+    def _ensure_io_thread(self):
+        if self._io_thread is None or not self._io_thread.is_alive():
+            self._io_thread = threading.Thread(target=self._io_loop, name="data-store-io", daemon=True)
+            self._io_thread.start()
+
+    def _io_loop(self):
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - self._last_full_flush))
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                job = None
+            if job is not None:
+                func, future = job
+                if func is None:
+                    # Shutdown marker from close().
+                    self._flush_now()
+                    if future is not None:
+                        future.set_result(None)
+                    return
+                try:
+                    result = func()
+                    if future is not None:
+                        future.set_result(result)
+                except BaseException as e:
+                    if future is not None:
+                        future.set_exception(e)
+                    else:
+                        print(f"Error in data store I/O job: {e}")
+            if time.monotonic() - self._last_full_flush >= self.flush_interval:
+                self._flush_now()
+
+    def _submit(self, func: Callable[[], Any]) -> concurrent.futures.Future:
+        """Queues func on the I/O thread, behind every write requested before it."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        with self._lock:
+            if not self._closed and threading.current_thread() is not self._io_thread:
+                self._ensure_io_thread()
+                self._jobs.put((func, future))
+                return future
+        # Shut down (or already on the I/O thread): run inline.
+        try:
+            future.set_result(func())
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def submit(self, func: Callable[[], Any]) -> concurrent.futures.Future:
+        """Runs func on the I/O thread after every write queued before it."""
+        return self._submit(func)
+
+    def flush(self, file_path: Optional[str] = None) -> int:
+        """Writes dirty files to disk now, blocking until done, and returns how many were written.
+
+        If file_path is given, only that file is written. Otherwise every dirty file is.
+        Coroutines should use `await flush_async()` instead.
+        """
+        return self._submit(functools.partial(self._flush_now, file_path)).result()
+
+    # --- Async API ---
+
+    async def flush_async(self, file_path: Optional[str] = None) -> int:
+        """Like flush(), but waits for the I/O thread without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(functools.partial(self._flush_now, file_path)))
+
+    async def save(self, data: Any, file_path: str) -> bool:
+        """Stores data for a file and waits until it has been written to disk.
+
+        Serialization and the write both happen on the I/O thread, after any earlier
+        write to the same file.
+        """
+        self.put(data, file_path)
+        await self.flush_async(file_path)
+        with self._lock:
+            return self._key(file_path) not in self._dirty
+
+    async def load_async(self, file_path: str, default_value: Any = None) -> Any:
+        """Like load(), but parses a file that is not cached yet on the I/O thread."""
+        if self.is_cached(file_path):
+            return self.load(file_path, default_value)
+        return await asyncio.wrap_future(self._submit(functools.partial(self.load, file_path, default_value)))
+
+    async def preload(self, file_paths: Iterable[str]):
+        """Parses the given files on the I/O thread so later loads are served from memory."""
+        for file_path in file_paths:
+            await self.load_async(file_path)
+
+    # --- Lifecycle and introspection ---
+
+    def close(self):
+        """Stops the I/O thread after it has written everything that is still pending."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            io_thread = self._io_thread
+        if io_thread is not None and io_thread.is_alive() and io_thread is not threading.current_thread():
+            done: concurrent.futures.Future = concurrent.futures.Future()
+            self._jobs.put((None, done))
+            try:
+                done.result(timeout=30)
+            except concurrent.futures.TimeoutError:
+                print("Timed out waiting for the data store to finish writing.")
+        self._flush_now()
+
+    def pending(self) -> int:
+        """Returns the number of files waiting to be written."""
+        with self._lock:
+            return len(self._dirty)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["pending"] = len(self._dirty)
+            stats["cached"] = len(self._cache)
+            stats["queued_jobs"] = self._jobs.qsize()
+            return stats
+
+    def is_cached(self, file_path: str) -> bool:
+        return self._key(file_path) in self._cache
+
+    def is_dirty(self, file_path: str) -> bool:
+        with self._lock:
+            return self._key(file_path) in self._dirty
+
+    def invalidate(self, file_path: Optional[str] = None):
+        """Drops a file (or every file) from the cache so the next load re-reads the disk.
+
+        Pending changes are flushed first so they are not lost.
+        """
+        self.flush(file_path)
+        with self._lock:
+            if file_path is None:
+                self._cache.clear()
+                self._signatures.clear()
+            else:
+                self._cache.pop(self._key(file_path), None)
+                self._signatures.pop(self._key(file_path), None)
+
+    def discard(self):
+        """Forgets every cached and pending file without writing anything.
+
+        Used after the files on disk were replaced wholesale (a snapshot restore), when
+        whatever is still in memory is older than the disk and must not be written back.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._dirty.clear()
+            self._signatures.clear()
+            self._pending_saves = 0
+
+
+# The single store shared by every cog; cogs/utils.py exposes it through load_data/save_data.
+store = DataStore()
+atexit.register(store.close)
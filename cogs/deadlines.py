@@ -0,0 +1,90 @@
+# cogs/deadlines.py
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+# Even with nothing due, wake up this often in case the system clock jumped.
+MAX_SLEEP_SECONDS = 60 * 60
+
+
+class DeadlineQueue:
+    """Keys with a deadline each (epoch seconds), in a min-heap, and a way to sleep until the next.
+
+    A background task loops on `await wait_due()`, which returns the keys whose deadline
+    has passed and otherwise sleeps exactly until the earliest one. schedule() and
+    cancel() wake it up, so a new earlier deadline is never missed. Rescheduling a key
+    replaces its deadline; the old heap entry is skipped when it reaches the top.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        # key -> (deadline, sequence number of its live heap entry)
+        self._deadlines: Dict[Hashable, Tuple[float, int]] = {}
+        self._sequence = itertools.count()
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._deadlines
+
+    def schedule(self, key: Hashable, when: float):
+        """Sets (or moves) the key's deadline."""
+        sequence = next(self._sequence)
+        self._deadlines[key] = (when, sequence)
+        heapq.heappush(self._heap, (when, sequence, key))
+        self._changed.set()
+
+    def cancel(self, key: Hashable):
+        if self._deadlines.pop(key, None) is not None:
+            self._changed.set()
+
+    def clear(self):
+        self._heap.clear()
+        self._deadlines.clear()
+        self._changed.set()
+
+    def deadline(self, key: Hashable) -> Optional[float]:
+        entry = self._deadlines.get(key)
+        return entry[0] if entry else None
+
+    def _drop_stale(self):
+        while self._heap:
+            when, sequence, key = self._heap[0]
+            if self._deadlines.get(key) == (when, sequence):
+                return
+            heapq.heappop(self._heap)
+
+    def next_deadline(self) -> Optional[float]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[float] = None) -> List[Hashable]:
+        """Removes and returns the keys whose deadline is at or before now, earliest first."""
+        now = time.time() if now is None else now
+        due = []
+        while True:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            del self._deadlines[key]
+            due.append(key)
+
+    async def wait_due(self) -> List[Hashable]:
+        """Sleeps until at least one deadline has passed and returns the due keys."""
+        while True:
+            self._changed.clear()
+            next_deadline = self.next_deadline()
+            now = time.time()
+            if next_deadline is not None and next_deadline <= now:
+                return self.pop_due(now)
+            timeout = MAX_SLEEP_SECONDS if next_deadline is None else min(next_deadline - now, MAX_SLEEP_SECONDS)
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
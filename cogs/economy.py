@@ -9,10 +9,10 @@ import asyncio
 import sys
 import traceback
 from typing import List, Dict, Any, Union, Optional
-import re
 
 # Import shared utility functions and global configurations
 import cogs.utils as utils
+from cogs.keyword_matcher import KeywordMatcher
 
 # Define the path to the data directory, now local to this cog's file.
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
@@ -22,32 +22,13 @@ ADVENTURE_AI_RESTRICTIONS_FILE = os.path.join(DATA_DIR, 'adventure_ai_restrictio
 ANAGRAM_GAME_STATE_FILE = os.path.join(DATA_DIR, 'anagram_game_state.json')
 ANAGRAM_WORDS_FILE = os.path.join(DATA_DIR, 'anagram_words.json')
 BUMP_BATTLE_STATE_FILE = os.path.join(DATA_DIR, 'bump_battle_state.json')
-SORRY_JAR_FILE = os.path.join(DATA_DIR, 'swear_jar.json')
+SORRY_JAR_FILE = utils.SORRY_COUNTS_FILE
 BOOSTER_REWARDS_FILE = os.path.join(DATA_DIR, "booster_rewards.json")
 
-# Helper functions for data persistence, now located in this file.
-def _load_data(file_path: str, default_value: Any = None) -> Any:
-    """Loads data from a JSON file, returning a default value if the file is not found or is corrupted."""
-    if not os.path.exists(file_path):
-        return default_value if default_value is not None else {}
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"JSON Decode Error in {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
-    except Exception as e:
-        print(f"Error loading data from {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
-
-def _save_data(data: Any, file_path: str):
-    """Saves data to a JSON file."""
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving data to {file_path}: {e}")
+LEADERBOARD_PAGE_SIZE = 10
+
+# Also catches "s0rry"; with KEYWORD_STEMS on in bot_config.json, "sorrys" and "sorry's" too.
+SORRY_MATCHERS = {stems: KeywordMatcher(["sorry"], stems=stems) for stems in (False, True)}
 
 # This class defines the interactive View with buttons.
 class BumpBattleView(discord.ui.View):
@@ -109,9 +90,9 @@ class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.main_guild_id = utils.MAIN_GUILD_ID
-        self.anagram_game_state = _load_data(ANAGRAM_GAME_STATE_FILE, {})
-        self.anagram_words = _load_data(ANAGRAM_WORDS_FILE, {}).get("words", [])
-        self.bump_battle_state = _load_data(BUMP_BATTLE_STATE_FILE, {})
+        self.anagram_game_state = utils.load_data(ANAGRAM_GAME_STATE_FILE, {})
+        self.anagram_words = utils.load_data(ANAGRAM_WORDS_FILE, {}).get("words", [])
+        self.bump_battle_state = utils.load_data(BUMP_BATTLE_STATE_FILE, {})
         
         # Hard-coded channel and role IDs
         self.bump_battle_channel_id = utils.bot_config.get("BUMP_BATTLE_CHANNEL_ID")
@@ -124,13 +105,30 @@ class Economy(commands.Cog):
         self.POINT_COOLDOWN = 120
         self.VOTE_COOLDOWN = 360
         self.disboard_cooldown_seconds = 2 * 60 * 60 # 2 hours
+
+        # Only messages in the anagram channel reach the game; the sorry jar sees all of them.
+        utils.message_router.add_route("anagram", self._on_anagram_message, lambda: [self.anagram_game_state.get('channel_id')], owner=self)
+        utils.message_router.add_scanner("sorry jar", self._on_sorry_message, owner=self)
         
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
+        self.phrase_pool_task.cancel()
+        utils.flush_data()
+
     @commands.Cog.listener()
     async def on_ready(self):
         # This listener is called when the cog is loaded and the bot is ready.
         # It ensures that the anagram game task starts after the bot is connected.
         self.anagram_game_task.start()
         print("Anagram game task started.")
+        if not self.phrase_pool_task.is_running():
+            self.phrase_pool_task.start()
+
+    @tasks.loop(minutes=5)
+    async def phrase_pool_task(self):
+        """Tops up the /work and /crime phrase pools in the background, so the commands never wait on the AI."""
+        for pool in utils.phrase_pools.values():
+            await pool.fill()
     
     @commands.Cog.listener()
     async def on_app_command_error(self, interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
@@ -188,7 +186,7 @@ class Economy(commands.Cog):
         # Clear the game state
         if self.anagram_game_state.get('current_word'):
             self.anagram_game_state['current_word'] = None
-            _save_data(self.anagram_game_state, ANAGRAM_GAME_STATE_FILE)
+            utils.save_data(self.anagram_game_state, ANAGRAM_GAME_STATE_FILE)
             self.anagram_game_task.restart()
             await interaction.followup.send("The anagram game has been reset and a new one will begin shortly.", ephemeral=True)
         else:
@@ -215,7 +213,8 @@ class Economy(commands.Cog):
         self.anagram_game_state['current_word'] = word
         self.anagram_game_state['shuffled_word'] = shuffled_word
         self.anagram_game_state['channel_id'] = channel_id
-        _save_data(self.anagram_game_state, ANAGRAM_GAME_STATE_FILE)
+        utils.save_data(self.anagram_game_state, ANAGRAM_GAME_STATE_FILE)
+        utils.message_router.invalidate()
 
         embed = discord.Embed(
             title="Game = Anagram",
@@ -232,7 +231,7 @@ class Economy(commands.Cog):
         if not anagram_channel_id:
             return
 
-        self.anagram_game_state = _load_data(ANAGRAM_GAME_STATE_FILE, {})
+        self.anagram_game_state = utils.load_data(ANAGRAM_GAME_STATE_FILE, {})
         if self.anagram_game_state.get('current_word'):
             print("Anagram task skipped: A game is already in progress.")
             return
@@ -241,7 +240,7 @@ class Economy(commands.Cog):
 
         await asyncio.sleep(240)
 
-        current_anagram_state = _load_data(ANAGRAM_GAME_STATE_FILE, {})
+        current_anagram_state = utils.load_data(ANAGRAM_GAME_STATE_FILE, {})
         if current_anagram_state.get('current_word'):
             channel = self.bot.get_channel(current_anagram_state.get('channel_id'))
             if channel:
@@ -253,7 +252,7 @@ class Economy(commands.Cog):
                 )
                 await channel.send(embed=embed, view=AnagramReplayView(self))
             current_anagram_state['current_word'] = None
-            _save_data(current_anagram_state, ANAGRAM_GAME_STATE_FILE)
+            utils.save_data(current_anagram_state, ANAGRAM_GAME_STATE_FILE)
 
 
     # --- Economy Commands ---
@@ -367,19 +366,19 @@ class Economy(commands.Cog):
 
         if side.value == flip_result:
             winnings = bet_amount
-            utils.update_user_money(user_id, winnings)
+            utils.update_user_money(user_id, winnings, source="coinflip")
             embed.add_field(name="Result", value=f"🎉 You won! You earned {winnings} <a:starcoin:1280590254935380038>.", inline=False)
             embed.color = discord.Color.green()
         else:
             losses = bet_amount
-            utils.update_user_money(user_id, -losses)
+            utils.update_user_money(user_id, -losses, source="coinflip")
             embed.add_field(name="Result", value=f"💔 You lost! You lost {losses} <a:starcoin:1280590254935380038>.", inline=False)
             embed.color = discord.Color.red()
         
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="daily", description="Collect your daily reward!")
-    @app_commands.checks.cooldown(1, 24*60*60)
+    @utils.persistent_cooldown("daily", 24*60*60)
     async def daily(self, interaction: discord.Interaction):
         """Allows a user to claim their daily coin reward."""
         if interaction.guild and interaction.guild.id != self.main_guild_id:
@@ -391,7 +390,7 @@ class Economy(commands.Cog):
         reward_max = 500
         reward = random.randint(reward_min, reward_max)
         
-        utils.update_user_money(user_id, reward)
+        utils.update_user_money(user_id, reward, source="daily")
         
         daily_phrases = [
             "received a lifetime supply of imaginary friends.",
@@ -418,7 +417,7 @@ class Economy(commands.Cog):
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="crime", description="Attempt a crime for money!")
-    @app_commands.checks.cooldown(1, 2*60*60)
+    @utils.persistent_cooldown("crime", 2*60*60)
     async def crime(self, interaction: discord.Interaction):
         """Attempts a crime, with a chance of winning or losing money."""
         if interaction.guild and interaction.guild.id != self.main_guild_id:
@@ -464,15 +463,15 @@ class Economy(commands.Cog):
         ]
 
         if outcome == 'free':
-            utils.update_user_money(user_id, amount)
-            # Use AI to generate a phrase, with a fallback to the hardcoded list
-            phrase = await utils.generate_crime_phrase_with_gemini(is_success=True) or random.choice(crime_phrases)
+            utils.update_user_money(user_id, amount, source="crime")
+            # Use a pre-generated AI phrase, with a fallback to the hardcoded list
+            phrase = utils.phrase_pools["crime_success"].pop() or random.choice(crime_phrases)
             embed.description = f"You {phrase}. You earned **{amount}** <a:starcoin:1280590254935380038>!"
             embed.color = discord.Color.green()
         else:
-            utils.update_user_money(user_id, -amount)
-            # Use AI to generate a phrase, with a fallback to the hardcoded list
-            phrase = await utils.generate_crime_phrase_with_gemini(is_success=False) or random.choice(bad_crime_phrases)
+            utils.update_user_money(user_id, -amount, source="crime")
+            # Use a pre-generated AI phrase, with a fallback to the hardcoded list
+            phrase = utils.phrase_pools["crime_failure"].pop() or random.choice(bad_crime_phrases)
             embed.description = f"You {phrase}. You lost **{amount}** <a:starcoin:1280590254935380038>!"
             embed.color = discord.Color.red()
         
@@ -480,7 +479,7 @@ class Economy(commands.Cog):
 
     @app_commands.command(name="rob", description="Attempt to rob another user!")
     @app_commands.describe(target="The member you want to rob.")
-    @app_commands.checks.cooldown(1, 12*60*60)
+    @utils.persistent_cooldown("rob", 12*60*60)
     async def rob(self, interaction: discord.Interaction, target: discord.Member):
         """Attempts to rob another user for a portion of their coins."""
         if interaction.guild and interaction.guild.id != self.main_guild_id:
@@ -496,8 +495,22 @@ class Economy(commands.Cog):
             await interaction.response.send_message("You cannot rob a bot!", ephemeral=True)
             return
 
-        robber_money = utils.get_user_money(user_id)
-        target_money = utils.get_user_bank_money(target_id)
+        # Both balances are read and changed in one transaction, so a deposit or another
+        # robbery can't land between the checks and the payout.
+        with utils.economy_transaction(user_id, target_id) as txn:
+            robber_money = txn.get_money(user_id)
+            target_money = txn.get_bank_money(target_id)
+
+            outcome = None
+            if target_money >= 2000 and robber_money >= 3000:
+                outcome = random.choices(['free', 'caught'], weights=[80, 20], k=1)[0]
+                if outcome == 'free':
+                    amount = random.randint(1, target_money)
+                    txn.transfer(target_id, amount, 'bank', 'wallet')
+                    txn.add_money(user_id, amount, source="rob")
+                else:
+                    losses = random.randint(1, robber_money)
+                    txn.add_money(user_id, -losses, source="rob")
 
         if target_money < 2000:
             await interaction.response.send_message(f"That user doesn't have enough money in their bank to rob! They need at least 2000 <a:starcoin:1280590254935380038>.", ephemeral=True)
@@ -506,28 +519,20 @@ class Economy(commands.Cog):
             await interaction.response.send_message(f"You need at least 3000 <a:starcoin:1280590254935380038> to rob someone!", ephemeral=True)
             return
 
-        outcome = random.choices(['free', 'caught'], weights=[80, 20], k=1)[0]
-
         embed = discord.Embed(title="Robbery Attempt")
         embed.set_author(name=interaction.user.display_name, icon_url=interaction.user.avatar.url if interaction.user.avatar else interaction.user.default_avatar.url)
 
         if outcome == 'free':
-            amount = random.randint(1, target_money)
-            utils.transfer_money(target_id, amount, 'bank', 'wallet')
-            utils.update_user_money(user_id, amount)
-            
             embed.description = f"{interaction.user.mention} robbed {target.mention} and successfully got **{amount}** <a:starcoin:1280590254935380038>!"
             embed.color = discord.Color.green()
         else:
-            losses = random.randint(1, robber_money)
-            utils.update_user_money(user_id, -losses)
             embed.description = "👮 You got Caught! You gained nothing."
             embed.color = discord.Color.red()
         
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="work", description="Work for some money!")
-    @app_commands.checks.cooldown(1, 24*60*60)
+    @utils.persistent_cooldown("work", 24*60*60)
     async def work(self, interaction: discord.Interaction):
         """Allows a user to work for a random amount of money, with a chance of failure."""
         if interaction.guild and interaction.guild.id != self.main_guild_id:
@@ -566,24 +571,42 @@ class Economy(commands.Cog):
         ]
 
         if outcome == 1:
-            utils.update_user_money(user_id, reward)
-            # Use AI to generate a phrase, with a fallback to the hardcoded list
-            phrase = await utils.generate_work_phrase_with_gemini(is_success=True) or random.choice(good_work_phrases)
+            utils.update_user_money(user_id, reward, source="work")
+            # Use a pre-generated AI phrase, with a fallback to the hardcoded list
+            phrase = utils.phrase_pools["work_success"].pop() or random.choice(good_work_phrases)
             embed.description = f"You {phrase}. You earned **{reward}** <a:starcoin:1280590254935380038>!"
             embed.color = discord.Color.green()
         else:
-            utils.update_user_money(user_id, -reward)
-            # Use AI to generate a phrase, with a fallback to the hardcoded list
-            phrase = await utils.generate_work_phrase_with_gemini(is_success=False) or random.choice(bad_work_phrases)
+            utils.update_user_money(user_id, -reward, source="work")
+            # Use a pre-generated AI phrase, with a fallback to the hardcoded list
+            phrase = utils.phrase_pools["work_failure"].pop() or random.choice(bad_work_phrases)
             embed.description = f"You {phrase}. You lost **{reward}** <a:starcoin:1280590254935380038>!"
             embed.color = discord.Color.red()
         
         await interaction.response.send_message(embed=embed)
     
     # --- New Unified Leaderboard Command ---
+    def _leaderboard_page(self, guild: discord.Guild, board: str, page: int, line_format: str) -> str:
+        """Formats one page of a board. Only that page's members are looked up; members
+        who have left the server are skipped."""
+        lines = []
+        for rank, user_id, score in utils.leaderboards.get(board).page((page - 1) * LEADERBOARD_PAGE_SIZE, LEADERBOARD_PAGE_SIZE):
+            member = guild.get_member(int(user_id))
+            if member:
+                lines.append(line_format.format(rank=rank, name=member.display_name, score=score))
+        return "\n".join(lines)
+
+    def _leaderboard_footer(self, board: str, user: discord.abc.User, page: int) -> str:
+        index = utils.leaderboards.get(board)
+        pages = max(1, -(-len(index) // LEADERBOARD_PAGE_SIZE))
+        rank = index.rank(user.id)
+        position = f"Your rank: #{rank} of {len(index)}" if rank else "You're not on this board yet"
+        return f"Page {page}/{pages} • {position}"
+
     @app_commands.command(name="leaderboard", description="Shows the top users for a specific game or metric.")
     @app_commands.describe(
-        board="The leaderboard you want to view."
+        board="The leaderboard you want to view.",
+        page="Which page of 10 to show."
     )
     @app_commands.choices(board=[
         app_commands.Choice(name="Coins", value="coins"),
@@ -593,7 +616,7 @@ class Economy(commands.Cog):
         app_commands.Choice(name="Sorry Tally", value="sorry"),
         app_commands.Choice(name="Hangry Games", value="hangry")
     ])
-    async def leaderboard(self, interaction: discord.Interaction, board: str):
+    async def leaderboard(self, interaction: discord.Interaction, board: str, page: app_commands.Range[int, 1] = 1):
         """Displays the top users by a selected metric."""
         if interaction.guild and interaction.guild.id != self.main_guild_id:
             return await interaction.response.send_message("This command is only available on the main server.", ephemeral=True)
@@ -604,107 +627,52 @@ class Economy(commands.Cog):
         
         if board == "coins":
             embed = discord.Embed(title=f"{guild.name}'s Leaderboard (Top Coins)", color=discord.Color.gold())
-            balances = _load_data(BALANCES_FILE)
-            leaderboard_entries = []
-            for user_id_str, money in balances.items():
-                if isinstance(money, dict):
-                    total_money = money.get("wallet", 0) + money.get("bank", 0)
-                else:
-                    total_money = money
-                
-                if total_money > 0:
-                    member = guild.get_member(int(user_id_str))
-                    if member:
-                        leaderboard_entries.append((member.display_name, total_money))
-            leaderboard_entries.sort(key=lambda x: x[1], reverse=True)
-            
-            description = "\n".join([f"{i+1}. **{name}** - {money} <a:starcoin:1280590254935380038>" for i, (name, money) in enumerate(leaderboard_entries[:10])])
+            description = self._leaderboard_page(guild, "coins", page, "{rank}. **{name}** - {score} <a:starcoin:1280590254935380038>")
             embed.description = description if description else "Leaderboard is currently empty!"
+            embed.set_footer(text=self._leaderboard_footer("coins", interaction.user, page))
             await interaction.followup.send(embed=embed)
             
         elif board == "bugbook":
             embed = discord.Embed(title=f"{guild.name}'s Leaderboard (Bug Collectors)", color=discord.Color.gold())
-            bug_collection = utils.load_bug_collection()
-            leaderboard_entries = []
-            for user_id_str, user_data in bug_collection.items():
-                member = guild.get_member(int(user_id_str))
-                if member:
-                    unique_bugs = len(user_data.get('caught', []))
-                    leaderboard_entries.append((member.display_name, unique_bugs))
-            leaderboard_entries.sort(key=lambda x: x[1], reverse=True)
-
-            description = "\n".join([f"{i+1}. **{name}** - {count} unique bugs" for i, (name, count) in enumerate(leaderboard_entries[:10])])
+            description = self._leaderboard_page(guild, "bugbook", page, "{rank}. **{name}** - {score} unique bugs")
             embed.description = description if description else "Bug Book is currently empty!"
+            embed.set_footer(text=self._leaderboard_footer("bugbook", interaction.user, page))
             await interaction.followup.send(embed=embed)
 
         elif board == "swears":
             embed = discord.Embed(title=f"{guild.name}'s Leaderboard (Swear Tally)", color=discord.Color.gold())
-            swear_jar_data = _load_data(SORRY_JAR_FILE, {'words': [], 'tally': {}})
-            tally = swear_jar_data.get('tally', {})
-            leaderboard_entries = []
-            for user_id_str, count in tally.items():
-                member = guild.get_member(int(user_id_str))
-                if member:
-                    leaderboard_entries.append((member.display_name, count))
-            leaderboard_entries.sort(key=lambda x: x[1], reverse=True)
-
-            description = "\n".join([f"{i+1}. **{name}** - {count} swears" for i, (name, count) in enumerate(leaderboard_entries[:10])])
+            description = self._leaderboard_page(guild, "swears", page, "{rank}. **{name}** - {score} swears")
             embed.description = description if description else "The swear jar is empty!"
+            embed.set_footer(text=self._leaderboard_footer("swears", interaction.user, page))
             await interaction.followup.send(embed=embed)
             
         elif board == "bumps":
-            bump_battle_state = _load_data(BUMP_BATTLE_STATE_FILE, {})
-            sub_users = bump_battle_state.get('sub', {}).get('users', {})
-            dom_users = bump_battle_state.get('dom', {}).get('users', {})
-            
             # Sub Team Leaderboard
-            sub_leaderboard = []
-            for user_id, count in sub_users.items():
-                member = guild.get_member(int(user_id))
-                if member:
-                    sub_leaderboard.append((member.display_name, count))
-            sub_leaderboard.sort(key=lambda x: x[1], reverse=True)
-            
-            sub_description = "\n".join([f"{i+1}. **{name}** - {count} <a:bluecoin:1280590252817387593>" for i, (name, count) in enumerate(sub_leaderboard[:10])])
+            sub_description = self._leaderboard_page(guild, "bumps_sub", page, "{rank}. **{name}** - {score} <a:bluecoin:1280590252817387593>")
             sub_embed = discord.Embed(
                 title=f"Sub Team Leaderboard",
                 description=sub_description if sub_description else "No one has bumped yet!",
                 color=discord.Color.blue()
             )
+            sub_embed.set_footer(text=self._leaderboard_footer("bumps_sub", interaction.user, page))
             
             # Dom Team Leaderboard
-            dom_leaderboard = []
-            for user_id, count in dom_users.items():
-                member = guild.get_member(int(user_id))
-                if member:
-                    dom_leaderboard.append((member.display_name, count))
-            dom_leaderboard.sort(key=lambda x: x[1], reverse=True)
-            
-            dom_description = "\n".join([f"{i+1}. **{name}** - {count} <a:bluecoin:1280590252817387593>" for i, (name, count) in enumerate(dom_leaderboard[:10])])
+            dom_description = self._leaderboard_page(guild, "bumps_dom", page, "{rank}. **{name}** - {score} <a:bluecoin:1280590252817387593>")
             dom_embed = discord.Embed(
                 title=f"Dom Team Leaderboard",
                 description=dom_description if dom_description else "No one has bumped yet!",
                 color=discord.Color.red()
             )
+            dom_embed.set_footer(text=self._leaderboard_footer("bumps_dom", interaction.user, page))
             
             await interaction.followup.send(embeds=[sub_embed, dom_embed])
             
         elif board == "sorry":
             # Change the title here
             embed = discord.Embed(title="Who is the most sorry server member?", color=discord.Color.gold())
-            sorry_jar_data = _load_data(SORRY_JAR_FILE, {'words': [], 'tally': {}})
-            leaderboard_entries = []
-            for user_id_str, count in sorry_jar_data.items():
-                # Skip the last apology timestamps
-                if user_id_str.endswith('_last_apology') or user_id_str == 'words':
-                    continue
-                member = guild.get_member(int(user_id_str))
-                if member:
-                    leaderboard_entries.append((member.display_name, count))
-            leaderboard_entries.sort(key=lambda x: x[1], reverse=True)
-
-            description = "\n".join([f"{i+1}. **{name}** - {count} apologies" for i, (name, count) in enumerate(leaderboard_entries[:10])])
+            description = self._leaderboard_page(guild, "sorry", page, "{rank}. **{name}** - {score} apologies")
             embed.description = description if description else "The sorry jar is empty!"
+            embed.set_footer(text=self._leaderboard_footer("sorry", interaction.user, page))
             
             # Add the image from the assets folder
             file = discord.File(os.path.join(os.path.dirname(__file__), '..', 'assets', 'sorryjar.png'), filename="sorryjar.png")
@@ -737,6 +705,15 @@ class Economy(commands.Cog):
             )
             embeds.append(sub_embed)
 
+            wins_description = self._leaderboard_page(guild, "hangry_wins", page, "{rank}. **{name}** - {score} wins")
+            wins_embed = discord.Embed(
+                title="Hangry Games Winners 🏆",
+                description=wins_description if wins_description else "No one has won yet!",
+                color=discord.Color.gold()
+            )
+            wins_embed.set_footer(text=self._leaderboard_footer("hangry_wins", interaction.user, page))
+            embeds.append(wins_embed)
+
             await interaction.followup.send(embeds=embeds)
 
         else:
@@ -752,7 +729,7 @@ class Economy(commands.Cog):
         await interaction.response.defer(ephemeral=False)
         
         user_id_str = str(interaction.user.id)
-        sorry_jar_data = _load_data(SORRY_JAR_FILE, {'words': [], 'tally': {}})
+        sorry_jar_data = utils.load_data(SORRY_JAR_FILE, {'words': [], 'tally': {}})
         
         tally = sorry_jar_data.get(user_id_str, 0)
 
@@ -768,19 +745,15 @@ class Economy(commands.Cog):
 
         await interaction.followup.send(embed=embed, file=file)
         
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot or not message.guild:
-            return
-
-        # Anagram game logic
-        anagram_state = _load_data(ANAGRAM_GAME_STATE_FILE, {})
+    async def _on_anagram_message(self, routed):
+        message = routed.message
+        anagram_state = utils.load_data(ANAGRAM_GAME_STATE_FILE, {})
         if message.channel.id == anagram_state.get('channel_id'):
             print(f"DEBUG: Message in anagram channel from {message.author.name}. Content: '{message.content}'.")
             correct_word = anagram_state.get('current_word')
             if correct_word and message.content.lower() == correct_word.lower():
                 user_id = str(message.author.id)
-                utils.update_user_money(user_id, 250)
+                utils.update_user_money(user_id, 250, source="anagram")
                 
                 # New embed format
                 embed = discord.Embed(
@@ -792,24 +765,18 @@ class Economy(commands.Cog):
                 await message.channel.send(embed=embed, view=AnagramReplayView(self))
                 
                 anagram_state['current_word'] = None
-                _save_data(anagram_state, ANAGRAM_GAME_STATE_FILE)
+                utils.save_data(anagram_state, ANAGRAM_GAME_STATE_FILE)
                 
                 self.anagram_game_task.restart()
                 print(f"DEBUG: Anagram game won by {message.author.name}. Restarting task.")
 
-        # Sorry Jar logic
-        if re.search(r'\b(sorry)\b', message.content.lower()):
-            sorry_jar_data = _load_data(SORRY_JAR_FILE, {'words': [], 'tally': {}})
-            user_id_str = str(message.author.id)
-            
-            if user_id_str not in sorry_jar_data:
-                sorry_jar_data[user_id_str] = 0
-            
-            sorry_jar_data[user_id_str] += 1
-            _save_data(sorry_jar_data, SORRY_JAR_FILE)
+    async def _on_sorry_message(self, routed):
+        message = routed.message
+        if SORRY_MATCHERS[utils.KEYWORD_STEMS].search(routed.normalized):
+            # One journal append instead of rewriting the whole jar file.
+            tally = utils.increment_counter(SORRY_JAR_FILE, message.author.id, default_value={'words': [], 'tally': {}})
             
             # Send the full embed response every time a message is sent.
-            tally = sorry_jar_data.get(user_id_str, 0)
             
             embed = discord.Embed(
                 title="✨ Sorry Jar ✨",
@@ -829,42 +796,33 @@ class Economy(commands.Cog):
         app_commands.Choice(name="doms", value="dom"),
         app_commands.Choice(name="subs", value="sub")
     ])
-    @app_commands.checks.cooldown(1, 7200, key=lambda i: (i.guild_id, i.user.id))
+    @utils.persistent_cooldown("bumppoint", 7200)
     async def bumppoint(self, interaction: discord.Interaction, team: app_commands.Choice[str]):
         """Awards a point for bumping a server with a slash command."""
         await interaction.response.defer()
         user_id = str(interaction.user.id)
         team_name = team.value
         
-        bump_battle_state = utils.load_bump_battle_state()
+        # Two journal appends instead of rewriting the whole battle state.
+        default_state = {'sub': {'points': 0, 'users': {}}, 'dom': {'points': 0, 'users': {}}}
+        utils.increment_counter(utils.BUMP_BATTLE_STATE_FILE, team_name, 'users', user_id, default_value=default_state)
+        points = utils.increment_counter(utils.BUMP_BATTLE_STATE_FILE, team_name, 'points', default_value=default_state)
         
         if team_name == 'dom':
-            bump_battle_state['dom']['points'] += 1
-            if user_id not in bump_battle_state['dom']['users']:
-                bump_battle_state['dom']['users'][user_id] = 0
-            bump_battle_state['dom']['users'][user_id] += 1
-            
             gif_path = os.path.join(os.getcwd(), 'assets', 'bumpbattle_domme.gif')
             file = discord.File(gif_path, filename='bumpbattle_domme.gif')
             embed = discord.Embed(title="1 Point For The Doms!", color=discord.Color.green())
             embed.set_image(url="attachment://bumpbattle_domme.gif")
-            await interaction.followup.send(content=f"Thank you for bumping the server. I have given you one <a:bluecoin:1280590252817387593> for the Doms, you now have {bump_battle_state['dom']['points']}!", embed=embed, file=file)
+            await interaction.followup.send(content=f"Thank you for bumping the server. I have given you one <a:bluecoin:1280590252817387593> for the Doms, you now have {points}!", embed=embed, file=file)
         else:
-            bump_battle_state['sub']['points'] += 1
-            if user_id not in bump_battle_state['sub']['users']:
-                bump_battle_state['sub']['users'][user_id] = 0
-            bump_battle_state['sub']['users'][user_id] += 1
-
             gif_path = os.path.join(os.getcwd(), 'assets', 'bumpbattle_sub.gif')
             file = discord.File(gif_path, filename='bumpbattle_sub.gif')
             embed = discord.Embed(title="1 Point For The Subs!", color=discord.Color.green())
             embed.set_image(url="attachment://bumpbattle_sub.gif")
-            await interaction.followup.send(content=f"Thank you for bumping the server. I have given you one <a:bluecoin:1280590252817387593> for the Subs, you now have {bump_battle_state['sub']['points']}!", embed=embed, file=file)
-        
-        utils.save_bump_battle_state(bump_battle_state)
+            await interaction.followup.send(content=f"Thank you for bumping the server. I have given you one <a:bluecoin:1280590252817387593> for the Subs, you now have {points}!", embed=embed, file=file)
         
-        if bump_battle_state[team_name]['points'] >= 100:
-            await self.end_bump_battle(interaction.guild, team_name, bump_battle_state)
+        if points >= 100:
+            await self.end_bump_battle(interaction.guild, team_name, utils.load_bump_battle_state())
             
     async def end_bump_battle(self, guild: discord.Guild, winner: str, state: Dict[str, Any]):
         """A helper function to announce the end of a bump battle and distribute rewards."""
@@ -935,16 +893,16 @@ class Economy(commands.Cog):
 
         await announcements_channel.send(content=content, embed=win_embed, view=view, file=file)
 
-        for user_id, points in state[winner]['users'].items():
-            coins_to_add = points * 10
-            utils.update_user_money(int(user_id), coins_to_add)
-            print(f"Credited user {user_id} with {coins_to_add} coins for {points} points.")
+        payout = utils.bulk_update_money({user_id: points * 10 for user_id, points in state[winner]['users'].items()}, source="bump_battle")
+        print(f"Credited {len(payout)} bump battle winners with {payout.credited} coins.")
 
         state['sub']['points'] = 0
         state['sub']['users'] = {}
         state['dom']['points'] = 0
         state['dom']['users'] = {}
-        _save_data(state, BUMP_BATTLE_STATE_FILE)
+        utils.save_data(state, BUMP_BATTLE_STATE_FILE)
+        utils.leaderboards.invalidate("bumps_sub")
+        utils.leaderboards.invalidate("bumps_dom")
 
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
@@ -956,11 +914,11 @@ class Economy(commands.Cog):
             booster_channel = self.bot.get_channel(utils.BOOSTER_REWARD_CHANNEL_ID)
             if booster_channel:
                 user_id_str = str(after.id)
-                booster_rewards = _load_data(BOOSTER_REWARDS_FILE, {})
+                booster_rewards = utils.load_data(BOOSTER_REWARDS_FILE, {})
                 if user_id_str not in booster_rewards:
-                    utils.update_user_money(after.id, 5000)
+                    utils.update_user_money(after.id, 5000, source="booster")
                     booster_rewards[user_id_str] = datetime.datetime.now().isoformat()
-                    _save_data(booster_rewards, BOOSTER_REWARDS_FILE)
+                    utils.save_data(booster_rewards, BOOSTER_REWARDS_FILE)
                     await booster_channel.send(f"🎉 Thank you, {after.mention}, for boosting the server! You have been awarded **5000** <a:starcoin:1280590254935380038> for your generosity!")
 
 async def setup(bot):
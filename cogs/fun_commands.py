@@ -87,6 +87,9 @@ class FunAndGames(commands.Cog):
         self.cat_channel_id = utils.bot_config.get("CAT_CHANNEL_ID")
         self.daily_cat_cooldown = utils.bot_config.get("DAILY_CAT_COOLDOWN_HOURS", 24)
         self.active_cat_catch = False
+
+        utils.message_router.add_route("cat catch", self._on_cat_message, lambda: [self.cat_channel_id], owner=self)
+        utils.message_router.add_route("make a sentence", self._on_sentence_message, lambda: [utils.bot_config.get('make_a_sentence_channel_id')], owner=self)
         
 
         for gif_type in self.FLUXPOINT_SFW_GIF_TYPES:
@@ -106,12 +109,14 @@ class FunAndGames(commands.Cog):
             self.bot.tree.add_command(command)
     
     def cog_unload(self):
+        utils.message_router.remove_owner(self)
         if hasattr(self, 'hourly_qotd') and self.hourly_qotd.is_running():
             self.hourly_qotd.cancel()
         if hasattr(self, 'daily_cat_post_task') and self.daily_cat_post_task.is_running():
             self.daily_cat_post_task.cancel()
         if hasattr(self, 'daily_qotd_post') and self.daily_qotd_post.is_running():
             self.daily_qotd_post.cancel()
+        utils.flush_data()
     
     @commands.Cog.listener()
     async def on_ready(self):
@@ -212,7 +217,7 @@ class FunAndGames(commands.Cog):
             utils.save_data(cat_data, os.path.join(cat_assets_dir, "cats.json"))
             
             await interaction.response.send_message("Thank you! Your cat has been added to the server collection. You get a bonus of 500 🪙!", ephemeral=True)
-            utils.update_user_money(interaction.user.id, 500)
+            utils.update_user_money(interaction.user.id, 500, source="cat_photo")
             
         except Exception as e:
             print(f"Error saving cat image: {e}")
@@ -522,35 +527,26 @@ class FunAndGames(commands.Cog):
             else:
                 print(error_message)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if self.active_cat_catch and message.channel.id == self.cat_channel_id and message.content.lower() == 'cat':
+    async def _on_cat_message(self, routed):
+        message = routed.message
+        if self.active_cat_catch and routed.lowered == 'cat':
             self.active_cat_catch = False
             
             user_inventory = utils.load_inventory(message.author.id)
-            has_caught_cat = user_inventory.get('items', {}).get('caught cat', 0) > 0
+            has_caught_cat = user_inventory.count('caught cat') > 0
             
             fish_amount = random.randint(5, 20)
-            utils.update_user_money(message.author.id, fish_amount)
+            utils.update_user_money(message.author.id, fish_amount, source="cat_catch")
             
             if not has_caught_cat:
                 utils.add_item_to_inventory(message.author.id, "Caught Cat", {"name": "Caught Cat", "type": "special", "description": "A special item proving you caught a cat."})
                 await message.channel.send(f"🎉 **{message.author.display_name}** caught the cat and has added it to their profile! They were also rewarded with {fish_amount} fish! ")
             else:
                 await message.channel.send(f"🎉 **{message.author.display_name}** caught the cat again and was rewarded with {fish_amount} fish! 🎣")
-            
-            return
-        
-        print(f"Received message in channel: {message.channel.id} from user: {message.author.id}")
-        
-        make_a_sentence_channel_id = utils.bot_config.get('make_a_sentence_channel_id')
-        sinner_chat_channel_id = utils.bot_config.get('SINNER_CHAT_CHANNEL_ID', utils.TEST_CHANNEL_ID)
-        
-        print(f"Configured make_a_sentence_channel_id: {make_a_sentence_channel_id}")
 
-        if make_a_sentence_channel_id is None or message.author.bot or message.channel.id != make_a_sentence_channel_id:
-            print("Message ignored: not in the correct channel or from a bot.")
-            return
+    async def _on_sentence_message(self, routed):
+        message = routed.message
+        sinner_chat_channel_id = utils.bot_config.get('SINNER_CHAT_CHANNEL_ID', utils.TEST_CHANNEL_ID)
 
         content = message.content.strip()
         words = content.split()
@@ -573,7 +569,7 @@ class FunAndGames(commands.Cog):
             print(f"Sentence finished with punctuation. Full sentence: '{finished_sentence}'")
             
             try:
-                finished_channel = await self.bot.fetch_channel(sinner_chat_channel_id)
+                finished_channel = await utils.resolver.channel(sinner_chat_channel_id)
                 print(f"Successfully fetched finished channel: {finished_channel.name}")
             except discord.NotFound:
                 finished_channel = None
@@ -8,7 +8,8 @@ import json
 import textwrap
 import datetime
 from typing import List, Dict, Any, Union, Optional
-from cogs.utils import load_data, save_data, update_user_money, generate_hangry_event, load_hangrygames_state, save_hangrygames_state, generate_duel_image, generate_solo_death_image, generate_win_image
+from cogs.utils import load_data, save_data, flush_data, update_user_money, generate_hangry_event, load_hangrygames_state, save_hangrygames_state, generate_duel_image, generate_solo_death_image, generate_win_image
+import cogs.utils as utils
 
 # --- Configuration and Helper Functions ---
 
@@ -23,12 +24,10 @@ SUB_TEAM_ROLES = [829539964613558272, 1003828021041573958]
 
 def load_config():
     """Loads the bot configuration from a JSON file."""
-    try:
-        with open('bot_config.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
+    if not os.path.exists('bot_config.json'):
         print("bot_config.json not found!")
         return {"role_ids": {"Staff": []}}
+    return load_data('bot_config.json', {"role_ids": {"Staff": []}})
 
 def load_server_wins():
     return load_data(os.path.join("data", "server_wins.json"), {})
@@ -44,23 +43,19 @@ def save_global_wins(data):
 
 def load_hangry_games_teams_state():
     """Loads the hangry games team state from a JSON file."""
-    if os.path.exists(HANGRY_GAMES_STATE_FILE):
-        with open(HANGRY_GAMES_STATE_FILE, 'r') as f:
-            state = json.load(f)
-            # Ensure the reward_points and team keys exist
-            if 'reward_points' not in state:
-                state['reward_points'] = 1
-            if 'dom' not in state:
-                state['dom'] = {"points": 0}
-            if 'sub' not in state:
-                state['sub'] = {"points": 0}
-            return state
-    return {"dom": {"points": 0}, "sub": {"points": 0}, "reward_points": 1}
+    state = load_data(HANGRY_GAMES_STATE_FILE, {"dom": {"points": 0}, "sub": {"points": 0}, "reward_points": 1})
+    # Ensure the reward_points and team keys exist
+    if 'reward_points' not in state:
+        state['reward_points'] = 1
+    if 'dom' not in state:
+        state['dom'] = {"points": 0}
+    if 'sub' not in state:
+        state['sub'] = {"points": 0}
+    return state
 
 def save_hangry_games_teams_state(state):
     """Saves the hangry games team state to a JSON file."""
-    with open(HANGRY_GAMES_STATE_FILE, 'w') as f:
-        json.dump(state, f, indent=4)
+    save_data(state, HANGRY_GAMES_STATE_FILE)
 
 # --- HangryGamesCog Class ---
 
@@ -75,6 +70,9 @@ class HangryGamesCog(commands.Cog):
         self.last_event_time = None
         self.tributes = []
 
+    def cog_unload(self):
+        flush_data()
+
     class GameStartView(discord.ui.View):
         def __init__(self, cog, embed):
             super().__init__(timeout=180)
@@ -304,11 +302,13 @@ class HangryGamesCog(commands.Cog):
         server_wins[guild_id_str] = server_wins.get(guild_id_str, {})
         server_wins[guild_id_str][user_id_str] = server_wins[guild_id_str].get(user_id_str, 0) + 1
         save_server_wins(server_wins)
+        if guild_id_str == str(utils.MAIN_GUILD_ID):
+            utils.leaderboards.update("hangry_wins", user_id_str, server_wins[guild_id_str][user_id_str])
         
         total_kills = self.state['tributes'][user_id_str].get('kills', 0)
         total_server_wins = server_wins[guild_id_str][user_id_str]
         
-        update_user_money(winner.id, HANGRY_GAMES_WIN_AMOUNT)
+        update_user_money(winner.id, HANGRY_GAMES_WIN_AMOUNT, source="hangry_games")
         
         guild = self.bot.get_guild(self.state.get("guild_id"))
         member = guild.get_member(winner.id)
@@ -54,14 +54,11 @@ class InventorySelect(discord.ui.Select):
                     if random.random() < 0.2: # 20% chance to catch a cat
                         cat_bug_info = next((bug for bug in INSECT_LIST if bug['name'] == "Purrfect Cat"), None)
                         if cat_bug_info:
-                            bug_collection = utils.load_data(BUG_COLLECTION_FILE, {})
-                            user_id_str = str(interaction.user.id)
-                            user_data = bug_collection.get(user_id_str, {"caught": [], "xp": 0, "shinies_caught": []})
+                            user_data = utils.load_user_bug_data(interaction.user.id)
 
                             user_data['caught'].append(cat_bug_info['name'])
                             user_data['xp'] = user_data.get('xp', 0) + cat_bug_info['xp']
-                            bug_collection[user_id_str] = user_data
-                            utils.save_data(bug_collection, BUG_COLLECTION_FILE)
+                            utils.save_user_bug_data(interaction.user.id, user_data)
 
                             return await interaction.response.send_message(f"🐟 You used a fish and caught a **Purrfect Cat**! It has been added to your bug book.", ephemeral=True)
 
@@ -99,7 +96,7 @@ class InventorySelect(discord.ui.Select):
                 return await interaction.response.send_message("Item not found.", ephemeral=True)
 
             sell_price = int(item_data['price'] * 0.5)
-            utils.update_user_money(interaction.user.id, sell_price)
+            utils.update_user_money(interaction.user.id, sell_price, source="item_sell")
             utils.remove_item_from_inventory(interaction.user.id, item_name)
             await interaction.response.send_message(f"You sold '{item_name}' for 🪙 {sell_price}!", ephemeral=True)
 
@@ -173,12 +170,10 @@ class ItemGroup(app_commands.Group):
                 if random.random() < 0.2: # 20% chance to catch a cat
                     cat_bug_info = next((bug for bug in INSECT_LIST if bug['name'] == "Purrfect Cat"), None)
                     if cat_bug_info:
-                        bug_collection = utils.load_data(BUG_COLLECTION_FILE, {})
-                        user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
+                        user_data = utils.load_user_bug_data(user_id)
                         user_data['caught'].append(cat_bug_info['name'])
                         user_data['xp'] = user_data.get('xp', 0) + cat_bug_info['xp']
-                        bug_collection[user_id] = user_data
-                        utils.save_data(bug_collection, BUG_COLLECTION_FILE)
+                        utils.save_user_bug_data(user_id, user_data)
                         total_cats_caught += 1
 
             # Remove items
@@ -236,7 +231,7 @@ class ItemGroup(app_commands.Group):
         total_sell_price = sell_price_per_item * quantity
 
         utils.remove_item_from_inventory(user_id, item_name, quantity)
-        utils.update_user_money(interaction.user.id, total_sell_price)
+        utils.update_user_money(interaction.user.id, total_sell_price, source="item_sell")
 
         await interaction.response.send_message(f"You sold {quantity} '{item_name}' for 🪙 {total_sell_price}!", ephemeral=True)
 
@@ -262,7 +257,7 @@ class ItemGroup(app_commands.Group):
         total_sell_price = sell_price_per_item * current_item_count
 
         utils.remove_item_from_inventory(user_id, item_name, current_item_count)
-        utils.update_user_money(interaction.user.id, total_sell_price)
+        utils.update_user_money(interaction.user.id, total_sell_price, source="item_sell")
 
         await interaction.response.send_message(f"You sold all {current_item_count} of your '{item_name}' for a total of 🪙 {total_sell_price}!", ephemeral=True)
 
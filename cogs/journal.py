@@ -0,0 +1,336 @@
+# cogs/journal.py
+
+import atexit
+import copy
+import glob
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from cogs.data_store import store
+
+DEFAULT_COMPACT_AFTER = 1000
+
+_MISSING = object()
+
+
+def _diff(old: Any, new: Any, path: List[Any], records: List[Dict[str, Any]]):
+    """Appends the records that turn old into new, descending into dicts so a changed
+    counter costs one record rather than a copy of the whole document."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key, value in new.items():
+            old_value = old.get(key, _MISSING)
+            if old_value is _MISSING:
+                records.append({"p": path + [key], "v": value})
+            else:
+                _diff(old_value, value, path + [key], records)
+        for key in old.keys() - new.keys():
+            records.append({"p": path + [key], "d": 1})
+    elif type(old) is not type(new) or old != new:
+        records.append({"p": path, "v": _value_copy(new)})
+
+
+def _value_copy(value: Any) -> Any:
+    return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+
+def _apply(data: Dict[str, Any], record: Dict[str, Any], normalize_keys: bool = False) -> Dict[str, Any]:
+    """Applies one record to data in place and returns the (possibly new) root object.
+
+    Replayed records get their dict keys turned into strings, as a JSON round trip would.
+    """
+    path = record["p"]
+    if not path:
+        return _value_copy(record["v"])
+    target = data
+    for key in path[:-1]:
+        if normalize_keys:
+            key = str(key)
+        child = target.get(key)
+        if not isinstance(child, dict):
+            child = target[key] = {}
+        target = child
+    last = str(path[-1]) if normalize_keys else path[-1]
+    if "d" in record:
+        target.pop(last, None)
+    else:
+        target[last] = _value_copy(record["v"])
+    return data
+
+
+class JournaledFile:
+    """Keeps a JSON dict file up to date with an append-only journal instead of rewrites.
+
+    Each change is one JSON line in <file>.journal.<n> that sets (or deletes) the value at
+    a key path, e.g. {"p": ["tally", "1234"], "v": 7}. Records hold absolute values, so
+    replaying one twice is harmless. On first use the journal segments are replayed on
+    top of the JSON file. Once compact_after records have built up, the I/O thread writes
+    the JSON file as a fresh snapshot and deletes the segments it covers.
+
+    The JSON file keeps its usual format and stays readable by anything that opens it.
+    """
+
+    def __init__(self, file_path: str, compact_after: int = DEFAULT_COMPACT_AFTER):
+        self.file_path = file_path
+        self.compact_after = compact_after
+        self._lock = threading.RLock()
+        self._data: Optional[Dict[str, Any]] = None
+        self._shadow: Dict[str, Any] = {}
+        self._segment = 0
+        self._handle = None
+        self._records = 0
+        self._compaction_queued = False
+        self.stats = {"appended": 0, "replayed": 0, "compactions": 0}
+
+    def _segment_path(self, number: int) -> str:
+        return f"{self.file_path}.journal.{number}"
+
+    def _segments(self) -> List[int]:
+        numbers = []
+        for path in glob.glob(glob.escape(self.file_path) + ".journal.*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                numbers.append(int(suffix))
+        return sorted(numbers)
+
+    def _ensure_loaded(self, default_value: Optional[Dict[str, Any]] = None):
+        data = store.load(self.file_path, _MISSING)
+        if data is _MISSING:
+            data = copy.deepcopy(default_value) if default_value is not None else {}
+            store.adopt(data, self.file_path)
+        if self._data is None:
+            replayed = 0
+            segments = self._segments()
+            for number in segments:
+                try:
+                    with open(self._segment_path(number), 'r', encoding='utf-8') as f:
+                        for line in f:
+                            line = line.strip()
+                            if not line:
+                                continue
+                            try:
+                                record = json.loads(line)
+                            except json.JSONDecodeError:
+                                # A torn last line from a crash mid-append.
+                                print(f"Skipping unreadable journal record in {self._segment_path(number)}.")
+                                continue
+                            data = _apply(data, record, normalize_keys=True)
+                            replayed += 1
+                except OSError as e:
+                    print(f"Error replaying journal {self._segment_path(number)}: {e}")
+            if replayed and data is not store.load(self.file_path, None):
+                store.adopt(data, self.file_path)
+            self._data = data
+            self._shadow = copy.deepcopy(data)
+            # Never append to a segment that may end in a torn line.
+            self._segment = (segments[-1] + 1) if segments else 1
+            self._records = replayed
+            self.stats["replayed"] += replayed
+            if replayed:
+                print(f"Replayed {replayed} journal records for {self.file_path}.")
+        elif data is not self._data:
+            # The data store re-read the file after it was edited by hand. The edit wins,
+            # so fold it into a snapshot before older records could be replayed over it.
+            self._data = data
+            self._shadow = copy.deepcopy(data)
+            self._records = max(self._records, 1)
+            self._queue_compaction()
+
+    def load(self, default_value: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Returns the live object for the file, with every journaled change applied.
+
+        Like the data store, a file that doesn't exist yet isn't cached: the caller gets
+        the default back, and it becomes the live object once it is saved.
+        """
+        with self._lock:
+            if self._data is None and not os.path.exists(self.file_path) and not self._segments():
+                return default_value if default_value is not None else {}
+            self._ensure_loaded(default_value)
+            return self._data
+
+    def _append(self, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        try:
+            if self._handle is None:
+                self._handle = open(self._segment_path(self._segment), 'a', encoding='utf-8')
+            self._handle.write(lines)
+            self._handle.flush()
+            if store.fsync_policy == "always":
+                os.fsync(self._handle.fileno())
+        except OSError as e:
+            # Fall back to a full write so the change isn't lost.
+            print(f"Error appending to journal for {self.file_path}: {e}")
+            store.put(self._data, self.file_path)
+            return
+        for record in records:
+            self._shadow = _apply(self._shadow, record)
+        self._records += len(records)
+        self.stats["appended"] += len(records)
+        if self._records >= self.compact_after or not os.path.exists(self.file_path):
+            # A file that only exists as a journal gets its first snapshot straight away.
+            self._queue_compaction()
+
+    def save(self, data: Dict[str, Any]):
+        """Journals whatever differs between data and the last journaled state.
+
+        Works both for the live object changed in place and for a new dict.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if data is not self._data:
+                self._data = data
+                store.adopt(data, self.file_path)
+            records: List[Dict[str, Any]] = []
+            _diff(self._shadow, data, [], records)
+            self._append(records)
+
+    def set(self, keys: List[Any], value: Any, default_value: Optional[Dict[str, Any]] = None):
+        """Sets the value at a key path (creating missing dicts) and journals it."""
+        with self._lock:
+            self._ensure_loaded(default_value)
+            record = {"p": list(keys), "v": value}
+            self._data = _apply(self._data, record)
+            self._append([record])
+
+    def delete(self, keys: List[Any]):
+        """Removes the value at a key path, if there is one, and journals it."""
+        with self._lock:
+            self._ensure_loaded()
+            target = self._data
+            for key in keys[:-1]:
+                target = target.get(key)
+                if not isinstance(target, dict):
+                    return
+            if keys[-1] not in target:
+                return
+            record = {"p": list(keys), "d": 1}
+            self._data = _apply(self._data, record)
+            self._append([record])
+
+    def increment(self, keys: List[Any], amount: int = 1, default_value: Optional[Dict[str, Any]] = None) -> int:
+        """Adds amount to the counter at a key path and returns the new value."""
+        with self._lock:
+            self._ensure_loaded(default_value)
+            target = self._data
+            for key in keys[:-1]:
+                target = target.get(key) if isinstance(target.get(key), dict) else {}
+            new_value = (target.get(keys[-1], 0) or 0) + amount
+            self.set(keys, new_value)
+            return new_value
+
+    # --- Compaction ---
+
+    def _queue_compaction(self):
+        if not self._compaction_queued:
+            self._compaction_queued = True
+            store.submit(self.compact)
+
+    def compact(self) -> bool:
+        """Writes the current data as the JSON snapshot and drops the segments it covers."""
+        with self._lock:
+            self._compaction_queued = False
+            if self._data is None or self._records == 0:
+                return True
+            # Later changes go to a new segment. The snapshot may include some of them,
+            # which is fine because replaying a record twice doesn't change the result.
+            covered = [number for number in self._segments() if number <= self._segment]
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._segment += 1
+            records = self._records
+            self._records = 0
+            store.put(self._data, self.file_path)
+        if store.flush(self.file_path) < 1 and store.is_dirty(self.file_path):
+            with self._lock:
+                self._records += records
+            print(f"Journal compaction of {self.file_path} failed; keeping its journal.")
+            return False
+        for number in covered:
+            try:
+                os.remove(self._segment_path(number))
+            except OSError:
+                pass
+        self.stats["compactions"] += 1
+        return True
+
+    def pending_records(self) -> int:
+        with self._lock:
+            return self._records
+
+    def close(self):
+        self.compact()
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def reset(self):
+        """Forgets the in-memory state so the next use replays the file and journal from disk.
+
+        Nothing is written; the files on disk are taken as they are.
+        """
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+            self._data = None
+            self._shadow = {}
+            self._records = 0
+            self._segment = 0
+
+
+_journals: Dict[str, JournaledFile] = {}
+_compact_after = DEFAULT_COMPACT_AFTER
+
+
+def register(file_path: str) -> JournaledFile:
+    """Makes file_path a journaled file; later lookups with any spelling of the path find it."""
+    key = os.path.abspath(file_path)
+    if key not in _journals:
+        _journals[key] = JournaledFile(file_path, _compact_after)
+    return _journals[key]
+
+
+def journal_for(file_path: str) -> Optional[JournaledFile]:
+    return _journals.get(os.path.abspath(file_path))
+
+
+def configure(compact_after: Optional[int] = None):
+    global _compact_after
+    if compact_after is not None:
+        _compact_after = max(1, int(compact_after))
+        for journal in _journals.values():
+            journal.compact_after = _compact_after
+
+
+def get_stats() -> Dict[str, int]:
+    stats = {"appended": 0, "replayed": 0, "compactions": 0, "pending": 0}
+    for journal in _journals.values():
+        for name, value in journal.stats.items():
+            stats[name] += value
+        stats["pending"] += journal.pending_records()
+    return stats
+
+
+def close_all():
+    """Folds every journal into its JSON snapshot, e.g. before the bot exits."""
+    for journal in list(_journals.values()):
+        try:
+            journal.close()
+        except Exception as e:
+            print(f"Error closing journal for {journal.file_path}: {e}")
+
+
+def reset_all():
+    """Resets every journal, e.g. after a snapshot restore replaced the files under them."""
+    for journal in list(_journals.values()):
+        journal.reset()
+
+
+# Registered after the data store's own atexit hook, so this runs first while the
+# store's I/O thread is still available.
+atexit.register(close_all)
@@ -0,0 +1,174 @@
+# cogs/key_locks.py
+
+import asyncio
+import contextlib
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# A file-level key sorts before every user key of the same file, which gives all
+# locks one global acquisition order and rules out deadlocks between holders.
+_FILE_KEY = ""
+
+
+def _owner() -> Tuple[int, Optional[asyncio.Task]]:
+    """Identifies the current holder: the thread plus, on an event loop, the running task.
+
+    Two coroutines on the loop thread are different owners, so one can't slip into a
+    lock the other holds across an await.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return threading.get_ident(), task
+
+
+class _KeyLock:
+    """A re-entrant lock that can also be held in shared mode.
+
+    Per-user updates hold their file's lock shared and the user's lock exclusively;
+    whole-file writes hold the file lock exclusively and so wait for every user update.
+    """
+
+    __slots__ = ("condition", "owner", "depth", "shared", "refs")
+
+    def __init__(self):
+        self.condition = threading.Condition(threading.Lock())
+        self.owner = None
+        self.depth = 0
+        self.shared: Dict[Any, int] = {}
+        self.refs = 0
+
+    def _can_take(self, owner, exclusive: bool) -> bool:
+        if self.owner is not None and self.owner != owner:
+            return False
+        if exclusive:
+            return all(holder == owner for holder in self.shared)
+        return True
+
+    def _take(self, owner, exclusive: bool):
+        if exclusive:
+            self.owner = owner
+            self.depth += 1
+        else:
+            self.shared[owner] = self.shared.get(owner, 0) + 1
+
+    def try_acquire(self, owner, exclusive: bool) -> bool:
+        with self.condition:
+            if not self._can_take(owner, exclusive):
+                return False
+            self._take(owner, exclusive)
+            return True
+
+    def acquire(self, owner, exclusive: bool):
+        with self.condition:
+            while not self._can_take(owner, exclusive):
+                blocker = self.owner if self.owner is not None else next(iter(self.shared))
+                if owner[1] is not None and blocker[0] == owner[0]:
+                    # Waiting here would block the event loop that has to release the lock.
+                    raise RuntimeError("Lock is held across an await by another task; hold() must not span an await.")
+                self.condition.wait()
+            self._take(owner, exclusive)
+
+    def release(self, owner, exclusive: bool):
+        with self.condition:
+            if exclusive:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.owner = None
+            else:
+                self.shared[owner] -= 1
+                if self.shared[owner] == 0:
+                    del self.shared[owner]
+            self.condition.notify_all()
+
+
+class KeyedLockManager:
+    """Hands out locks per data file and per user id inside that file.
+
+    Only the short bookkeeping of the lock table is serialized; commands for different
+    users never wait on each other. Unused locks are dropped from the table.
+
+    A lock must not be held across an await. On the event loop the read-modify-write
+    inside hold() runs without yielding, so coroutines never wait on each other there;
+    the locks matter when a helper runs on another thread. A task that finds a lock
+    held by another task on its own loop raises instead of deadlocking the loop. A
+    coroutine that needs read, await, then write reads again after the await.
+    """
+
+    def __init__(self):
+        self._table_lock = threading.Lock()
+        self._locks: Dict[Tuple[str, str], _KeyLock] = {}
+        self.stats = {"acquired": 0, "contended": 0}
+
+    def _checkout(self, key: Tuple[str, str]) -> _KeyLock:
+        with self._table_lock:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = _KeyLock()
+            lock.refs += 1
+            return lock
+
+    def _checkin(self, key: Tuple[str, str], lock: _KeyLock):
+        with self._table_lock:
+            lock.refs -= 1
+            if lock.refs == 0 and lock.owner is None and not lock.shared:
+                self._locks.pop(key, None)
+
+    @staticmethod
+    def _plan(resources: Dict[str, Iterable[Any]]) -> List[Tuple[Tuple[str, str], bool]]:
+        """Turns {file_path: user_ids} into sorted (key, exclusive) pairs.
+
+        An empty user id list locks the whole file.
+        """
+        plan = {}
+        for file_path, user_ids in resources.items():
+            file_path = os.path.abspath(file_path)
+            user_keys = sorted({str(user_id) for user_id in user_ids})
+            if not user_keys:
+                plan[(file_path, _FILE_KEY)] = True
+                continue
+            plan.setdefault((file_path, _FILE_KEY), False)
+            for user_key in user_keys:
+                plan[(file_path, user_key)] = True
+        return sorted(plan.items())
+
+    @contextlib.contextmanager
+    def hold_many(self, resources: Dict[str, Iterable[Any]]):
+        """Holds the locks for several files at once, e.g. {BALANCES_FILE: [a, b], USER_INVENTORY_FILE: [a]}."""
+        owner = _owner()
+        held = []
+        try:
+            for key, exclusive in self._plan(resources):
+                lock = self._checkout(key)
+                if not lock.try_acquire(owner, exclusive):
+                    self.stats["contended"] += 1
+                    try:
+                        lock.acquire(owner, exclusive)
+                    except BaseException:
+                        self._checkin(key, lock)
+                        raise
+                self.stats["acquired"] += 1
+                held.append((key, lock, exclusive))
+            yield
+        finally:
+            for key, lock, exclusive in reversed(held):
+                lock.release(owner, exclusive)
+                self._checkin(key, lock)
+
+    def hold(self, file_path: str, *user_ids):
+        """Holds one file's lock: per user if ids are given, otherwise for the whole file.
+
+        Usage:
+            with key_locks.hold(BALANCES_FILE, user_id):
+                ...read, modify and save that user's entry, with no await in between...
+        """
+        return self.hold_many({file_path: user_ids})
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._table_lock:
+            return {**self.stats, "active": len(self._locks)}
+
+
+key_locks = KeyedLockManager()
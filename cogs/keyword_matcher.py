@@ -0,0 +1,96 @@
+# cogs/keyword_matcher.py
+"""Finds any of a list of keywords in a message with one compiled regex.
+
+The keywords are merged into a trie and written out as a single pattern, so "fuck",
+"fucker" and "fudge" share their "fu" and the regex engine tries each starting
+position against one branch per letter rather than every word in turn. The time per
+message stays about the same whether the list has five words or five hundred.
+
+Both the keywords and the text go through normalize() first: lower case, leetspeak
+folded back into letters ("sh1t", "@ss") and punctuation removed ("f.u.c.k"), the way
+the swear jar always stripped it. Matches are whole words. With stems=True a keyword
+also matches with a common English suffix ("damned", "shitty", "sorrys").
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Digits and symbols commonly typed instead of letters.
+_LEET = str.maketrans({"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "@": "a", "$": "s"})
+_LEET_CHARS = re.compile(r"[0134578@$]")
+_HAS_LETTER = re.compile(r"[^\W\d_]")
+_TOKEN = re.compile(r"\S+")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+# An optional doubled last letter ("shitty", "damnned"), then an optional suffix.
+_STEM_SUFFIX = r"(?:(?<=(\w))\2)?(?:es|s|ed|d|ing|ers|er|y|ies)?"
+
+
+def _fold_token(match: "re.Match") -> str:
+    token = match.group(0)
+    # Only words that also contain letters, so "455" or "2024" stay numbers.
+    if _LEET_CHARS.search(token) and _HAS_LETTER.search(token):
+        return token.translate(_LEET)
+    return token
+
+
+def normalize(text: str) -> str:
+    """Lower-cases text, folds leetspeak and strips punctuation."""
+    return _NON_WORD.sub("", _TOKEN.sub(_fold_token, text.lower()))
+
+
+def _trie_pattern(node: Dict[str, dict]) -> str:
+    ends_here = "" in node
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items()) if char != ""]
+    if not branches:
+        return ""
+    if all(len(branch) == 1 for branch in branches) and len(branches) > 1:
+        body = "[" + "".join(branches) + "]"
+    elif len(branches) == 1:
+        body = branches[0]
+    else:
+        body = "(?:" + "|".join(branches) + ")"
+    if ends_here:
+        # Greedy, so the longest keyword at a position is tried first.
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordMatcher:
+    """A compiled set of keywords. Build a new one when the list changes."""
+
+    def __init__(self, keywords: Iterable[str], stems: bool = False):
+        self.stems = stems
+        # normalized form -> the keyword as it was given
+        self._keywords: Dict[str, str] = {}
+        for keyword in keywords:
+            normalized = " ".join(normalize(str(keyword)).split())
+            if normalized:
+                self._keywords.setdefault(normalized, keyword)
+
+        self._pattern: Optional["re.Pattern"] = None
+        if self._keywords:
+            trie: Dict[str, dict] = {}
+            for normalized in self._keywords:
+                node = trie
+                for char in normalized:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+            suffix = _STEM_SUFFIX if stems else ""
+            self._pattern = re.compile(r"(?<!\w)(" + _trie_pattern(trie) + ")" + suffix + r"(?!\w)")
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def find_all(self, text: str) -> List[str]:
+        """Returns every keyword found in already normalized text, in order, repeats included."""
+        if self._pattern is None:
+            return []
+        return [self._keywords[match.group(1)] for match in self._pattern.finditer(text)]
+
+    def search(self, text: str) -> Optional[str]:
+        """Returns the first keyword found in already normalized text, or None."""
+        if self._pattern is None:
+            return None
+        match = self._pattern.search(text)
+        return self._keywords[match.group(1)] if match else None
@@ -0,0 +1,132 @@
+# cogs/leaderboards.py
+
+import bisect
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Scores of zero or less aren't ranked, like the empty entries the old leaderboards skipped.
+MIN_SCORE = 1
+
+
+class LeaderboardIndex:
+    """One board's scores, kept sorted so that pages and ranks are bisect lookups.
+
+    The order is (-score, user id) so the highest score comes first and ties always
+    sort the same way. Changing a score moves one entry instead of re-sorting the board.
+    """
+
+    def __init__(self, scores: Iterable[Tuple[str, int]] = ()):
+        self._scores: Dict[str, int] = {}
+        for user_id, score in scores:
+            if score >= MIN_SCORE:
+                self._scores[str(user_id)] = score
+        self._order: List[Tuple[int, str]] = sorted((-score, user_id) for user_id, score in self._scores.items())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def set(self, user_id: Any, score: int):
+        user_id = str(user_id)
+        old_score = self._scores.get(user_id)
+        if old_score == score:
+            return
+        if old_score is not None:
+            del self._order[bisect.bisect_left(self._order, (-old_score, user_id))]
+            del self._scores[user_id]
+        if score >= MIN_SCORE:
+            self._scores[user_id] = score
+            bisect.insort(self._order, (-score, user_id))
+
+    def score(self, user_id: Any) -> Optional[int]:
+        return self._scores.get(str(user_id))
+
+    def rank(self, user_id: Any) -> Optional[int]:
+        """The user's 1-based position, or None if they have no score on this board."""
+        user_id = str(user_id)
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect.bisect_left(self._order, (-score, user_id)) + 1
+
+    def page(self, offset: int = 0, limit: int = 10) -> List[Tuple[int, str, int]]:
+        """Returns (rank, user id, score) for the entries at positions offset to offset + limit."""
+        return [(offset + i + 1, user_id, -negative_score)
+                for i, (negative_score, user_id) in enumerate(self._order[offset:offset + limit])]
+
+
+class _Board:
+    __slots__ = ("source", "load", "counter", "index", "built_from")
+
+    def __init__(self, source: Callable[[], Any], load: Callable[[], Iterable[Tuple[str, int]]],
+                 counter: Optional[Tuple[str, Tuple[str, ...]]]):
+        self.source = source
+        self.load = load
+        self.counter = counter
+        self.index: Optional[LeaderboardIndex] = None
+        self.built_from: Any = None
+
+
+class Leaderboards:
+    """Sorted indexes for the leaderboards, built on first use and then kept up to date.
+
+    Each board is registered with:
+      - load: returns every (user id, score), used to build the index;
+      - source: returns the live object the scores come from (the cached data file).
+        If it is a different object than the index was built from, the file was edited
+        by hand or restored, and the index is rebuilt;
+      - counter: optionally (file path, key path) of a counter in a journaled file, so
+        increment_counter() keeps the board current without any extra call.
+
+    The code that changes a score calls update(); code that rewrites a whole file calls
+    invalidate(). Updates to a board nobody has looked at yet cost nothing.
+    """
+
+    def __init__(self):
+        self._boards: Dict[str, _Board] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, load: Callable[[], Iterable[Tuple[str, int]]],
+                 source: Callable[[], Any] = lambda: None, counter: Optional[Tuple[str, Tuple[str, ...]]] = None):
+        if counter is not None:
+            counter = (os.path.abspath(counter[0]), tuple(counter[1]))
+        self._boards[name] = _Board(source, load, counter)
+
+    def get(self, name: str) -> LeaderboardIndex:
+        """Returns the board's index, building it if needed. Raises KeyError for unknown boards."""
+        board = self._boards[name]
+        with self._lock:
+            source = board.source()
+            if board.index is None or source is not board.built_from:
+                board.index = LeaderboardIndex(board.load())
+                board.built_from = source
+            return board.index
+
+    def is_built(self, name: str) -> bool:
+        board = self._boards.get(name)
+        return board is not None and board.index is not None
+
+    def update(self, name: str, user_id: Any, score: int):
+        board = self._boards.get(name)
+        if board is None or board.index is None:
+            return
+        with self._lock:
+            board.index.set(user_id, score)
+
+    def counter_changed(self, file_path: str, keys: Iterable[Any], value: int):
+        """Called by increment_counter() with the counter's key path and new value."""
+        keys = tuple(str(key) for key in keys)
+        if not keys:
+            return
+        location = (os.path.abspath(file_path), keys[:-1])
+        for name, board in self._boards.items():
+            if board.counter == location:
+                self.update(name, keys[-1], value)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Drops one board's index (or all of them); it is rebuilt the next time it is read."""
+        with self._lock:
+            for board_name, board in self._boards.items():
+                if name is None or board_name == name:
+                    board.index = None
+                    board.built_from = None
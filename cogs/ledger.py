@@ -0,0 +1,185 @@
+# cogs/ledger.py
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from cogs.data_store import store
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# How long the rolling totals are kept. The log itself keeps everything.
+DEFAULT_HOURS_KEPT = 7 * 24
+DEFAULT_DAYS_KEPT = 90
+
+# source -> [coins added, coins removed, number of changes]
+Totals = Dict[str, List[int]]
+
+
+def _add(totals: Totals, source: str, amount: int, count: int = 1):
+    entry = totals.setdefault(source, [0, 0, 0])
+    if amount > 0:
+        entry[0] += amount
+    else:
+        entry[1] -= amount
+    entry[2] += count
+
+
+class EconomyLedger:
+    """An append-only log of every coin added to or removed from a balance, with rolling totals.
+
+    Each change is one JSON line in the log: {"t": epoch second, "u": user id, "s": source,
+    "a": amount}, e.g. a /work payout is {"t": 1760000000, "u": "1234", "s": "work", "a": 120}.
+    Lines are buffered and appended by the data store's I/O thread, so recording a change
+    never waits on the disk.
+
+    Next to the log, hourly and daily buckets hold per-source totals. Each record adds to
+    its two buckets, and the buckets are saved like any other data file, so a report sums
+    a few dozen buckets instead of reading the log. Buckets older than hours_kept and
+    days_kept are dropped as new ones start. If the totals file is lost, it is rebuilt
+    from the log on first use.
+    """
+
+    def __init__(self, log_path: str, totals_path: str, hours_kept: int = DEFAULT_HOURS_KEPT,
+                 days_kept: int = DEFAULT_DAYS_KEPT):
+        self.log_path = log_path
+        self.totals_path = totals_path
+        self.hours_kept = hours_kept
+        self.days_kept = days_kept
+        self._lock = threading.RLock()
+        self._pending: List[str] = []
+        self._write_queued = False
+        self._current_hour: Optional[int] = None
+
+    # --- Recording ---
+
+    def record(self, user_id: Any, amount: int, source: str, now: Optional[float] = None):
+        """Logs one balance change and adds it to the rolling totals."""
+        if not amount:
+            return
+        now = time.time() if now is None else now
+        line = json.dumps({"t": int(now), "u": str(user_id), "s": source, "a": amount}, separators=(",", ":"))
+        with self._lock:
+            self._pending.append(line + "\n")
+            if not self._write_queued:
+                self._write_queued = True
+                store.submit(self._write_pending)
+            data = self._totals()
+            hour = int(now // HOUR * HOUR)
+            _add(data["hourly"].setdefault(str(hour), {}), source, amount)
+            _add(data["daily"].setdefault(str(int(now // DAY * DAY)), {}), source, amount)
+            if hour != self._current_hour:
+                self._current_hour = hour
+                self._prune(data, now)
+            store.put(data, self.totals_path)
+
+    def _write_pending(self):
+        with self._lock:
+            lines, self._pending = self._pending, []
+            self._write_queued = False
+        if not lines:
+            return
+        try:
+            with open(self.log_path, 'a', encoding='utf-8') as log_file:
+                log_file.write("".join(lines))
+                log_file.flush()
+                if store.fsync_policy == "always":
+                    os.fsync(log_file.fileno())
+        except OSError as e:
+            print(f"Error appending to the economy ledger {self.log_path}: {e}")
+
+    def flush(self):
+        """Blocks until every recorded change has been appended to the log."""
+        store.submit(self._write_pending).result()
+
+    def reset(self):
+        """Forgets the lines not yet appended and the current hour.
+
+        Called after a snapshot restore put back an older log and totals file; the totals
+        are read from the restored file on next use.
+        """
+        with self._lock:
+            self._pending = []
+            self._current_hour = None
+
+    # --- Rolling totals ---
+
+    def _totals(self) -> Dict[str, Dict[str, Totals]]:
+        data = store.load(self.totals_path)
+        if not data:
+            data = self._rebuild()
+            store.put(data, self.totals_path)
+        data.setdefault("hourly", {})
+        data.setdefault("daily", {})
+        return data
+
+    def _rebuild(self) -> Dict[str, Dict[str, Totals]]:
+        """Recomputes the rolling totals from the log, e.g. when the totals file was deleted."""
+        data: Dict[str, Dict[str, Totals]] = {"hourly": {}, "daily": {}}
+        if not os.path.exists(self.log_path):
+            return data
+        now = time.time()
+        hour_cutoff = now - self.hours_kept * HOUR
+        day_cutoff = now - self.days_kept * DAY
+        try:
+            with open(self.log_path, 'r', encoding='utf-8') as log_file:
+                for line in log_file:
+                    try:
+                        entry = json.loads(line)
+                        timestamp, source, amount = entry["t"], entry["s"], entry["a"]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    if timestamp >= hour_cutoff:
+                        _add(data["hourly"].setdefault(str(int(timestamp // HOUR * HOUR)), {}), source, amount)
+                    if timestamp >= day_cutoff:
+                        _add(data["daily"].setdefault(str(int(timestamp // DAY * DAY)), {}), source, amount)
+        except OSError as e:
+            print(f"Error reading the economy ledger {self.log_path}: {e}")
+        print(f"Rebuilt the economy ledger totals from {self.log_path}.")
+        return data
+
+    def _prune(self, data: Dict[str, Dict[str, Totals]], now: float):
+        for kind, kept in (("hourly", self.hours_kept * HOUR), ("daily", self.days_kept * DAY)):
+            buckets = data[kind]
+            for start in [start for start in buckets if int(start) < now - kept]:
+                del buckets[start]
+
+    # --- Reports ---
+
+    def totals(self, seconds: float, now: Optional[float] = None) -> Totals:
+        """Per-source [added, removed, changes] over about the last `seconds`.
+
+        Windows that fit in the hourly buckets are summed from those (to the hour);
+        longer ones from the daily buckets (to the day).
+        """
+        now = time.time() if now is None else now
+        kind, size = ("hourly", HOUR) if seconds <= self.hours_kept * HOUR else ("daily", DAY)
+        # The bucket holding the start of the window counts whole.
+        start = (now - seconds) // size * size
+        result: Totals = {}
+        with self._lock:
+            for bucket_start, bucket in self._totals()[kind].items():
+                if int(bucket_start) >= start:
+                    for source, (added, removed, count) in bucket.items():
+                        entry = result.setdefault(source, [0, 0, 0])
+                        entry[0] += added
+                        entry[1] += removed
+                        entry[2] += count
+        return result
+
+    def series(self, kind: str = "daily", count: int = 7, now: Optional[float] = None) -> List[Tuple[int, int, int]]:
+        """(bucket start, coins added, coins removed) for the last count hours or days, oldest first."""
+        now = time.time() if now is None else now
+        size = HOUR if kind == "hourly" else DAY
+        current = int(now // size * size)
+        with self._lock:
+            buckets = self._totals()[kind]
+            result = []
+            for start in range(current - (count - 1) * size, current + 1, size):
+                bucket = buckets.get(str(start), {})
+                result.append((start, sum(entry[0] for entry in bucket.values()),
+                               sum(entry[1] for entry in bucket.values())))
+        return result
@@ -10,17 +10,14 @@ class MakeASentence(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.main_guild_id = utils.MAIN_GUILD_ID
+        # The router re-reads the channel from the config whenever it is reloaded.
+        utils.message_router.add_route("make a sentence", self._on_message, lambda: [utils.bot_config.get('make_a_sentence_channel_id')], owner=self)
 
-    @commands.Cog.listener()
-    async def on_message(self, message: discord.Message):
-        # Always get the latest channel IDs from the global config file
-        make_a_sentence_channel_id = utils.bot_config.get('make_a_sentence_channel_id')
-
-        # If the channel ID is not set, or if the message is from a bot,
-        # or it's not the correct channel, stop processing.
-        if make_a_sentence_channel_id is None or message.author.bot or message.channel.id != make_a_sentence_channel_id:
-            return
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
 
+    async def _on_message(self, routed):
+        message = routed.message
         content = message.content.strip()
         words = content.split()
         
@@ -0,0 +1,197 @@
+# cogs/message_router.py
+
+import asyncio
+import re
+import time
+import traceback
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import discord
+from discord.ext import commands
+
+from cogs import keyword_matcher
+
+Handler = Callable[["RoutedMessage"], Awaitable[Any]]
+ChannelResolver = Callable[[], Iterable[Optional[int]]]
+
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+class RoutedMessage:
+    """A message plus the normalized forms the handlers match against.
+
+    Each form is computed at most once per message, however many handlers use it.
+    """
+
+    __slots__ = ("message", "channel_id", "guild_id", "_lowered", "_words", "_normalized")
+
+    def __init__(self, message: discord.Message):
+        self.message = message
+        self.channel_id = message.channel.id
+        self.guild_id = message.guild.id if message.guild else None
+        self._lowered: Optional[str] = None
+        self._words: Optional[List[str]] = None
+        self._normalized: Optional[str] = None
+
+    @property
+    def author(self):
+        return self.message.author
+
+    @property
+    def content(self) -> str:
+        return self.message.content
+
+    @property
+    def lowered(self) -> str:
+        """The content in lower case."""
+        if self._lowered is None:
+            self._lowered = self.message.content.lower()
+        return self._lowered
+
+    @property
+    def words(self) -> List[str]:
+        """The lower-case words of the content with punctuation stripped."""
+        if self._words is None:
+            self._words = _NON_WORD.sub('', self.lowered).split()
+        return self._words
+
+    @property
+    def normalized(self) -> str:
+        """The content as KeywordMatchers search it: leetspeak folded, punctuation stripped."""
+        if self._normalized is None:
+            self._normalized = keyword_matcher.normalize(self.message.content)
+        return self._normalized
+
+
+class _Route:
+    __slots__ = ("name", "handler", "owner", "channels", "allow_bots", "guild_only", "calls", "seconds", "errors")
+
+    def __init__(self, name: str, handler: Handler, owner: Any, channels: Optional[ChannelResolver],
+                 allow_bots: bool, guild_only: bool):
+        self.name = name
+        self.handler = handler
+        self.owner = owner
+        self.channels = channels
+        self.allow_bots = allow_bots
+        self.guild_only = guild_only
+        self.calls = 0
+        self.seconds = 0.0
+        self.errors = 0
+
+    def accepts(self, routed: RoutedMessage) -> bool:
+        if routed.author.bot and not self.allow_bots:
+            return False
+        return routed.guild_id is not None or not self.guild_only
+
+
+class MessageRouter:
+    """The bot's single on_message: sends each message only to the handlers that want it.
+
+    Channel routes are looked up in a channel id -> handlers table. Each route gives a
+    resolver that returns its channel ids (from bot_config, a state file, a cog attribute).
+    The table is rebuilt from the resolvers after invalidate(), which reload_globals()
+    calls and which cogs call when they move their game to another channel. Scanners run
+    on every message, such as the swear jar, which looks at every word anyone types.
+
+    Handlers receive a RoutedMessage. The ones a message matches run concurrently, as
+    separate listeners would, and an exception in one doesn't affect the others.
+    """
+
+    def __init__(self):
+        self._routes: List[_Route] = []
+        self._scanners: List[_Route] = []
+        self._table: Optional[Dict[int, List[_Route]]] = None
+        self.messages = 0
+
+    # --- Registration ---
+
+    def add_route(self, name: str, handler: Handler, channels: ChannelResolver, owner: Any = None,
+                  allow_bots: bool = False):
+        """Runs handler for messages in the channels channels() returns."""
+        self._routes.append(_Route(name, handler, owner, channels, allow_bots, guild_only=True))
+        self.invalidate()
+
+    def add_scanner(self, name: str, handler: Handler, owner: Any = None, allow_bots: bool = False,
+                    guild_only: bool = True):
+        """Runs handler for every message (in a guild, unless guild_only is False)."""
+        self._scanners.append(_Route(name, handler, owner, None, allow_bots, guild_only))
+
+    def remove_owner(self, owner: Any):
+        """Drops every route and scanner a cog registered, e.g. in its cog_unload."""
+        self._routes = [route for route in self._routes if route.owner is not owner]
+        self._scanners = [route for route in self._scanners if route.owner is not owner]
+        self.invalidate()
+
+    def invalidate(self):
+        """Rebuilds the routing table before the next message."""
+        self._table = None
+
+    def _build_table(self) -> Dict[int, List[_Route]]:
+        table: Dict[int, List[_Route]] = {}
+        for route in self._routes:
+            try:
+                channel_ids = {int(channel_id) for channel_id in route.channels() if channel_id}
+            except Exception as e:
+                print(f"Error resolving the channels of message route '{route.name}': {e}")
+                continue
+            for channel_id in channel_ids:
+                table.setdefault(channel_id, []).append(route)
+        return table
+
+    # --- Dispatch ---
+
+    async def _run(self, route: _Route, routed: RoutedMessage):
+        start = time.perf_counter()
+        try:
+            await route.handler(routed)
+        except Exception:
+            route.errors += 1
+            print(f"Error in message handler '{route.name}':")
+            traceback.print_exc()
+        finally:
+            route.calls += 1
+            route.seconds += time.perf_counter() - start
+
+    async def dispatch(self, message: discord.Message):
+        self.messages += 1
+        routed = RoutedMessage(message)
+        if self._table is None:
+            self._table = self._build_table()
+        routes = [route for route in self._scanners if route.accepts(routed)]
+        routes.extend(route for route in self._table.get(routed.channel_id, ()) if route.accepts(routed))
+        if not routes:
+            return
+        if len(routes) == 1:
+            await self._run(routes[0], routed)
+        else:
+            await asyncio.gather(*(self._run(route, routed) for route in routes))
+
+    # --- Introspection ---
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-handler invocations, errors and time spent (including awaits), busiest first."""
+        stats = []
+        for kind, routes in (("scanner", self._scanners), ("channel", self._routes)):
+            for route in routes:
+                stats.append({"name": route.name, "kind": kind, "calls": route.calls,
+                              "seconds": route.seconds, "errors": route.errors})
+        stats.sort(key=lambda entry: entry["seconds"], reverse=True)
+        return stats
+
+    def routed_channels(self) -> int:
+        if self._table is None:
+            self._table = self._build_table()
+        return len(self._table)
+
+
+# The single router shared by every cog. Registering works before this extension is
+# loaded; loading it is what attaches the router to the bot's on_message.
+router = MessageRouter()
+
+
+async def setup(bot: commands.Bot):
+    bot.add_listener(router.dispatch, "on_message")
+
+
+async def teardown(bot: commands.Bot):
+    bot.remove_listener(router.dispatch, "on_message")
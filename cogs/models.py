@@ -0,0 +1,236 @@
+# cogs/models.py
+"""Typed in-memory records for the per-user economy data.
+
+The data files keep their usual JSON shape; these classes are what the code works with
+in between. from_record() fills in every default in one place (and accepts the legacy
+shapes still found on disk), to_record() gives back the on-disk form. Keys a record
+doesn't know about are carried along untouched, so a load/save round trip never loses
+data written by another cog or an older version of the bot.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def _int(value: Any) -> int:
+    """Reads a stored number, treating a missing or broken value as 0."""
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _extra(raw: Dict[str, Any], known: Iterable[str]) -> Optional[Dict[str, Any]]:
+    extra = {key: value for key, value in raw.items() if key not in known}
+    return extra or None
+
+
+class Balance:
+    """A user's coins: {"wallet": int, "bank": int} in balances.json."""
+
+    __slots__ = ("wallet", "bank")
+
+    def __init__(self, wallet: int = 0, bank: int = 0):
+        self.wallet = wallet
+        self.bank = bank
+
+    @classmethod
+    def from_record(cls, raw: Any) -> "Balance":
+        if raw is None:
+            return cls()
+        if isinstance(raw, int):
+            # The old format stored just the wallet.
+            return cls(raw, 0)
+        return cls(_int(raw.get("wallet")), _int(raw.get("bank")))
+
+    def to_record(self) -> Dict[str, int]:
+        return {"wallet": self.wallet, "bank": self.bank}
+
+    def add(self, wallet: int = 0, bank: int = 0):
+        self.wallet += wallet
+        self.bank += bank
+
+    @property
+    def total(self) -> int:
+        return self.wallet + self.bank
+
+    def __repr__(self):
+        return f"Balance(wallet={self.wallet}, bank={self.bank})"
+
+
+class Net:
+    """One bug net in an inventory's "nets" list."""
+
+    __slots__ = ("name", "durability", "extra")
+
+    def __init__(self, name: str, durability: int = 0, extra: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.durability = durability
+        self.extra = extra
+
+    @classmethod
+    def from_record(cls, raw: Dict[str, Any]) -> "Net":
+        return cls(raw.get("name", ""), _int(raw.get("durability")), _extra(raw, ("name", "durability")))
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {"name": self.name, "durability": self.durability}
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    @property
+    def broken(self) -> bool:
+        return self.durability <= 0
+
+    def __repr__(self):
+        return f"Net({self.name!r}, durability={self.durability})"
+
+
+class Inventory:
+    """A user's inventory in user_inventory.json.
+
+    items maps lower-case item names to counts. Nets aren't stacked: each one is its own
+    Net with its own durability, and equipped_net names the one in use.
+    """
+
+    __slots__ = ("items", "nets", "equipped_net", "stars", "net_durability", "xp", "extra")
+
+    _KNOWN = ("items", "nets", "equipped_net", "stars", "net_durability", "xp")
+
+    def __init__(self, items: Optional[Dict[str, int]] = None, nets: Optional[List[Net]] = None,
+                 equipped_net: Optional[str] = None, stars: int = 0, net_durability: int = 0, xp: int = 0,
+                 extra: Optional[Dict[str, Any]] = None):
+        self.items = items if items is not None else {}
+        self.nets = nets if nets is not None else []
+        self.equipped_net = equipped_net
+        self.stars = stars
+        self.net_durability = net_durability
+        self.xp = xp
+        self.extra = extra
+
+    @classmethod
+    def from_record(cls, raw: Optional[Dict[str, Any]]) -> "Inventory":
+        """Builds an inventory from its stored dict. The result shares nothing with raw."""
+        if not raw:
+            return cls()
+        return cls(
+            items={name: _int(count) for name, count in (raw.get("items") or {}).items()},
+            nets=[Net.from_record(net) for net in raw.get("nets") or [] if isinstance(net, dict)],
+            equipped_net=raw.get("equipped_net"),
+            stars=_int(raw.get("stars")),
+            net_durability=_int(raw.get("net_durability")),
+            xp=_int(raw.get("xp")),
+            extra=_extra(raw, cls._KNOWN)
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {
+            "items": dict(self.items),
+            "nets": [net.to_record() for net in self.nets],
+            "net_durability": self.net_durability,
+            "xp": self.xp,
+            "stars": self.stars,
+            "equipped_net": self.equipped_net
+        }
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    # --- Stacked items ---
+
+    def count(self, item_name: str) -> int:
+        return self.items.get(item_name.lower(), 0)
+
+    def add_item(self, item_name: str, count: int = 1) -> int:
+        """Adds count of an item and returns the new total."""
+        key = item_name.lower()
+        self.items[key] = self.items.get(key, 0) + count
+        return self.items[key]
+
+    def take_item(self, item_name: str, count: int = 1) -> bool:
+        """Removes count of an item if the user has that many; returns whether it did."""
+        key = item_name.lower()
+        if self.items.get(key, 0) < count:
+            return False
+        self.items[key] -= count
+        return True
+
+    def remove_item(self, item_name: str, count: int = 1):
+        """Removes up to count of an item, dropping it from the inventory when none are left."""
+        key = item_name.lower()
+        if self.items.get(key, 0) > count:
+            self.items[key] -= count
+        else:
+            self.items.pop(key, None)
+
+    # --- Nets ---
+
+    def add_net(self, name: str, durability: int = 0) -> Net:
+        net = Net(name, durability)
+        self.nets.append(net)
+        return net
+
+    def find_net(self, name: Optional[str]) -> Optional[Net]:
+        return next((net for net in self.nets if net.name == name), None)
+
+    def equipped(self) -> Optional[Net]:
+        return self.find_net(self.equipped_net) if self.equipped_net else None
+
+    def discard_net(self, net: Net):
+        """Removes a (broken) net and unequips it."""
+        if net in self.nets:
+            self.nets.remove(net)
+        if self.equipped_net == net.name:
+            self.equipped_net = None
+
+    def __repr__(self):
+        return f"Inventory(items={self.items!r}, nets={self.nets!r}, equipped_net={self.equipped_net!r})"
+
+
+class BugBookEntry:
+    """A user's entry in bug_collection.json: the bugs they caught and their XP."""
+
+    __slots__ = ("caught", "shinies_caught", "xp", "extra")
+
+    _KNOWN = ("caught", "shinies_caught", "xp")
+
+    def __init__(self, caught: Optional[List[str]] = None, shinies_caught: Optional[List[str]] = None,
+                 xp: int = 0, extra: Optional[Dict[str, Any]] = None):
+        self.caught = caught if caught is not None else []
+        self.shinies_caught = shinies_caught if shinies_caught is not None else []
+        self.xp = xp
+        self.extra = extra
+
+    @classmethod
+    def from_record(cls, raw: Optional[Dict[str, Any]]) -> "BugBookEntry":
+        """Builds an entry from its stored dict. The result shares nothing with raw."""
+        if not raw:
+            return cls()
+        return cls(
+            caught=list(raw.get("caught") or []),
+            shinies_caught=list(raw.get("shinies_caught") or []),
+            xp=_int(raw.get("xp")),
+            extra=_extra(raw, cls._KNOWN)
+        )
+
+    def to_record(self) -> Dict[str, Any]:
+        record = {"caught": list(self.caught), "xp": self.xp, "shinies_caught": list(self.shinies_caught)}
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def add_catch(self, bug_name: str, xp: int, shiny: bool = False):
+        self.caught.append(bug_name)
+        if shiny:
+            self.shinies_caught.append(bug_name)
+        self.xp += xp
+
+    def swap_bug(self, given: str, received: str) -> bool:
+        """Trades one copy of given for received; returns False if given isn't in the book."""
+        if given not in self.caught:
+            return False
+        self.caught.remove(given)
+        self.caught.append(received)
+        return True
+
+    def __repr__(self):
+        return f"BugBookEntry(caught={len(self.caught)}, shinies={len(self.shinies_caught)}, xp={self.xp})"
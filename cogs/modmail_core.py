@@ -119,7 +119,7 @@ class ModmailCore(commands.Cog):
                     is_anonymous = False
 
                 try:
-                    thread = await self.bot.fetch_channel(thread_id)
+                    thread = await utils.resolver.channel(thread_id)
                     if thread:
                         embed = discord.Embed(
                             description=message.content,
@@ -149,7 +149,7 @@ class ModmailCore(commands.Cog):
 
             if user_id:
                 try:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await utils.resolver.user(user_id)
                     
                     user_embed = discord.Embed(
                         description=content,
@@ -187,7 +187,7 @@ class ModmailCore(commands.Cog):
             
             if user_id_from_thread:
                 try:
-                    user = await self.bot.fetch_user(int(user_id_from_thread))
+                    user = await utils.resolver.user(user_id_from_thread)
                     if user:
                         await user.send("Your ModMail ticket has been closed by staff.")
                 except:
@@ -219,7 +219,7 @@ class ModmailCore(commands.Cog):
             if active_ticket_data and active_ticket_data.get('is_anon'):
                 user_id = next((uid for uid, tid in self.active_tickets.items() if isinstance(tid, dict) and tid.get('thread_id') == interaction.channel.id), None)
                 if user_id:
-                    user = await self.bot.fetch_user(int(user_id))
+                    user = await utils.resolver.user(user_id)
                     if user:
                         await interaction.response.send_message(f"This thread was opened by {user.mention}.", ephemeral=False)
                     else:
@@ -0,0 +1,110 @@
+# cogs/phrase_pool.py
+
+import asyncio
+import collections
+import time
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+DEFAULT_CAPACITY = 20
+DEFAULT_LOW_WATER = 5
+DEFAULT_BATCH_SIZE = 10
+# After a refill comes back empty (API down, no key), wait this long before trying again.
+DEFAULT_RETRY_AFTER = 5 * 60
+
+
+class PhrasePool:
+    """A bounded stock of AI-written phrases, generated ahead of time in batches.
+
+    Commands take a phrase with pop(), which never waits: it returns None when the pool
+    is empty, and the command falls back to its own hardcoded phrases. Once the pool
+    drops below low_water, pop() starts a refill in the background. The refill asks
+    generate(count) for up to batch_size phrases in one request. A background task can
+    also call refill() to fill pools while the bot is idle.
+    """
+
+    def __init__(self, name: str, generate: Callable[[int], Awaitable[List[str]]], capacity: int = DEFAULT_CAPACITY,
+                 low_water: int = DEFAULT_LOW_WATER, batch_size: int = DEFAULT_BATCH_SIZE,
+                 retry_after: float = DEFAULT_RETRY_AFTER):
+        self.name = name
+        self.capacity = capacity
+        self.low_water = low_water
+        self.batch_size = batch_size
+        self.retry_after = retry_after
+        self._generate = generate
+        self._phrases: Deque[str] = collections.deque()
+        self._refilling = False
+        self._retry_at = 0.0
+        self._refill_task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "refills": 0, "failed_refills": 0, "generated": 0,
+                      "refill_seconds": 0.0, "last_refill_seconds": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._phrases)
+
+    def pop(self) -> Optional[str]:
+        """Takes the oldest phrase, or returns None if there is none ready."""
+        if self._phrases:
+            self.stats["hits"] += 1
+            phrase = self._phrases.popleft()
+        else:
+            self.stats["misses"] += 1
+            phrase = None
+        if len(self._phrases) < self.low_water:
+            self._schedule_refill()
+        return phrase
+
+    def needs_refill(self) -> bool:
+        return len(self._phrases) < self.capacity and not self._refilling and time.monotonic() >= self._retry_at
+
+    def _schedule_refill(self):
+        if not self.needs_refill():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refill_task = loop.create_task(self.refill())
+
+    async def refill(self) -> int:
+        """Generates one batch of phrases and returns how many were added to the pool."""
+        if self._refilling:
+            return 0
+        self._refilling = True
+        start = time.perf_counter()
+        try:
+            phrases = await self._generate(min(self.batch_size, self.capacity - len(self._phrases)))
+        except Exception as e:
+            print(f"Error refilling the {self.name} phrase pool: {e}")
+            phrases = []
+        finally:
+            self._refilling = False
+        elapsed = time.perf_counter() - start
+        self.stats["refills"] += 1
+        self.stats["refill_seconds"] += elapsed
+        self.stats["last_refill_seconds"] = elapsed
+
+        added = 0
+        for phrase in phrases or []:
+            if len(self._phrases) >= self.capacity:
+                break
+            if phrase not in self._phrases:
+                self._phrases.append(phrase)
+                added += 1
+        if not added:
+            self.stats["failed_refills"] += 1
+            self._retry_at = time.monotonic() + self.retry_after
+        self.stats["generated"] += added
+        return added
+
+    async def fill(self):
+        """Refills batch after batch until the pool is full or a refill adds nothing."""
+        while self.needs_refill() and await self.refill():
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        served = stats["hits"] + stats["misses"]
+        stats["size"] = len(self._phrases)
+        stats["hit_rate"] = stats["hits"] / served if served else 0.0
+        stats["average_refill_seconds"] = stats["refill_seconds"] / stats["refills"] if stats["refills"] else 0.0
+        return stats
@@ -18,26 +18,12 @@ os.makedirs(DATA_DIR, exist_ok=True)
 
 # Helper functions for pin storage
 def _load_all_pins():
-    """Loads all user pins from the JSON file."""
-    if not os.path.exists(PINS_FILE):
-        return {}
-    try:
-        with open(PINS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError:
-        print(f"ERROR: Could not decode JSON from {PINS_FILE}. File might be corrupted. Returning empty data.")
-        return {}
-    except Exception as e:
-        print(f"ERROR: An unexpected error occurred while loading {PINS_FILE}: {e}")
-        return {}
+    """Loads all user pins from the shared data store."""
+    return utils.load_data(PINS_FILE, {})
 
 def _save_all_pins(all_pins_data):
-    """Saves all user pins to the JSON file."""
-    try:
-        with open(PINS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(all_pins_data, f, indent=4)
-    except Exception as e:
-        print(f"ERROR: An unexpected error occurred while saving {PINS_FILE}: {e}")
+    """Saves all user pins through the shared data store."""
+    utils.save_data(all_pins_data, PINS_FILE)
 
 def load_user_pins(user_id: int) -> list[str]:
     """Loads pins for a specific user."""
@@ -58,6 +44,9 @@ class Pins(commands.Cog):
         self.MAX_PINS = 50 # Maximum pins per user
         self.main_guild_id = utils.MAIN_GUILD_ID
 
+    def cog_unload(self):
+        utils.flush_data()
+
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
         # Fix: Added a check to ensure the event is from the main guild.
@@ -0,0 +1,176 @@
+# cogs/resolver.py
+
+from typing import Any, Dict, Iterable, Optional, Set
+
+import discord
+from discord.ext import commands
+
+
+class Resolver:
+    """Resolves channel, role and user ids to objects once and keeps them.
+
+    A lookup tries the resolver's own cache first, then the gateway cache (get_channel,
+    get_user, guild.get_role) and only then the REST API (fetch_channel, fetch_user).
+    Whatever it finds is kept until an update or delete event for that id drops it, so
+    an object fetched over REST is never served after it changed. The ids in the bot's
+    config are resolved from the gateway cache as soon as the bot is ready, and again
+    whenever reload_globals() hands over a new set.
+    """
+
+    def __init__(self):
+        self.bot: Optional[commands.Bot] = None
+        self._channels: Dict[int, Any] = {}
+        self._users: Dict[int, discord.abc.User] = {}
+        self._roles: Dict[int, discord.Role] = {}
+        self._configured_channels: Set[int] = set()
+        self.stats = {"hits": 0, "gateway": 0, "rest": 0, "rest_errors": 0, "invalidations": 0}
+
+    # --- Lookups ---
+
+    async def channel(self, channel_id: int):
+        """The channel or thread with this id. Raises discord.NotFound/Forbidden like fetch_channel."""
+        channel_id = int(channel_id)
+        channel = self._channels.get(channel_id)
+        if channel is not None:
+            self.stats["hits"] += 1
+            return channel
+        channel = self.bot.get_channel(channel_id)
+        if channel is not None:
+            self.stats["gateway"] += 1
+        else:
+            channel = await self._fetch(self.bot.fetch_channel, channel_id)
+        self._channels[channel_id] = channel
+        return channel
+
+    async def user(self, user_id: int) -> discord.abc.User:
+        """The user with this id. Raises discord.NotFound like fetch_user."""
+        user_id = int(user_id)
+        user = self._users.get(user_id)
+        if user is not None:
+            self.stats["hits"] += 1
+            return user
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            self.stats["gateway"] += 1
+        else:
+            user = await self._fetch(self.bot.fetch_user, user_id)
+        self._users[user_id] = user
+        return user
+
+    def role(self, guild: discord.Guild, role_id: int) -> Optional[discord.Role]:
+        """The guild's role with this id, or None. Roles always come with the guild, so there is no REST step."""
+        role_id = int(role_id)
+        role = self._roles.get(role_id)
+        if role is not None and role.guild.id == guild.id:
+            self.stats["hits"] += 1
+            return role
+        role = guild.get_role(role_id)
+        if role is not None:
+            self.stats["gateway"] += 1
+            self._roles[role_id] = role
+        return role
+
+    async def _fetch(self, fetch, object_id: int):
+        self.stats["rest"] += 1
+        try:
+            return await fetch(object_id)
+        except discord.HTTPException:
+            self.stats["rest_errors"] += 1
+            raise
+
+    # --- Configured ids ---
+
+    def configure(self, channel_ids: Iterable[Optional[int]]):
+        """Sets the channel ids from the config and drops everything cached for the old ones."""
+        self._configured_channels = {int(channel_id) for channel_id in channel_ids if channel_id}
+        self.clear()
+        if self.bot is not None and self.bot.is_ready():
+            self.warm()
+
+    def warm(self) -> int:
+        """Caches the configured channels the gateway already has and returns how many it found."""
+        found = 0
+        for channel_id in self._configured_channels:
+            channel = self.bot.get_channel(channel_id)
+            if channel is not None:
+                self._channels[channel_id] = channel
+                found += 1
+        return found
+
+    # --- Invalidation ---
+
+    def _drop(self, cache: Dict[int, Any], object_id: int):
+        if cache.pop(object_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def invalidate_channel(self, channel_id: int):
+        self._drop(self._channels, channel_id)
+
+    def invalidate_user(self, user_id: int):
+        self._drop(self._users, user_id)
+
+    def invalidate_role(self, role_id: int):
+        self._drop(self._roles, role_id)
+
+    def clear(self):
+        self._channels.clear()
+        self._users.clear()
+        self._roles.clear()
+
+    async def on_ready(self):
+        self.warm()
+
+    async def on_channel_changed(self, before, after=None):
+        self.invalidate_channel(before.id)
+
+    async def on_raw_thread_changed(self, payload):
+        # The raw events also fire for threads fetched over REST, which the gateway cache
+        # doesn't hold and so gets no on_thread_update for.
+        self.invalidate_channel(payload.thread_id)
+
+    async def on_role_changed(self, before: discord.Role, after: Optional[discord.Role] = None):
+        self.invalidate_role(before.id)
+
+    async def on_user_changed(self, before, after=None):
+        self.invalidate_user(before.id)
+
+    # --- Stats ---
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.stats)
+        lookups = stats["hits"] + stats["gateway"] + stats["rest"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["cached"] = len(self._channels) + len(self._users) + len(self._roles)
+        return stats
+
+
+resolver = Resolver()
+
+_LISTENERS = (
+    (resolver.on_ready, "on_ready"),
+    (resolver.on_channel_changed, "on_guild_channel_update"),
+    (resolver.on_channel_changed, "on_guild_channel_delete"),
+    (resolver.on_raw_thread_changed, "on_raw_thread_update"),
+    (resolver.on_raw_thread_changed, "on_raw_thread_delete"),
+    (resolver.on_role_changed, "on_guild_role_update"),
+    (resolver.on_role_changed, "on_guild_role_delete"),
+    (resolver.on_user_changed, "on_member_update"),
+    (resolver.on_user_changed, "on_member_remove"),
+    (resolver.on_user_changed, "on_user_update"),
+)
+
+
+async def setup(bot: commands.Bot):
+    resolver.bot = bot
+    for listener, event in _LISTENERS:
+        bot.add_listener(listener, event)
+    # bot.py loads the extensions from on_ready, so READY has usually fired already.
+    if bot.is_ready():
+        resolver.warm()
+
+
+async def teardown(bot: commands.Bot):
+    for listener, event in _LISTENERS:
+        bot.remove_listener(listener, event)
+    resolver.clear()
@@ -0,0 +1,158 @@
+# cogs/role_executor.py
+
+import asyncio
+import collections
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import discord
+
+from cogs import journal
+
+# Role changes are one request each on a per-guild rate limit bucket. A few workers
+# keep that bucket busy; discord.py waits out the limit itself, so more would only queue.
+DEFAULT_CONCURRENCY = 4
+# Completions in this window give the current throughput.
+RATE_WINDOW_SECONDS = 60.0
+
+# (guild id, member id, role id, add)
+RoleChange = Tuple[int, int, int, bool]
+
+
+class RoleExecutor:
+    """Applies queued role changes in the background with a few concurrent workers.
+
+    The queue is a journaled file mapping "guild:member:role" to the change wanted, e.g.
+    {"123:456:789": {"add": true, "reason": "Daily repeatable role."}}. Queueing a change
+    for a pair that is already waiting replaces it, so "remove from everyone, then add to
+    everyone" leaves one add per member. A change is checked against the member's roles
+    just before it is sent and skipped if there is nothing to do. Entries leave the file
+    only once they are done, so a sweep cut short by a restart carries on from the file.
+    """
+
+    def __init__(self, file_path: str, concurrency: int = DEFAULT_CONCURRENCY):
+        self.file_path = file_path
+        self.concurrency = concurrency
+        self._journal = journal.register(file_path)
+        self._bot: Optional[discord.Client] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._queued: Set[str] = set()
+        self._workers: List[asyncio.Task] = []
+        self._completed: Deque[float] = collections.deque()
+        self.stats = {"queued": 0, "replaced": 0, "applied": 0, "skipped": 0, "failed": 0}
+
+    @staticmethod
+    def _key(guild_id: int, member_id: int, role_id: int) -> str:
+        return f"{guild_id}:{member_id}:{role_id}"
+
+    def _pending(self) -> Dict[str, Dict[str, Any]]:
+        return self._journal.load()
+
+    # --- Queueing ---
+
+    def queue(self, guild_id: int, member_id: int, role_id: int, add: bool, reason: Optional[str] = None):
+        self.queue_many([(guild_id, member_id, role_id, add)], reason)
+
+    def queue_many(self, changes: Iterable[RoleChange], reason: Optional[str] = None) -> int:
+        """Queues role changes with one write to the queue file and returns how many were queued."""
+        pending = self._pending()
+        count = 0
+        for guild_id, member_id, role_id, add in changes:
+            key = self._key(guild_id, member_id, role_id)
+            if key in pending:
+                self.stats["replaced"] += 1
+            pending[key] = {"add": add, "reason": reason}
+            self._enqueue(key)
+            count += 1
+        if count:
+            self.stats["queued"] += count
+            self._journal.save(pending)
+        return count
+
+    def _enqueue(self, key: str):
+        if self._queue is not None and key not in self._queued:
+            self._queued.add(key)
+            self._queue.put_nowait(key)
+
+    # --- Workers ---
+
+    def start(self, bot: discord.Client, concurrency: Optional[int] = None):
+        """Starts the workers and picks up whatever the queue file still holds."""
+        if self._workers:
+            return
+        self._bot = bot
+        if concurrency:
+            self.concurrency = concurrency
+        self._queue = asyncio.Queue()
+        self._queued.clear()
+        for key in list(self._pending()):
+            self._enqueue(key)
+        if self._queued:
+            print(f"Resuming {len(self._queued)} queued role changes.")
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    def stop(self):
+        """Stops the workers. Changes not yet applied stay in the queue file."""
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queue = None
+        self._queued.clear()
+
+    async def _worker(self):
+        while True:
+            key = await self._queue.get()
+            self._queued.discard(key)
+            change = self._pending().get(key)
+            if change is None:
+                continue
+            try:
+                await self._apply(key, change)
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"Error applying role change {key}: {e}")
+            # A newer change queued for the same pair meanwhile is still waiting its turn.
+            if self._pending().get(key) is change:
+                self._journal.delete([key])
+
+    async def _apply(self, key: str, change: Dict[str, Any]):
+        guild_id, member_id, role_id = (int(part) for part in key.split(":"))
+        guild = self._bot.get_guild(guild_id)
+        member = guild.get_member(member_id) if guild else None
+        role = guild.get_role(role_id) if guild else None
+        if member is None or role is None:
+            # The member left or the role was deleted.
+            self.stats["skipped"] += 1
+            return
+        if (member.get_role(role_id) is not None) == change["add"]:
+            self.stats["skipped"] += 1
+            return
+        try:
+            if change["add"]:
+                await member.add_roles(role, reason=change.get("reason"))
+            else:
+                await member.remove_roles(role, reason=change.get("reason"))
+        except discord.Forbidden:
+            self.stats["failed"] += 1
+            print(f"Could not {'add' if change['add'] else 'remove'} role {role.name} for {member.display_name}. Bot lacks permissions.")
+            return
+        self.stats["applied"] += 1
+        self._completed.append(time.monotonic())
+
+    # --- Progress ---
+
+    def pending(self) -> int:
+        return len(self._pending())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """The counters plus the current rate (changes per second) and the ETA in seconds."""
+        now = time.monotonic()
+        while self._completed and self._completed[0] < now - RATE_WINDOW_SECONDS:
+            self._completed.popleft()
+        rate = len(self._completed) / RATE_WINDOW_SECONDS
+        stats: Dict[str, Any] = dict(self.stats)
+        stats["pending"] = self.pending()
+        stats["workers"] = len(self._workers)
+        stats["rate"] = rate
+        stats["eta_seconds"] = stats["pending"] / rate if rate else None
+        return stats
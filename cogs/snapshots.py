@@ -0,0 +1,193 @@
+# cogs/snapshots.py
+
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Callable, Dict, List, Optional
+
+from cogs.data_store import store
+
+MANIFEST_NAME = "manifest.json"
+DEFAULT_KEEP = 48
+
+# Left out of snapshots: temporary and quarantined files, and SQLite's side files (the
+# database itself is copied with SQLite's backup API).
+_SKIPPED_SUFFIXES = (".tmp", "-wal", "-shm", "-journal")
+
+
+def _is_snapshot_candidate(name: str) -> bool:
+    if name.startswith(".") or ".corrupt-" in name:
+        return False
+    return not name.endswith(_SKIPPED_SUFFIXES)
+
+
+def _is_appended(name: str) -> bool:
+    """Journal segments and append-only logs such as the economy ledger."""
+    return ".journal." in name or name.endswith(".jsonl")
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SnapshotManager:
+    """Point-in-time copies of the data directory, kept under <data>/snapshots/<name>/.
+
+    Every file is copied, never linked: journals, logs and SQLite are changed in place,
+    and so is any file an admin edits by hand, which would change every snapshot linked
+    to it. A copy whose content is identical to the previous snapshot's is replaced by a
+    hard link to that copy, so unchanged files cost no extra space.
+
+    Snapshots are taken on the data store's I/O thread right after a flush, so no write
+    can land halfway through and every snapshot is a consistent set of files.
+    """
+
+    def __init__(self, data_dir: str, keep: int = DEFAULT_KEEP):
+        self.data_dir = data_dir
+        self.root = os.path.join(data_dir, "snapshots")
+        self.keep = keep
+
+    # --- Listing ---
+
+    def _manifest(self, name: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.root, name, MANIFEST_NAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Returns the manifests of all complete snapshots, newest first."""
+        if not os.path.isdir(self.root):
+            return []
+        manifests = []
+        for name in sorted(os.listdir(self.root), reverse=True):
+            manifest = self._manifest(name)
+            if manifest is not None:
+                manifests.append(manifest)
+        return manifests
+
+    # --- Taking snapshots ---
+
+    def _take(self, reason: str, backups: Dict[str, Callable[[str], None]], protect: Optional[str] = None) -> Dict[str, Any]:
+        store.flush()
+        created = datetime.datetime.now(datetime.timezone.utc)
+        name = created.strftime("%Y%m%d-%H%M%S-%f")
+        directory = os.path.join(self.root, name)
+        os.makedirs(directory)
+
+        previous = self.list()
+        previous_name = previous[0]["name"] if previous else None
+        previous_files = previous[0]["files"] if previous else {}
+
+        files: Dict[str, Dict[str, Any]] = {}
+        for entry in sorted(os.scandir(self.data_dir), key=lambda e: e.name):
+            if not entry.is_file() or not _is_snapshot_candidate(entry.name):
+                continue
+            destination = os.path.join(directory, entry.name)
+            backup = backups.get(os.path.abspath(entry.path))
+            if backup is not None:
+                backup(destination)
+            else:
+                shutil.copy2(entry.path, destination)
+            digest = _sha256(destination)
+            stored = "copy"
+            earlier = previous_files.get(entry.name)
+            if earlier and earlier.get("sha256") == digest:
+                # Same content as last time: share the earlier copy's blocks.
+                earlier_path = os.path.join(self.root, previous_name, entry.name)
+                try:
+                    os.remove(destination)
+                    os.link(earlier_path, destination)
+                    stored = "dedup"
+                except OSError:
+                    # No hard links on this filesystem: keep a copy of the same content.
+                    shutil.copy2(earlier_path, destination)
+            files[entry.name] = {"size": os.path.getsize(destination), "stored": stored, "sha256": digest}
+
+        manifest = {"name": name, "created": created.isoformat(), "reason": reason, "files": files}
+        # The manifest is written last; a snapshot without one is incomplete and ignored.
+        with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=4)
+        self._prune(protect)
+        return manifest
+
+    def _job(self, reason: str, backups: Optional[Dict[str, Callable[[str], None]]]) -> Callable[[], Dict[str, Any]]:
+        backups = {os.path.abspath(path): backup for path, backup in (backups or {}).items()}
+        return lambda: self._take(reason, backups)
+
+    def take(self, reason: str = "scheduled", backups: Optional[Dict[str, Callable[[str], None]]] = None) -> Dict[str, Any]:
+        """Takes a snapshot, blocking until it is done, and returns its manifest.
+
+        backups maps files that are open and changing, such as a live SQLite database, to
+        a function that writes a consistent copy of it to the given path.
+        """
+        return store.submit(self._job(reason, backups)).result()
+
+    async def take_async(self, reason: str = "scheduled", backups: Optional[Dict[str, Callable[[str], None]]] = None) -> Dict[str, Any]:
+        """Like take(), but waits for the I/O thread without blocking the event loop."""
+        return await asyncio.wrap_future(store.submit(self._job(reason, backups)))
+
+    def _prune(self, protect: Optional[str] = None):
+        """Deletes the oldest snapshots beyond the retention limit, and incomplete ones."""
+        names = sorted(os.listdir(self.root), reverse=True)
+        complete = [name for name in names if self._manifest(name) is not None]
+        for name in names:
+            if name == protect:
+                continue
+            if name not in complete or complete.index(name) >= self.keep:
+                shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+
+    # --- Restoring ---
+
+    def _restore(self, name: str, after: Optional[Callable[[], None]]) -> List[str]:
+        manifest = self._manifest(name)
+        if manifest is None:
+            raise ValueError(f"There is no complete snapshot called '{name}'.")
+        directory = os.path.join(self.root, name)
+        # Keep the current state (including anything still queued, which this flushes) so
+        # the restore itself can be undone.
+        self._take(f"before restoring {name}", {}, protect=name)
+
+        restored = []
+        for file_name in manifest["files"]:
+            source = os.path.join(directory, file_name)
+            target = os.path.join(self.data_dir, file_name)
+            # Copy rather than link back, so changes made in place to the live file can
+            # never reach into the snapshot.
+            temp_path = f"{target}.restore.tmp"
+            shutil.copy2(source, temp_path)
+            os.replace(temp_path, target)
+            restored.append(file_name)
+            if file_name.endswith(".db"):
+                # A leftover write-ahead log would be applied on top of the restored database.
+                for suffix in ("-wal", "-shm"):
+                    if os.path.exists(target + suffix):
+                        os.remove(target + suffix)
+
+        # Journal segments written after the snapshot would be replayed over it, and logs
+        # started after it hold nothing from its point in time.
+        for entry in os.scandir(self.data_dir):
+            if entry.is_file() and _is_appended(entry.name) and entry.name not in manifest["files"]:
+                os.remove(entry.path)
+        store.discard()
+        if after is not None:
+            after()
+        return restored
+
+    def restore(self, name: str, after: Optional[Callable[[], None]] = None) -> List[str]:
+        """Puts the files of a snapshot back into the data directory and drops every cache.
+
+        A snapshot of the current state is taken first. Runs on the data store's I/O thread
+        so no write can interleave; `after` runs there too, before anything else can touch
+        the store. Open SQLite connections must be closed by the caller first. Returns the
+        restored file names.
+        """
+        return store.submit(lambda: self._restore(name, after)).result()
@@ -0,0 +1,190 @@
+# cogs/sqlite_store.py
+
+import contextlib
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS balances (
+    user_id TEXT PRIMARY KEY,
+    wallet INTEGER NOT NULL DEFAULT 0,
+    bank INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS inventories (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS bug_collection (
+    user_id TEXT PRIMARY KEY,
+    xp INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS bug_collection_xp ON bug_collection (xp DESC);
+"""
+
+
+class SQLiteStore:
+    """SQLite storage for balances, inventories and the bug collection.
+
+    Each user is one row, keyed by the same string id the JSON files use, so reads and
+    updates touch only that user's row. Inventories and bug book entries stay free-form
+    JSON documents, since the cogs add new keys to them over time.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # The connection is shared between the event loop and the data store's I/O thread.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.RLock()
+        # How many transaction() blocks are open inside the outermost one.
+        self._depth = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def backup_to(self, destination_path: str):
+        """Copies the database to destination_path with SQLite's online backup API.
+
+        The copy is consistent even while the bot keeps writing, unlike copying the file
+        and its -wal file byte by byte.
+        """
+        target = sqlite3.connect(destination_path)
+        try:
+            with self._lock:
+                self._conn.backup(target)
+        finally:
+            target.close()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Runs every read and write made inside the block as one BEGIN IMMEDIATE ... COMMIT.
+
+        The other methods take the same re-entrant lock, so they can be called from inside
+        the block and become part of the transaction. Any exception rolls it back. A block
+        opened inside another one is a SAVEPOINT: an exception rolls back only that block
+        and then, unless caught, the outer one.
+        """
+        with self._lock:
+            if self._conn.in_transaction:
+                self._depth += 1
+                savepoint = f"nested_{self._depth}"
+                self._conn.execute(f"SAVEPOINT {savepoint}")
+                try:
+                    yield self
+                except BaseException:
+                    self._conn.execute(f"ROLLBACK TO {savepoint}")
+                    self._conn.execute(f"RELEASE {savepoint}")
+                    raise
+                else:
+                    self._conn.execute(f"RELEASE {savepoint}")
+                finally:
+                    self._depth -= 1
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    # --- Balances ---
+
+    def get_balance(self, user_id) -> Tuple[int, int]:
+        """Returns (wallet, bank) for a user, or (0, 0) if they have no row yet."""
+        with self._lock:
+            row = self._conn.execute("SELECT wallet, bank FROM balances WHERE user_id = ?", (str(user_id),)).fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def add_balance(self, user_id, wallet_delta: int = 0, bank_delta: int = 0):
+        """Adds to a user's wallet and bank in a single upsert."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO balances (user_id, wallet, bank) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET wallet = wallet + excluded.wallet, bank = bank + excluded.bank",
+                (str(user_id), wallet_delta, bank_delta)
+            )
+
+    def all_balances(self) -> Dict[str, Dict[str, int]]:
+        """Returns every balance in the same shape as balances.json."""
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, wallet, bank FROM balances").fetchall()
+        return {user_id: {"wallet": wallet, "bank": bank} for user_id, wallet, bank in rows}
+
+    # --- Inventories ---
+
+    def get_inventory(self, user_id) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM inventories WHERE user_id = ?", (str(user_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_inventory(self, user_id, inventory: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO inventories (user_id, data) VALUES (?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET data = excluded.data",
+                (str(user_id), json.dumps(inventory))
+            )
+
+    def all_inventories(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, data FROM inventories").fetchall()
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    # --- Bug collection ---
+
+    def get_bug_data(self, user_id) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM bug_collection WHERE user_id = ?", (str(user_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_bug_data(self, user_id, bug_data: Dict[str, Any]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO bug_collection (user_id, xp, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id) DO UPDATE SET xp = excluded.xp, data = excluded.data",
+                (str(user_id), int(bug_data.get("xp", 0) or 0), json.dumps(bug_data))
+            )
+
+    def all_bug_data(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT user_id, data FROM bug_collection").fetchall()
+        return {user_id: json.loads(data) for user_id, data in rows}
+
+    def replace_bug_collection(self, bug_collection: Dict[str, Dict[str, Any]]):
+        """Writes a whole bug collection dict, for callers that still save it in one piece."""
+        rows = [(str(user_id), int(data.get("xp", 0) or 0), json.dumps(data)) for user_id, data in bug_collection.items()]
+        with self.transaction():
+            self._conn.execute("DELETE FROM bug_collection")
+            self._conn.executemany("INSERT INTO bug_collection (user_id, xp, data) VALUES (?, ?, ?)", rows)
+
+    # --- Migration ---
+
+    def import_json(self, balances: Dict[str, Any], inventories: Dict[str, Any], bug_collection: Dict[str, Any]) -> Dict[str, int]:
+        """Replaces the database contents with the given JSON file contents in one transaction.
+
+        Balances in the legacy integer format are imported as wallet money.
+        """
+        balance_rows = []
+        for user_id, user_data in balances.items():
+            if isinstance(user_data, int):
+                user_data = {"wallet": user_data, "bank": 0}
+            balance_rows.append((str(user_id), int(user_data.get("wallet", 0)), int(user_data.get("bank", 0))))
+        inventory_rows = [(str(user_id), json.dumps(data)) for user_id, data in inventories.items()]
+        bug_rows = [(str(user_id), int(data.get("xp", 0) or 0), json.dumps(data)) for user_id, data in bug_collection.items()]
+
+        with self.transaction():
+            self._conn.execute("DELETE FROM balances")
+            self._conn.execute("DELETE FROM inventories")
+            self._conn.execute("DELETE FROM bug_collection")
+            self._conn.executemany("INSERT INTO balances (user_id, wallet, bank) VALUES (?, ?, ?)", balance_rows)
+            self._conn.executemany("INSERT INTO inventories (user_id, data) VALUES (?, ?)", inventory_rows)
+            self._conn.executemany("INSERT INTO bug_collection (user_id, xp, data) VALUES (?, ?, ?)", bug_rows)
+        return {"balances": len(balance_rows), "inventories": len(inventory_rows), "bug_collection": len(bug_rows)}
@@ -2,7 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import cogs.utils as utils 
-import re
+from cogs.keyword_matcher import KeywordMatcher
 import os
 import json
 
@@ -32,6 +32,21 @@ class SwearJar(commands.Cog):
                 initial_data = {'words': [], 'tally': {}}
                 utils.save_swear_jar_data(initial_data)
 
+        # Compiled from the word list; rebuilt by /addswear, /removeswear and when the
+        # file is edited by hand (which gives the list a new identity).
+        self._matcher = KeywordMatcher([], stems=utils.KEYWORD_STEMS)
+        self._matcher_words = None
+
+        utils.message_router.add_scanner("swear jar", self._on_message, owner=self)
+
+    def _rebuild_matcher(self, words):
+        self._matcher = KeywordMatcher(words, stems=utils.KEYWORD_STEMS)
+        self._matcher_words = words
+
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
+        utils.flush_data()
+
     @app_commands.command(name="addswear", description="Adds a word to the swear jar list.")
     @app_commands.checks.has_permissions(manage_guild=True)
     @app_commands.describe(word="The word to add to the swear jar.")
@@ -44,6 +59,7 @@ class SwearJar(commands.Cog):
         
         swear_jar_data['words'].append(word_lower)
         utils.save_swear_jar_data(swear_jar_data)
+        self._rebuild_matcher(swear_jar_data['words'])
         await interaction.response.send_message(f"Successfully added '{word}' to the swear jar list.", ephemeral=True)
 
     @app_commands.command(name="removeswear", description="Removes a word from the swear jar list.")
@@ -58,11 +74,12 @@ class SwearJar(commands.Cog):
         
         swear_jar_data['words'].remove(word_lower)
         utils.save_swear_jar_data(swear_jar_data)
+        self._rebuild_matcher(swear_jar_data['words'])
         await interaction.response.send_message(f"Successfully removed '{word}' from the swear jar list.", ephemeral=True)
 
     @app_commands.command(name="swearlist", description="Shows the current list of words in the swear jar.")
     async def swearlist(self, interaction: discord.Interaction):
-        swear_jar_data = utils.load_swear_jar_data()
+        swear_jar_data = utils.load_swear_jar_data(read_only=True)
         swears = swear_jar_data.get('words', [])
 
         if not swears:
@@ -79,7 +96,7 @@ class SwearJar(commands.Cog):
 
     @app_commands.command(name="checkswear", description="Checks the current swear tally.")
     async def check_swear(self, interaction: discord.Interaction):
-        swear_jar_data = utils.load_swear_jar_data()
+        swear_jar_data = utils.load_swear_jar_data(read_only=True)
         tally = swear_jar_data.get('tally', {})
 
         if not tally:
@@ -101,26 +118,20 @@ class SwearJar(commands.Cog):
         )
         await interaction.response.send_message(embed=embed)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot or not message.guild:
-            return
+    async def _on_message(self, routed):
+        message = routed.message
 
-        swear_jar_data = utils.load_swear_jar_data()
-        swears = swear_jar_data.get('words', [])
-        
-        # This is the updated, more flexible word-matching logic.
-        # It removes all non-alphanumeric characters and then splits the message into words.
-        message_words = re.sub(r'[^\w\s]','',message.content.lower()).split()
-        
-        for word in message_words:
-            if word in swears:
-                user_id_str = str(message.author.id)
-                swear_jar_data['tally'][user_id_str] = swear_jar_data['tally'].get(user_id_str, 0) + 1
-                utils.save_swear_jar_data(swear_jar_data)
-
-                await message.channel.send(f"<a:starcoin:1280590254935380038> **Swear Jar!** {message.author.mention} has sworn. That's {swear_jar_data['tally'][user_id_str]} swears so far!")
-                return
+        # The live cached object; nothing is parsed unless the file changed on disk.
+        swears = utils.load_swear_jar_data().get('words', [])
+        if swears is not self._matcher_words or self._matcher.stems != utils.KEYWORD_STEMS:
+            self._rebuild_matcher(swears)
+
+        # One pass over the message however long the list is. A message counts once,
+        # however many swears it has.
+        if self._matcher.search(routed.normalized):
+            swear_count = utils.add_swear_to_tally(message.author.id)
+
+            await message.channel.send(f"<a:starcoin:1280590254935380038> **Swear Jar!** {message.author.mention} has sworn. That's {swear_count} swears so far!")
                 
 async def setup(bot):
     await bot.add_cog(SwearJar(bot))
\ No newline at end of file
@@ -8,38 +8,17 @@ import os
 import asyncio
 import sys
 import traceback
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Tuple
 import re
 import cogs.utils as utils
+from cogs.deadlines import DeadlineQueue
 
 # Define the path to the data directory, now local to this cog's file.
 DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
-DAILY_MESSAGE_COOLDOWNS_FILE = os.path.join(DATA_DIR, "daily_message_cooldowns.json")
 REWARDS_FILE = os.path.join(DATA_DIR, 'rewards.json')
-
-# Helper functions for data persistence, now located in this file.
-def _load_data(file_path: str, default_value: Any = None) -> Any:
-    """Loads data from a JSON file, returning a default value if the file is not found or is corrupted."""
-    if not os.path.exists(file_path):
-        return default_value if default_value is not None else {}
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"JSON Decode Error in {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
-    except Exception as e:
-        print(f"Error loading data from {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
-
-def _save_data(data: Any, file_path: str):
-    """Saves data to a JSON file."""
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving data to {file_path}: {e}")
+# How long the checkin cooldown role stays on a member.
+CHECKIN_COOLDOWN_SECONDS = 16 * 60 * 60
+DAY_OF_WEEK_MAP = {'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3, 'Friday': 4, 'Saturday': 5, 'Sunday': 6}
 
 async def is_moderator(interaction: discord.Interaction) -> bool:
     """Checks if the user has a Staff role."""
@@ -68,13 +47,38 @@ class TimeRole(commands.Cog):
         self.TASK_DROP_CHANNEL_ID = 1397729250584432731
         self.TIMED_TASK_ROLE_ID = 1408994431356370964
         self.checkin_cooldown_role_id = 1293639562815475752
+
+        utils.cooldowns.define("checkin_daily", 24 * 60 * 60)
+        utils.cooldowns.define("checkin_weekly", 7 * 24 * 60 * 60)
+        utils.cooldowns.load()
+
+        # (guild id, role id) of every timed role, keyed by when it next needs handling.
+        self.timed_role_deadlines = DeadlineQueue()
+        self.timed_role_task: Optional[asyncio.Task] = None
+        # Member id -> when their checkin cooldown role comes off.
+        self.checkin_cooldown_deadlines = DeadlineQueue()
+        self.checkin_cooldown_task: Optional[asyncio.Task] = None
+
+        utils.message_router.add_route("daily image posts", self._on_daily_post_message, lambda: utils.DAILY_POSTS_CHANNELS, owner=self)
         
+    def cog_unload(self):
+        utils.message_router.remove_owner(self)
+        utils.role_executor.stop()
+        if self.timed_role_task:
+            self.timed_role_task.cancel()
+        if self.checkin_cooldown_task:
+            self.checkin_cooldown_task.cancel()
+        utils.flush_data()
+
     @commands.Cog.listener()
     async def on_ready(self):
         # This listener is called when the cog is loaded and the bot is ready.
-        self.checkin_cooldown_role_task.start()
+        utils.role_executor.start(self.bot, concurrency=utils.bot_config.get("ROLE_EXECUTOR_CONCURRENCY"))
+        if self.checkin_cooldown_task is None or self.checkin_cooldown_task.done():
+            self.checkin_cooldown_task = asyncio.create_task(self._run_checkin_cooldowns())
         self.daily_post_task.start()
-        self.check_timed_roles.start()
+        if self.timed_role_task is None or self.timed_role_task.done():
+            self.timed_role_task = asyncio.create_task(self._run_timed_roles())
         self.periodic_revive.start() # Now starting the revive task here
         print("Checkin Cooldown role task started.")
         print("Daily post task started.")
@@ -91,49 +95,62 @@ class TimeRole(commands.Cog):
 ###### CHECK IN CHANNEL TEXTUAL MESSAGE FOR DAILY #################
 ###################################################################
 
-    @tasks.loop(seconds=30)  # Check every 30 seconds
-    async def checkin_cooldown_role_task(self):
-        """This task runs to check for and remove the checkin cooldown role."""
+    async def _run_checkin_cooldowns(self):
+        """Removes the checkin cooldown role from each member exactly when their cooldown runs out.
+
+        The cooldowns are read from the file once and kept in a deadline queue; members come
+        from the gateway cache, and each batch of expiries is saved in one write.
+        """
         await self.bot.wait_until_ready()
-        
+        for user_id_str, timestamp_str in utils.load_daily_message_cooldowns().items():
+            try:
+                last_reward_time = datetime.datetime.fromisoformat(timestamp_str)
+            except (TypeError, ValueError):
+                # Unreadable entries are cleaned up straight away.
+                self.checkin_cooldown_deadlines.schedule(user_id_str, 0)
+                continue
+            if last_reward_time.tzinfo is None:
+                last_reward_time = last_reward_time.astimezone()
+            self.checkin_cooldown_deadlines.schedule(user_id_str, last_reward_time.timestamp() + CHECKIN_COOLDOWN_SECONDS)
+
+        while True:
+            due = await self.checkin_cooldown_deadlines.wait_due()
+            try:
+                self._expire_checkin_cooldowns(due)
+            except Exception as e:
+                print(f"Error expiring checkin cooldowns: {e}")
+
+    def _expire_checkin_cooldowns(self, user_ids: List[str]):
         guild = self.bot.get_guild(self.main_guild_id)
         if not guild:
-            print("Main guild not found. Skipping checkin cooldown role task.")
+            print("Main guild not found. Skipping checkin cooldown expiry.")
             return
-
         checkin_cooldown_role = guild.get_role(self.checkin_cooldown_role_id)
-        if not checkin_cooldown_role:
-            print("Checkin Cooldown role not found. Skipping checkin cooldown role task.")
-            return
 
-        # Load timestamps to check for checkin cooldown expiration
-        cooldown_data = _load_data(DAILY_MESSAGE_COOLDOWNS_FILE, {})
-        
-        now = datetime.datetime.now(datetime.timezone.utc)
-        
-        #Checkin Cooldown is 16 hours, converted to seconds
-        cooldown_seconds = 16 * 60 * 60
+        cooldown_data = utils.load_daily_message_cooldowns()
+        for user_id_str in user_ids:
+            member = guild.get_member(int(user_id_str))
+            if member and checkin_cooldown_role and checkin_cooldown_role in member.roles:
+                utils.role_executor.queue(guild.id, member.id, checkin_cooldown_role.id, False, reason="Daily message reward cooldown expired.")
+            # Members who left are cleaned up the same way.
+            cooldown_data.pop(user_id_str, None)
+        utils.save_daily_message_cooldowns(cooldown_data)
+
+    def start_checkin_cooldown(self, user_id: int, now: Optional[datetime.datetime] = None):
+        """Records that a member was given the checkin cooldown role and schedules its removal."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        cooldown_data = utils.load_daily_message_cooldowns()
+        cooldown_data[str(user_id)] = now.isoformat()
+        utils.save_daily_message_cooldowns(cooldown_data)
+        self.checkin_cooldown_deadlines.schedule(str(user_id), now.timestamp() + CHECKIN_COOLDOWN_SECONDS)
 
-        for user_id_str, timestamp_str in list(cooldown_data.items()):
-            try:
-                member = await guild.fetch_member(int(user_id_str))
-                if member and checkin_cooldown_role in member.roles:
-                    last_reward_time = datetime.datetime.fromisoformat(timestamp_str)
-                    time_since_last_reward = (now - last_reward_time).total_seconds()
-
-                    if time_since_last_reward >= cooldown_seconds:
-                        print(f"DEBUG: Removing cooldown role from user {member.display_name}")
-                        await member.remove_roles(checkin_cooldown_role, reason="Daily message reward cooldown expired.")
-                        del cooldown_data[user_id_str]
-                        _save_data(cooldown_data, DAILY_MESSAGE_COOLDOWNS_FILE)
-            except discord.NotFound:
-                # User left the server, clean up their data
-                if user_id_str in cooldown_data:
-                    del cooldown_data[user_id_str]
-                    _save_data(cooldown_data, DAILY_MESSAGE_COOLDOWNS_FILE)
-                print(f"DEBUG: User {user_id_str} not found, cleaning up cooldown data.")
-            except Exception as e:
-                print(f"DEBUG: An error occurred while processing user {user_id_str}: {e}")
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # The role is handed out outside this cog; start the member's cooldown when it appears.
+        if after.guild.id != self.main_guild_id or str(after.id) in self.checkin_cooldown_deadlines:
+            return
+        if after.get_role(self.checkin_cooldown_role_id) and not before.get_role(self.checkin_cooldown_role_id):
+            self.start_checkin_cooldown(after.id)
     
 ###################################################################################################
 ################# CHECK IN COMMAND WHO CAN BE DAILY OR WEEKLY ##################################### 
@@ -155,32 +172,21 @@ class TimeRole(commands.Cog):
         member = interaction.user
         period_type = period.value
         
-        # Load the reward and cooldown data
-        rewards_data = _load_data(REWARDS_FILE, {})
+        # Load the reward data
+        rewards_data = utils.load_data(REWARDS_FILE, {})
         
         # Initialize keys if they don't exist
-        if 'cooldowns' not in rewards_data:
-            rewards_data['cooldowns'] = {}
         if 'rewards' not in rewards_data:
             rewards_data['rewards'] = {}
         
-        cooldowns = rewards_data.get('cooldowns', {})
         rewards = rewards_data.get('rewards', {})
 
-        now = datetime.datetime.now(datetime.timezone.utc)
-        
         # Check cooldown
-        last_checkin_str = cooldowns.get(user_id, {}).get(period_type)
-        if last_checkin_str:
-            last_checkin = datetime.datetime.fromisoformat(last_checkin_str)
-            if period_type == 'daily' and (now - last_checkin).total_seconds() < 24*60*60:
-                time_left = (last_checkin + datetime.timedelta(days=1)) - now
-                minutes, seconds = divmod(time_left.seconds, 60)
-                return await interaction.response.send_message(f"You have already checked in for your daily reward! Try again in {time_left.seconds // 3600}h {minutes}m {seconds}s.", ephemeral=True)
-            elif period_type == 'weekly' and (now - last_checkin).total_seconds() < 7*24*60*60:
-                time_left = (last_checkin + datetime.timedelta(weeks=1)) - now
-                minutes, seconds = divmod(time_left.seconds, 60)
-                return await interaction.response.send_message(f"You have already checked in for your weekly reward! Try again in {time_left.seconds // 3600}h {minutes}m {seconds}s.", ephemeral=True)
+        time_left = datetime.timedelta(seconds=int(utils.cooldowns.remaining(f"checkin_{period_type}", user_id)))
+        if time_left:
+            minutes, seconds = divmod(time_left.seconds, 60)
+            minutes %= 60
+            return await interaction.response.send_message(f"You have already checked in for your {period_type} reward! Try again in {time_left.days * 24 + time_left.seconds // 3600}h {minutes}m {seconds}s.", ephemeral=True)
 
         # Calculate rewards based on roles
         total_reward = 0
@@ -198,13 +204,8 @@ class TimeRole(commands.Cog):
 
 
         if total_reward > 0:
-            utils.update_user_money(user_id, total_reward)
-            
-            if user_id not in cooldowns:
-                cooldowns[user_id] = {}
-            cooldowns[user_id][period_type] = now.isoformat()
-            rewards_data['cooldowns'] = cooldowns
-            _save_data(rewards_data, REWARDS_FILE)
+            utils.update_user_money(user_id, total_reward, source="checkin")
+            utils.cooldowns.use(f"checkin_{period_type}", user_id)
 
             embed = discord.Embed(
                 title=f"✅ {period_type.capitalize()} Check-in Rewards!",
@@ -234,7 +235,7 @@ class TimeRole(commands.Cog):
     @app_commands.check(is_moderator)
     async def set_reward(self, interaction: discord.Interaction, period: app_commands.Choice[str], role: discord.Role, amount: int):
         """Allows staff to set a reward for a specific role."""
-        rewards_data = _load_data(REWARDS_FILE, {})
+        rewards_data = utils.load_data(REWARDS_FILE, {})
         period_type = period.value
         role_id_str = str(role.id)
 
@@ -244,7 +245,7 @@ class TimeRole(commands.Cog):
             rewards_data['rewards'][period_type] = {}
         
         rewards_data['rewards'][period_type][role_id_str] = amount
-        _save_data(rewards_data, REWARDS_FILE)
+        utils.save_data(rewards_data, REWARDS_FILE)
 
         await interaction.response.send_message(f"Successfully set the **{period_type}** reward for the role **{role.name}** to **{amount}** coins.", ephemeral=True)
 
@@ -260,32 +261,42 @@ class TimeRole(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         guild = interaction.guild
-        cooldown_role = guild.get_role(self.cooldown_role_id)
+        cooldown_role = guild.get_role(self.checkin_cooldown_role_id)
 
         if not cooldown_role:
-            return await interaction.followup.send(f"Error: The cooldown role with ID `{self.cooldown_role_id}` was not found on this server.", ephemeral=True)
-
-        members_with_role = [member for member in guild.members if cooldown_role in member.roles]
+            return await interaction.followup.send(f"Error: The cooldown role with ID `{self.checkin_cooldown_role_id}` was not found on this server.", ephemeral=True)
 
-        if not members_with_role:
+        if not cooldown_role.members:
             await interaction.followup.send("No users currently have the daily check-in role.", ephemeral=True)
             return
 
-        cleared_count = 0
-        for member in members_with_role:
-            try:
-                await member.remove_roles(cooldown_role, reason="Manual reset via cleardailycheckinrole command.")
-                cleared_count += 1
-                await asyncio.sleep(0.5) # Add a small delay to avoid rate-limiting
-            except discord.Forbidden:
-                print(f"Error: Bot does not have permissions to remove role from {member.display_name}")
-            except Exception as e:
-                print(f"Error removing role from {member.display_name}: {e}")
+        queued_count = utils.role_executor.queue_many(
+            ((guild.id, member.id, cooldown_role.id, False) for member in cooldown_role.members),
+            reason="Manual reset via cleardailycheckinrole command."
+        )
 
         # Also clear the cooldown data file to reset cooldowns for all users
         utils.save_daily_message_cooldowns({})
+        self.checkin_cooldown_deadlines.clear()
 
-        await interaction.followup.send(f"Successfully removed the daily check-in role from **{cleared_count}** user(s) and reset the cooldown data file.", ephemeral=True)
+        await interaction.followup.send(f"Queued the removal of the daily check-in role from **{queued_count}** user(s) and reset the cooldown data file. Use `/rolequeue` to follow its progress.", ephemeral=True)
+
+    @app_commands.command(name="rolequeue", description="[Moderator Only] Shows the progress of queued role changes.")
+    @app_commands.check(is_moderator)
+    async def rolequeue(self, interaction: discord.Interaction):
+        stats = utils.role_executor.get_stats()
+        embed = discord.Embed(title="Role Changes", color=discord.Color.blue())
+        embed.add_field(name="Pending", value=str(stats["pending"]), inline=True)
+        embed.add_field(name="Applied", value=str(stats["applied"]), inline=True)
+        embed.add_field(name="Already done", value=str(stats["skipped"]), inline=True)
+        embed.add_field(name="Failed", value=str(stats["failed"]), inline=True)
+        embed.add_field(name="Replaced while queued", value=str(stats["replaced"]), inline=True)
+        embed.add_field(name="Throughput", value=f"{stats['rate'] * 60:.0f}/min", inline=True)
+        if stats["eta_seconds"] is not None:
+            eta = datetime.timedelta(seconds=int(stats["eta_seconds"]))
+            embed.add_field(name="ETA", value=str(eta), inline=True)
+        embed.set_footer(text=f"{stats['workers']} workers. Queued changes survive a restart.")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
 
 #####################################################################################################
 ### COMMAND FOR STAFF TO CREATE TIMED ROLE (WHO MIGHT NOT WORK ACTUALLY) ###########################
@@ -350,6 +361,9 @@ class TimeRole(commands.Cog):
                 else:
                     await interaction.followup.send("You must provide either a duration in `hours` or a `day_of_week` for a one-time role.", ephemeral=True)
 
+            # Only a config change moves the deadlines.
+            self._plan_timed_roles(changed=(str(guild_id), str(role.id)))
+
         except ValueError as e:
             await interaction.followup.send(f"Invalid input provided: {e}. Please check your values.", ephemeral=True)
         except Exception as e:
@@ -397,7 +411,7 @@ class TimeRole(commands.Cog):
             return
 
         try:
-            channel = await self.bot.fetch_channel(channel_id)
+            channel = await utils.resolver.channel(channel_id)
         except discord.NotFound:
             print(f"Periodic revive failed: Channel with ID {channel_id} not found.")
             return
@@ -408,23 +422,24 @@ class TimeRole(commands.Cog):
         revive_interval_hours = utils.bot_config.get("REVIVE_INTERVAL_HOURS", 6)
 
         if not is_test:
-            last_message_age = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(hours=revive_interval_hours)
-            last_message_found = False
-
-            try:
-                async for message in channel.history(limit=1, oldest_first=False):
-                    last_message = message
-                    last_message_found = True
-                    break
-            except discord.Forbidden:
-                print(f"Periodic revive failed: Bot lacks permissions to read message history in channel {channel.name}.")
-                return
-            except Exception as e:
-                print(f"Error fetching channel history in {channel.name}: {e}")
-                return
-
-            if last_message_found and last_message.created_at.replace(tzinfo=datetime.timezone.utc) > last_message_age:
-                print(f"Periodic revive skipped: Channel {channel.name} is active. Last message sent at {last_message.created_at}.")
+            last_activity = utils.activity.last_activity(channel.id)
+            if last_activity is None:
+                # Nothing seen in this channel since tracking started; ask the history once.
+                try:
+                    async for message in channel.history(limit=1, oldest_first=False):
+                        last_activity = message.created_at.timestamp()
+                        utils.activity.record(channel.id, last_activity, count=False)
+                        break
+                except discord.Forbidden:
+                    print(f"Periodic revive failed: Bot lacks permissions to read message history in channel {channel.name}.")
+                    return
+                except Exception as e:
+                    print(f"Error fetching channel history in {channel.name}: {e}")
+                    return
+
+            if last_activity is not None and utils.activity.idle_seconds(channel.id) < revive_interval_hours * 3600:
+                last_message_at = datetime.datetime.fromtimestamp(last_activity, datetime.timezone.utc)
+                print(f"Periodic revive skipped: Channel {channel.name} is active. Last message sent at {last_message_at}.")
                 return
 
         revive_role_id = utils.CHAT_REVIVE_ROLE_ID
@@ -448,108 +463,152 @@ class TimeRole(commands.Cog):
 
 ###############
 
-    @tasks.loop(minutes=30)
-    async def check_timed_roles(self):
-        print("Checking for expired timed roles...")
-        all_timed_roles = utils.load_timed_roles()
+    @staticmethod
+    def _parse_timed_role_time(value: str) -> datetime.datetime:
+        """Reads a stored time; set_timed_role wrote expiration dates in local time without a zone."""
+        parsed = datetime.datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.astimezone()
+        return parsed.astimezone(datetime.timezone.utc)
+
+    def _next_timed_role_deadline(self, role_info: Dict[str, Any], now: datetime.datetime) -> Optional[datetime.datetime]:
+        """When the role next needs handling: its expiry, the next day boundary for a weekly role
+        (the start of its day or the end of it), or the end of a daily role's interval."""
+        is_repeatable = role_info.get('repeatable', False)
+        day_of_week_name = role_info.get('day_of_week')
+        hours = role_info.get('hours')
+
+        if not is_repeatable and role_info.get('expiration_date'):
+            return self._parse_timed_role_time(role_info['expiration_date'])
+        if is_repeatable and day_of_week_name and day_of_week_name != "daily":
+            target_day_index = DAY_OF_WEEK_MAP.get(day_of_week_name)
+            if target_day_index is None:
+                return None
+            today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            days_until = (target_day_index - now.weekday()) % 7 or 1
+            # A second past midnight, so the weekday has already changed when it runs.
+            return today + datetime.timedelta(days=days_until, seconds=1)
+        if is_repeatable and day_of_week_name == "daily" and hours:
+            last_action_time_str = role_info.get('last_action_time')
+            if not last_action_time_str:
+                return now
+            return self._parse_timed_role_time(last_action_time_str) + datetime.timedelta(hours=hours)
+        return None
+
+    def _plan_timed_roles(self, startup: bool = False, changed: Optional[Tuple[str, str]] = None):
+        """Rebuilds the deadline queue from timed_roles.json. Called at startup and by /set_timed_role.
+
+        Weekly roles are brought in line straight away at startup, in case a day boundary
+        passed while the bot was offline, and so is the role whose config just changed.
+        Every other role keeps its next deadline.
+        """
         now = datetime.datetime.now(datetime.timezone.utc)
+        self.timed_role_deadlines.clear()
+        for guild_id_str, roles_data in utils.load_timed_roles().items():
+            for role_id_str, role_info in roles_data.items():
+                deadline = self._next_timed_role_deadline(role_info, now)
+                is_weekly = role_info.get('repeatable') and role_info.get('day_of_week') != "daily"
+                if deadline is None or (is_weekly and (startup or changed == (guild_id_str, role_id_str))):
+                    # Broken entries are due now too, and get dropped.
+                    deadline = now
+                self.timed_role_deadlines.schedule((guild_id_str, role_id_str), deadline.timestamp())
+
+    async def _run_timed_roles(self):
+        """Sleeps until the next timed role deadline, handles the roles that are due, and repeats."""
+        await self.bot.wait_until_ready()
+        self._plan_timed_roles(startup=True)
+        while True:
+            due = await self.timed_role_deadlines.wait_due()
+            try:
+                await self._process_timed_roles(due)
+            except Exception:
+                print(f"Error processing timed roles: {traceback.format_exc()}")
 
-        # Define the day of week mapping locally since it might not be in utils
-        day_of_week_map = {
-            'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-            'Friday': 4, 'Saturday': 5, 'Sunday': 6
-        }
-
-        guilds_to_update = {}
+    async def _process_timed_roles(self, keys):
+        all_timed_roles = utils.load_timed_roles()
+        now = datetime.datetime.now(datetime.timezone.utc)
 
-        for guild_id_str, roles_data in all_timed_roles.items():
+        for guild_id_str, role_id_str in keys:
+            roles_data = all_timed_roles.get(guild_id_str, {})
+            role_info = roles_data.get(role_id_str)
+            if role_info is None:
+                continue
             guild = self.bot.get_guild(int(guild_id_str))
-            if not guild:
+            role = guild.get_role(int(role_id_str)) if guild else None
+
+            if not role or not self._apply_timed_role(guild, role, role_info, now):
+                # Expired, gone, or not a valid timed role: drop it from the file.
+                del roles_data[role_id_str]
+                if not roles_data:
+                    del all_timed_roles[guild_id_str]
                 continue
 
-            guilds_to_update[guild_id_str] = {}
+            deadline = self._next_timed_role_deadline(role_info, now)
+            if deadline is not None:
+                self.timed_role_deadlines.schedule((guild_id_str, role_id_str), deadline.timestamp())
+
+        await utils.save_data_async(all_timed_roles, utils.TIMED_ROLES_FILE)
+
+    def _apply_timed_role(self, guild: discord.Guild, role: discord.Role, role_info: Dict[str, Any], now: datetime.datetime) -> bool:
+        """Queues the role changes that are due. Returns False once the role should be forgotten."""
+        is_repeatable = role_info.get('repeatable', False)
+        expiration_date_str = role_info.get('expiration_date')
+        day_of_week_name = role_info.get('day_of_week')
+        hours = role_info.get('hours')
+
+        # Handling of non-repeatable roles
+        if not is_repeatable and expiration_date_str:
+            if now >= self._parse_timed_role_time(expiration_date_str):
+                utils.role_executor.queue_many(
+                    ((guild.id, member.id, role.id, False) for member in role.members),
+                    reason="Timed role expiration."
+                )
+                return False
+            return True
+
+        # Handling of weekly repeatable roles
+        if is_repeatable and day_of_week_name and day_of_week_name != "daily":
+            if now.weekday() == DAY_OF_WEEK_MAP.get(day_of_week_name):
+                # Add role to all members who don't have it
+                utils.role_executor.queue_many(
+                    ((guild.id, member.id, role.id, True) for member in guild.members if role not in member.roles),
+                    reason=f"Weekly repeatable role on {day_of_week_name}."
+                )
+            else:
+                # Remove role from all members who have it
+                utils.role_executor.queue_many(
+                    ((guild.id, member.id, role.id, False) for member in role.members),
+                    reason=f"Weekly repeatable role removed as {day_of_week_name} has passed."
+                )
+            return True
+
+        # Handling of daily repeatable roles
+        if is_repeatable and day_of_week_name == "daily" and hours:
+            deadline = self._next_timed_role_deadline(role_info, now)
+            if now >= deadline:
+                # Time has passed: everyone gets the role again. Removing it first and
+                # re-adding it would end where it started for the members who have it,
+                # so only the members without it are queued.
+                utils.role_executor.queue_many(
+                    ((guild.id, member.id, role.id, True) for member in guild.members if role not in member.roles),
+                    reason="Daily repeatable role."
+                )
+                role_info['last_action_time'] = now.isoformat()
+            return True
 
-            for role_id_str, role_info in roles_data.items():
-                is_repeatable = role_info.get('repeatable', False)
-                expiration_date_str = role_info.get('expiration_date')
-                day_of_week_name = role_info.get('day_of_week')
-                hours = role_info.get('hours')
-                last_action_time_str = role_info.get('last_action_time')
-                role = guild.get_role(int(role_id_str))
-
-                if not role:
-                    continue
-
-                # Handling of non-repeatable roles
-                if not is_repeatable and expiration_date_str:
-                    expiration_date = datetime.datetime.fromisoformat(expiration_date_str)
-                    if now >= expiration_date:
-                        for member in role.members:
-                            try:
-                                await member.remove_roles(role, reason="Timed role expiration.")
-                                print(f"Removed expired role {role.name} from {member.display_name}.")
-                            except discord.Forbidden:
-                                print(f"Could not remove role {role.name} from {member.display_name}. Bot lacks permissions.")
-
-                        continue
-                    else:
-                        guilds_to_update[guild_id_str][role_id_str] = role_info
-
-                # Handling of weekly repeatable roles
-                elif is_repeatable and day_of_week_name and day_of_week_name != "daily":
-                    target_day_index = day_of_week_map.get(day_of_week_name)
-                    current_day_index = now.weekday()
-
-                    if current_day_index == target_day_index:
-                        # Add role to all members who don't have it
-                        for member in guild.members:
-                            if role not in member.roles:
-                                try:
-                                    await member.add_roles(role, reason=f"Weekly repeatable role on {day_of_week_name}.")
-                                    print(f"Added repeatable role {role.name} to {member.display_name}.")
-                                except discord.Forbidden:
-                                    print(f"Could not add repeatable role {role.name} to {member.display_name}. Bot lacks permissions.")
-                    else:
-                        # Remove role from all members who have it
-                        for member in role.members:
-                            try:
-                                await member.remove_roles(role, reason=f"Weekly repeatable role removed as {day_of_week_name} has passed.")
-                                print(f"Removed repeatable role {role.name} from {member.display_name}.")
-                            except discord.Forbidden:
-                                print(f"Could not remove repeatable role {role.name} from {member.display_name}. Bot lacks permissions.")
-
-                    guilds_to_update[guild_id_str][role_id_str] = role_info
-
-                # Handling of daily repeatable roles (UPDATED LOGIC)
-                elif is_repeatable and day_of_week_name == "daily" and hours:
-                    last_action_time = None
-                    if last_action_time_str:
-                        last_action_time = datetime.datetime.fromisoformat(last_action_time_str)
-
-                    time_since_last_action = now - last_action_time if last_action_time else datetime.timedelta(hours=hours + 1)
-
-                    if time_since_last_action >= datetime.timedelta(hours=hours):
-                        # Time has passed, remove the role from everyone and then re-add it
-                        for member in role.members:
-                            try:
-                                await member.remove_roles(role, reason="Daily timed role expiration.")
-                                print(f"Removed daily role {role.name} from {member.display_name}.")
-                            except discord.Forbidden:
-                                print(f"Could not remove role {role.name} from {member.display_name}. Bot lacks permissions.")
-
-                        for member in guild.members:
-                            if role not in member.roles:
-                                try:
-                                    await member.add_roles(role, reason=f"Daily repeatable role.")
-                                    print(f"Added daily role {role.name} to {member.display_name}.")
-                                except discord.Forbidden:
-                                    print(f"Could not add repeatable role {role.name} to {member.display_name}. Bot lacks permissions.")
-
-                        role_info['last_action_time'] = now.isoformat()
-
-                    guilds_to_update[guild_id_str][role_id_str] = role_info
-
-        utils.save_timed_roles_full_data(guilds_to_update)
+        return False
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        # Repeatable roles are only swept at their deadlines, so members who join while
+        # one is handed out get it here.
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for role_id_str, role_info in utils.load_timed_roles().get(str(member.guild.id), {}).items():
+            if not role_info.get('repeatable'):
+                continue
+            day_of_week_name = role_info.get('day_of_week')
+            if day_of_week_name == "daily" or DAY_OF_WEEK_MAP.get(day_of_week_name) == now.weekday():
+                utils.role_executor.queue(member.guild.id, member.id, int(role_id_str), True, reason="Repeatable role for a new member.")
 
     @tasks.loop(hours=24)
     async def daily_post_task(self):
@@ -597,11 +656,8 @@ class TimeRole(commands.Cog):
             await channel.send(f"{role.mention}", embed=embed)
             utils.save_last_daily_post_date(now, weekday_name)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot or not message.guild or message.channel.id not in utils.load_daily_posts_channels():
-            return
-
+    async def _on_daily_post_message(self, routed):
+        message = routed.message
         if message.attachments and any(a.content_type.startswith('image/') for a in message.attachments):
             user_id = message.author.id
             last_post_date = utils.load_last_image_post_date(user_id)
@@ -609,7 +665,7 @@ class TimeRole(commands.Cog):
             seven_days_ago = now - datetime.timedelta(days=7)
 
             if last_post_date is None or last_post_date < seven_days_ago:
-                utils.update_user_money(user_id, 250)
+                utils.update_user_money(user_id, 250, source="image_post")
                 utils.save_last_image_post_date(user_id, now)
 
                 await message.channel.send(f"{message.author.mention}, you have been credited with 250 coins for your image post! Please post any comments in <#{utils.DAILY_COMMENTS_CHANNEL_ID}>.", delete_after=10)
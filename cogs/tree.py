@@ -12,8 +12,8 @@ import asyncio
 
 # The now() function is now in utils.py to avoid a circular import.
 import cogs.utils as utils
-from cogs.BugData import INSECT_LIST, SHINY_INSECT_LIST, load_bug_collection, save_bug_collection
-from cogs.bug_catching import load_inventory, save_inventory
+from cogs.BugData import INSECT_LIST, SHINY_INSECT_LIST
+from cogs.bug_catching import load_inventory, save_inventory, load_bug_book_entry, save_bug_book_entry
 from cogs.BugbookViews import BugbookListView, TradeConfirmationView
 
 # --- Game Configuration ---
@@ -51,10 +51,16 @@ class TreeGame(commands.Cog):
         try:
             game_data = utils.load_tree_game_data()
             self.TREES = game_data.get("trees", {})
-            self.COOLDOWNS = game_data.get("cooldowns", {"water": {}, "bug_catch": {}})
         except AttributeError:
             self.TREES = utils.load_tree_of_life_state()
-            self.COOLDOWNS = utils.load_user_cooldowns()
+
+        # The per-user water and bug catch cooldowns live in the shared cooldown file. They
+        # shrink as the tree grows, so each check passes the current one; entries are kept
+        # for the longest. Loading it now imports the ones this file used to hold before
+        # the tree file is next saved without them.
+        for action_type in ("water", "bug_catch"):
+            utils.cooldowns.define(f"tree_{action_type}", BASE_COOLDOWN_SECONDS)
+        utils.cooldowns.load()
 
         self.BASE_COOLDOWN_SECONDS = BASE_COOLDOWN_SECONDS
         self.MIN_COOLDOWN_SECONDS = MIN_COOLDOWN_SECONDS
@@ -76,6 +82,7 @@ class TreeGame(commands.Cog):
     def cog_unload(self):
         if self.notification_task:
             self.notification_task.cancel()
+        utils.flush_data()
 
     async def schedule_initial_notification(self):
         await self.bot.wait_until_ready()
@@ -190,26 +197,17 @@ class TreeGame(commands.Cog):
 
     def save_tree_state(self, server_id, state):
         self.TREES[str(server_id)] = state
-        game_data = {"trees": self.TREES, "cooldowns": self.COOLDOWNS}
+        game_data = {"trees": self.TREES}
         utils.save_tree_game_data(game_data)
 
+    def get_cooldown_remaining(self, user_id, action_type: str, tree_height: int) -> float:
+        return utils.cooldowns.remaining(f"tree_{action_type}", user_id, self.get_user_cooldown(tree_height))
+
     def is_cooldown_expired(self, user_id, action_type: str, tree_height: int):
-        last_used_str = self.COOLDOWNS.get(action_type, {}).get(str(user_id))
-        if not last_used_str:
-            return True
-        
-        last_used_time = datetime.datetime.fromisoformat(last_used_str)
-        time_diff = utils.now() - last_used_time
-        
-        cooldown = self.get_user_cooldown(tree_height)
-        return time_diff.total_seconds() >= cooldown
+        return self.get_cooldown_remaining(user_id, action_type, tree_height) <= 0
     
     def update_last_used_time(self, user_id, action_type: str):
-        if action_type not in self.COOLDOWNS:
-            self.COOLDOWNS[action_type] = {}
-        self.COOLDOWNS[action_type][str(user_id)] = utils.now().isoformat()
-        game_data = {"trees": self.TREES, "cooldowns": self.COOLDOWNS}
-        utils.save_tree_game_data(game_data)
+        utils.cooldowns.use(f"tree_{action_type}", user_id)
     
     def _format_time_difference(self, seconds: float) -> str:
         if seconds <= 60:
@@ -261,19 +259,15 @@ class TreeGame(commands.Cog):
             self.last_attempt_time = utils.now()
             user_id = str(interaction.user.id)
             
-            bug_collection = load_bug_collection()
-            user_data = bug_collection.get(user_id, {"caught": [], "xp": 0, "shinies_caught": []})
+            user_data = load_bug_book_entry(user_id)
             
             if random.random() < self.cog.SHINY_CATCH_SUCCESS_CHANCE:
                 caught_bug_name = f"Shiny {self.bug_info['name']}"
                 caught_bug_xp = self.bug_info['xp'] * 2
                 caught_bug_emoji = self.bug_info['emoji']
                 
-                user_data['shinies_caught'].append(caught_bug_name)
-                user_data['caught'].append(caught_bug_name)
-                user_data['xp'] = user_data.get('xp', 0) + caught_bug_xp
-                bug_collection[user_id] = user_data
-                save_bug_collection(bug_collection)
+                user_data.add_catch(caught_bug_name, caught_bug_xp, shiny=True)
+                save_bug_book_entry(user_id, user_data)
 
                 embed = discord.Embed(
                     title="🎉 Shiny Catch Successful!",
@@ -341,11 +335,9 @@ class TreeGame(commands.Cog):
             tree_cooldown_expired = (utils.now() - datetime.datetime.fromisoformat(tree_state['last_watered_timestamp'])).total_seconds() > self.cog.get_tree_cooldown(tree_state['height'])
 
             if not user_cooldown_expired or not tree_cooldown_expired:
-                last_used_time = self.cog.COOLDOWNS.get("water", {}).get(str(interaction.user.id))
                 message = ""
                 if not user_cooldown_expired:
-                    time_diff = utils.now() - datetime.datetime.fromisoformat(last_used_time)
-                    remaining_time = self.cog.get_user_cooldown(tree_state['height']) - time_diff.total_seconds()
+                    remaining_time = self.cog.get_cooldown_remaining(interaction.user.id, "water", tree_state['height'])
                     formatted_time = self.cog._format_time_difference(remaining_time)
                     message = f"You have already watered the tree recently. You can try again in **{formatted_time}**."
                 elif not tree_cooldown_expired:
@@ -356,9 +348,9 @@ class TreeGame(commands.Cog):
                 return await interaction.followup.send(message, ephemeral=True)
             
             user_inventory = load_inventory(interaction.user.id)
-            if not user_inventory.get('nets'):
-                user_inventory['nets'] = [{"name": "Regular Net", "durability": 10}]
-                user_inventory['equipped_net'] = "Regular Net"
+            if not user_inventory.nets:
+                user_inventory.add_net("Regular Net", 10)
+                user_inventory.equipped_net = "Regular Net"
                 save_inventory(interaction.user.id, user_inventory)
                 await interaction.followup.send(f"{interaction.user.mention} has received a free **Regular Net** for watering the tree for the first time! 🎣\n\nTree watered! Tree is now size {tree_state['height'] + 1}. 🌳", ephemeral=False)
             else:
@@ -376,8 +368,7 @@ class TreeGame(commands.Cog):
             server_id = interaction.guild.id
             tree_state = self.cog.get_tree_state(server_id)
             if not self.cog.is_cooldown_expired(interaction.user.id, "bug_catch", tree_state['height']):
-                time_diff = utils.now() - datetime.datetime.fromisoformat(self.cog.COOLDOWNS.get("bug_catch", {}).get(str(interaction.user.id)))
-                remaining_time = self.cog.get_user_cooldown(tree_state['height']) - time_diff.total_seconds()
+                remaining_time = self.cog.get_cooldown_remaining(interaction.user.id, "bug_catch", tree_state['height'])
                 formatted_time = self.cog._format_time_difference(remaining_time)
                 return await interaction.followup.send(f"You have already performed an action recently. You can try again in **{formatted_time}**.", ephemeral=True)
             if tree_state['height'] < 10:
@@ -393,12 +384,11 @@ class TreeGame(commands.Cog):
             user_id = interaction.user.id
             user_inventory = load_inventory(user_id)
             apples_needed = 10
-            current_apples = user_inventory.get('items', {}).get('apple', 0)
-            if current_apples >= apples_needed:
-                user_inventory['items']['apple'] = current_apples - apples_needed
-                user_inventory['items']['compost'] = user_inventory.get('items', {}).get('compost', 0) + 1
+            current_apples = user_inventory.count('apple')
+            if user_inventory.take_item('apple', apples_needed):
+                compost_count = user_inventory.add_item('compost')
                 save_inventory(user_id, user_inventory)
-                await interaction.followup.send(f"✅ You have recycled 10 apples into 1 compost! You now have **{user_inventory['items']['compost']}** compost.", ephemeral=True)
+                await interaction.followup.send(f"✅ You have recycled 10 apples into 1 compost! You now have **{compost_count}** compost.", ephemeral=True)
             else:
                 await interaction.followup.send(f"❌ You need 10 apples to create compost. You currently have **{current_apples}**.", ephemeral=True)
 
@@ -415,11 +405,11 @@ class TreeGame(commands.Cog):
             if honey_produced <= 0:
                 return await interaction.followup.send("The bees haven't produced any new honey yet. Check back later!", ephemeral=True)
             user_inventory = load_inventory(interaction.user.id)
-            user_inventory['items']['honey'] = user_inventory.get('items', {}).get('honey', 0) + honey_produced
+            honey_count = user_inventory.add_item('honey', honey_produced)
             save_inventory(interaction.user.id, user_inventory)
             beehive_state['last_honey_collected'] = utils.now().isoformat()
             self.cog.save_tree_state(server_id, tree_state)
-            await interaction.followup.send(f"🍯 You collected **{honey_produced}** honey! You now have **{user_inventory['items']['honey']}** honey in total.", ephemeral=True)
+            await interaction.followup.send(f"🍯 You collected **{honey_produced}** honey! You now have **{honey_count}** honey in total.", ephemeral=True)
             await interaction.message.edit(embed=await self.cog.get_tree_embed(interaction), view=self)
 
     async def get_tree_embed(self, interaction: discord.Interaction):
@@ -465,9 +455,7 @@ class TreeGame(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         user_id = interaction.user.id
         user_inventory = load_inventory(user_id)
-        current_compost = user_inventory.get('items', {}).get('compost', 0)
-        if current_compost >= 1:
-            user_inventory['items']['compost'] = current_compost - 1
+        if user_inventory.take_item('compost'):
             save_inventory(user_id, user_inventory)
             server_id = interaction.guild.id
             tree_state = self.get_tree_state(server_id)
@@ -478,7 +466,7 @@ class TreeGame(commands.Cog):
             else:
                 tree_state['last_watered_timestamp'] = new_last_watered_time.isoformat()
             self.save_tree_state(server_id, tree_state)
-            await interaction.followup.send(f"✅ You have used 1 compost to reduce the tree's cooldown by 30 minutes. You have **{user_inventory['items']['compost']}** compost remaining.", ephemeral=True)
+            await interaction.followup.send(f"✅ You have used 1 compost to reduce the tree's cooldown by 30 minutes. You have **{user_inventory.count('compost')}** compost remaining.", ephemeral=True)
         else:
             await interaction.followup.send("❌ You don't have any compost to use!", ephemeral=True)
     
@@ -526,10 +514,9 @@ class TreeGame(commands.Cog):
             return await interaction.followup.send(f"❌ The Tree of Life must be at least size {MIN_HIVE_HEIGHT_REQUIRED} to support a beehive.", ephemeral=True)
         if tree_state['beehive']['is_placed']:
             return await interaction.followup.send("❌ There is already a beehive on the Tree of Life.", ephemeral=True)
-        if user_inventory.get('items', {}).get('beehive', 0) < 1:
+        if not user_inventory.take_item('beehive'):
             return await interaction.followup.send("❌ You need to purchase a beehive first to add it to the tree.", ephemeral=True)
 
-        user_inventory['items']['beehive'] -= 1
         tree_state['beehive']['is_placed'] = True
         tree_state['beehive']['last_honey_collected'] = utils.now().isoformat()
         
@@ -550,14 +537,14 @@ class TreeGame(commands.Cog):
             return await interaction.followup.send("❌ There is no beehive placed on the Tree of Life. You need to set one up first.", ephemeral=True)
         if amount is None or amount <= 0:
             return await interaction.followup.send("Please specify a positive number of bees to add.", ephemeral=True)
-        if amount > user_inventory.get('items', {}).get('bees', 0):
-            return await interaction.followup.send(f"❌ You don't have enough bees! You have **{user_inventory.get('items', {}).get('bees', 0)}** bees, but you tried to add **{amount}**.", ephemeral=True)
+        if amount > user_inventory.count('bees'):
+            return await interaction.followup.send(f"❌ You don't have enough bees! You have **{user_inventory.count('bees')}** bees, but you tried to add **{amount}**.", ephemeral=True)
         
         new_bee_count = tree_state['beehive']['bee_count'] + amount
         if new_bee_count > MAX_BEEHIVE_CAPACITY:
             return await interaction.followup.send(f"❌ The beehive can only hold a maximum of **{MAX_BEEHIVE_CAPACITY}** bees! You tried to add too many.", ephemeral=True)
         
-        user_inventory['items']['bees'] -= amount
+        user_inventory.take_item('bees', amount)
         tree_state['beehive']['bee_count'] = new_bee_count
         
         save_inventory(interaction.user.id, user_inventory)
@@ -573,10 +560,9 @@ class TreeGame(commands.Cog):
         
         if amount is None or amount <= 0:
             return await interaction.followup.send("Please specify a positive amount of honey to use.", ephemeral=True)
-        if user_inventory.get('items', {}).get('honey', 0) < amount:
-            return await interaction.followup.send(f"❌ You don't have enough honey! You have **{user_inventory.get('items', {}).get('honey', 0)}** honey.", ephemeral=True)
-        
-        user_inventory['items']['honey'] -= amount
+        if not user_inventory.take_item('honey', amount):
+            return await interaction.followup.send(f"❌ You don't have enough honey! You have **{user_inventory.count('honey')}** honey.", ephemeral=True)
+
         save_inventory(interaction.user.id, user_inventory)
         
         duration_minutes = amount * HONEY_BUFF_DURATION_MULTIPLIER
@@ -612,9 +598,8 @@ class TreeGame(commands.Cog):
         self.save_tree_state(server_id, tree_state)
         
         # Clear all user cooldowns associated with the tree game
-        self.COOLDOWNS = {"water": {}, "bug_catch": {}}
-        game_data = {"trees": self.TREES, "cooldowns": self.COOLDOWNS}
-        utils.save_tree_game_data(game_data)
+        utils.cooldowns.reset("tree_water")
+        utils.cooldowns.reset("tree_bug_catch")
         
         await interaction.followup.send("The Tree of Life's cooldowns have been reset. You can now water the tree again.", ephemeral=True)
 
@@ -1,5 +1,6 @@
 # cogs/utils.py
 
+import contextlib
 import json
 import os
 import random
@@ -8,13 +9,27 @@ import google.generativeai as genai
 import asyncio
 import aiohttp
 import discord
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Tuple
 import re
 import base64
 import io
 import textwrap
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageOps
 from discord import app_commands
+from cogs.data_store import store, atomic_write_text, read_only
+from cogs import journal
+from cogs.key_locks import key_locks
+from cogs.sqlite_store import SQLiteStore
+from cogs.models import Balance, Inventory, BugBookEntry
+from cogs.message_router import router as message_router
+from cogs.snapshots import SnapshotManager, DEFAULT_KEEP as DEFAULT_SNAPSHOT_KEEP
+from cogs.leaderboards import Leaderboards
+from cogs.cooldowns import CooldownBook
+from cogs.ledger import EconomyLedger
+from cogs.phrase_pool import PhrasePool
+from cogs.role_executor import RoleExecutor
+from cogs.resolver import resolver
+from cogs.activity import ActivityTracker
 
 # Set up Gemini API
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -55,7 +70,6 @@ MEDAL_OVERLAY_FILE = os.path.join(ASSETS_DIR, "winner_overlay.png")
 SORRY_JAR_FILE = 'data/sorry_jar.json'
 DISBOARD_TIMESTAMPS_FILE = os.path.join(DATA_DIR, "disboard_timestamps.json")
 BUMP_TIMESTAMPS_FILE = os.path.join(DATA_DIR, "disboard_timestamps.json")  # Keep existing filename
-BUMPPOINT_COOLDOWNS_FILE = os.path.join(DATA_DIR, "bumppoint_cooldowns.json")
 # Other file paths for various bot features
 ADVENTURE_AI_RESTRICTIONS_FILE = os.path.join(DATA_DIR, 'adventure_ai_restrictions.txt')
 DAILY_MESSAGE_COOLDOWNS_FILE = os.path.join(DATA_DIR, "daily_message_cooldowns.json")
@@ -64,14 +78,21 @@ ACTIVE_ADVENTURE_GAMES_FILE = os.path.join(DATA_DIR, 'active_adventure_games.jso
 USER_ROLES_FILE = os.path.join(DATA_DIR, 'user_roles.json')
 BALANCES_FILE = os.path.join(DATA_DIR, "balances.json")
 COOLDOWNS_FILE = os.path.join(DATA_DIR, "cooldowns.json")
+LEDGER_FILE = os.path.join(DATA_DIR, "economy_ledger.jsonl")
+ROLE_QUEUE_FILE = os.path.join(DATA_DIR, "role_queue.json")
+CHANNEL_ACTIVITY_FILE = os.path.join(DATA_DIR, "channel_activity.json")
+LEDGER_TOTALS_FILE = os.path.join(DATA_DIR, "economy_ledger_totals.json")
 COUNTING_GAME_STATE_FILE = os.path.join(DATA_DIR, "counting_game_state.json")
 PINS_FILE = os.path.join(DATA_DIR, 'user_pins.json')
 COUNTED_USERS_FILE = os.path.join(DATA_DIR, 'counted_users.json')
 COUNTING_PREFERENCES_FILE = os.path.join(DATA_DIR, 'counting_preferences.json')
 HANGRY_GAMES_STATE_FILE = os.path.join(DATA_DIR, 'hangrygames_state.json')
+HANGRY_SERVER_WINS_FILE = os.path.join(DATA_DIR, 'server_wins.json')
 ITEMS_FILE = os.path.join(DATA_DIR, 'items.json')
 INVENTORY_FILE = os.path.join(DATA_DIR, 'inventory.json')
 SWEAR_JAR_FILE = os.path.join(DATA_DIR, 'swear_jar.json')
+# The sorry counts are top-level user id keys in the swear jar file, not in SORRY_JAR_FILE.
+SORRY_COUNTS_FILE = SWEAR_JAR_FILE
 CHAT_REVIVE_CHANNEL_FILE = os.path.join(DATA_DIR, 'chat_revive_channel.json')
 TIMED_ROLES_FILE = os.path.join(DATA_DIR, 'timed_roles.json')
 LAST_IMAGE_POST_FILE = os.path.join(DATA_DIR, 'last_image_post.json')
@@ -80,7 +101,6 @@ ANAGRAM_GAME_STATE_FILE = os.path.join(DATA_DIR, 'anagram_game_state.json')
 ANAGRAM_WORDS_FILE = os.path.join(DATA_DIR, 'anagram_words.json')
 TREE_FILE = os.path.join(DATA_DIR, 'tree.json')
 BUMP_BATTLE_STATE_FILE = os.path.join(DATA_DIR, 'bump_battle_state.json')
-VOTE_COOLDOWNS_FILE = os.path.join(DATA_DIR, 'vote_cooldowns.json')
 VOTE_POINTS_FILE = os.path.join(DATA_DIR, 'vote_points.json')
 DAILY_POSTS_FILE = os.path.join(DATA_DIR, 'daily_posts.json')
 BUG_COLLECTION_FILE = os.path.join(DATA_DIR, "bug_collection.json")
@@ -91,6 +111,7 @@ REWARDS_FILE = os.path.join(DATA_DIR, 'rewards.json')
 SHOP_ITEMS_FILE = os.path.join(DATA_DIR, "shop_items.json")
 USER_BALANCES_FILE = os.path.join(DATA_DIR, "balances.json")
 USER_INVENTORY_FILE = os.path.join(DATA_DIR, "user_inventory.json")
+SQLITE_DB_FILE = os.path.join(DATA_DIR, "guardian_angel.db")
 
 
 # --- Configuration Loading ---
@@ -125,18 +146,10 @@ def save_bump_timestamps(data):
     """Saves bump timestamps for both Disboard and Discodus."""
     save_data(data, BUMP_TIMESTAMPS_FILE)
 
-def load_bumppoint_cooldowns():
-    """Loads user cooldowns for bumppoint command (separate for each bot)."""
-    return load_data(BUMPPOINT_COOLDOWNS_FILE, {})
-
-def save_bumppoint_cooldowns(data):
-    """Saves user cooldowns for bumppoint command."""
-    save_data(data, BUMPPOINT_COOLDOWNS_FILE)
-
 # Add these functions to your cogs/utils.py file
 def load_rewards():
     """Loads rewards data from the JSON file."""
-    return load_data(REWARDS_FILE, {'cooldowns': {}, 'rewards': {}})
+    return load_data(REWARDS_FILE, {'rewards': {}})
 
 def save_rewards(data):
     """Saves rewards data to the JSON file."""
@@ -144,72 +157,115 @@ def save_rewards(data):
 
 def load_sorry_jar_data():
     """Loads the sorry jar data from a JSON file."""
-    try:
-        if not os.path.exists('data'):
-            os.makedirs('data')
-        with open(SORRY_JAR_FILE, 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {}
-    except json.JSONDecodeError:
-        print(f"Error decoding JSON from {SORRY_JAR_FILE}. Returning an empty dictionary.")
-        return {}
+    return load_data(SORRY_JAR_FILE, {})
 
 def save_sorry_jar_data(data):
     """Saves the sorry jar data to a JSON file."""
-    try:
-        if not os.path.exists('data'):
-            os.makedirs('data')
-        with open(SORRY_JAR_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
-    except IOError as e:
-        print(f"Error saving sorry jar data: {e}")
+    save_data(data, SORRY_JAR_FILE)
 
 def save_booster_rewards(data: Dict[str, str]):
     save_data(data, BOOSTER_REWARDS_FILE)
 
 def load_json_file(file_path: str, default_value: Any):
-    if not os.path.exists(file_path):
-        return default_value
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"JSON Decode Error in {file_path}: {e}. Returning default value.")
-        return default_value
-    except Exception as e:
-        print(f"Error loading data from {file_path}: {e}. Returning default value.")
-        return default_value
+    return load_data(file_path, default_value)
 
 def save_json_file(file_path: str, data: Any):
-    try:
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving data to {file_path}: {e}")
+    save_data(data, file_path)
 
 def load_data(file_path: str, default_value: Any = None):
-    """Loads data from a JSON file, returning a default value if the file is not found or is corrupted."""
-    if not os.path.exists(file_path):
-        return default_value if default_value is not None else {}
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"JSON Decode Error in {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
-    except Exception as e:
-        print(f"Error loading data from {file_path}: {e}. Returning default value.")
-        return default_value if default_value is not None else {}
+    """Returns the cached contents of a JSON data file, or a default value if it is missing or corrupted."""
+    file_journal = journal.journal_for(file_path)
+    if file_journal is not None:
+        return file_journal.load(default_value)
+    return store.load(file_path, default_value)
 
 def save_data(data: Any, file_path: str):
-    """Saves data to a JSON file."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4)
-    except Exception as e:
-        print(f"Error saving data to {file_path}: {e}")
+    """Stores data as the cached contents of a JSON data file and queues it for writing.
+
+    For JOURNALED_FILES only the changed values are appended to the file's journal.
+    """
+    file_journal = journal.journal_for(file_path)
+    if file_journal is not None:
+        file_journal.save(data)
+        return
+    store.put(data, file_path)
+
+def load_data_view(file_path: str, default_value: Any = None):
+    """Like load_data, but returns a read-only view, for hot paths that only read."""
+    return read_only(load_data(file_path, default_value))
+
+def increment_counter(file_path: str, *keys, amount: int = 1, default_value: Any = None) -> int:
+    """Adds amount to the number at a key path in a journaled file and returns the new value.
+
+    Costs one small journal append, however large the file is. A leaderboard counting
+    this key path is updated too.
+    """
+    value = journal.register(file_path).increment([str(key) for key in keys], amount, default_value)
+    leaderboards.counter_changed(file_path, keys, value)
+    return value
+
+def flush_data():
+    """Writes every pending data file change to disk immediately."""
+    store.flush()
+
+async def load_data_async(file_path: str, default_value: Any = None):
+    """Like load_data, but parses an uncached file on the data store's I/O thread."""
+    return await store.load_async(file_path, default_value)
+
+async def save_data_async(data: Any, file_path: str):
+    """Like save_data, but waits (without blocking the event loop) until the file is written."""
+    file_journal = journal.journal_for(file_path)
+    if file_journal is not None:
+        # Journal appends are already on disk when save() returns.
+        file_journal.save(data)
+        return
+    await store.save(data, file_path)
+
+# Files read on most messages or commands; parsed off the event loop when the bot starts.
+HOT_DATA_FILES = [
+    BALANCES_FILE, USER_INVENTORY_FILE, BUG_COLLECTION_FILE, SWEAR_JAR_FILE, SORRY_JAR_FILE,
+    COUNTING_GAME_STATE_FILE, COUNTING_PREFERENCES_FILE, COUNTED_USERS_FILE, TIMED_ROLES_FILE,
+    TREE_FILE, PINS_FILE, LAST_IMAGE_POST_FILE, REWARDS_FILE, BUMP_BATTLE_STATE_FILE
+]
+
+# Counter files that change on most messages. Their changes are appended to a journal
+# next to the file and folded back into it every JOURNAL_COMPACT_RECORDS records.
+JOURNALED_FILES = [SWEAR_JAR_FILE, SORRY_JAR_FILE, BUMP_BATTLE_STATE_FILE, COUNTING_GAME_STATE_FILE, COOLDOWNS_FILE, ROLE_QUEUE_FILE]
+for _journaled_file in JOURNALED_FILES:
+    journal.register(_journaled_file)
+
+# Point-in-time copies of DATA_DIR; see take_snapshot() and restore_snapshot() below.
+snapshots = SnapshotManager(DATA_DIR)
+
+# Sorted leaderboard indexes; the boards are registered further down.
+leaderboards = Leaderboards()
+
+# Every per-user command cooldown; see persistent_cooldown() below.
+cooldowns = CooldownBook(COOLDOWNS_FILE, legacy=lambda: _legacy_cooldowns())
+
+# Where every coin came from and went to; the balance helpers below record into it.
+ledger = EconomyLedger(LEDGER_FILE, LEDGER_TOTALS_FILE)
+
+# AI-written /work and /crime phrases, generated ahead of time; the Economy cog keeps them filled.
+phrase_pools = {
+    "work_success": PhrasePool("work_success", lambda count: generate_work_phrases_with_gemini(True, count)),
+    "work_failure": PhrasePool("work_failure", lambda count: generate_work_phrases_with_gemini(False, count)),
+    "crime_success": PhrasePool("crime_success", lambda count: generate_crime_phrases_with_gemini(True, count)),
+    "crime_failure": PhrasePool("crime_failure", lambda count: generate_crime_phrases_with_gemini(False, count)),
+}
+
+# Role changes for many members at once; the TimeRole cog runs its workers.
+role_executor = RoleExecutor(ROLE_QUEUE_FILE)
+
+# When each channel last saw a message and how busy it is; fed by every message the router sees.
+activity = ActivityTracker(CHANNEL_ACTIVITY_FILE)
+message_router.add_scanner("activity", activity.on_message, owner=activity, allow_bots=True)
+
+async def preload_data():
+    """Warms the data store cache with HOT_DATA_FILES and replays the journals."""
+    await store.preload(HOT_DATA_FILES)
+    for file_path in JOURNALED_FILES:
+        load_data(file_path)
 
 # Load the dynamic bot configuration
 bot_config = load_data(BOT_CONFIG_FILE, {})
@@ -246,6 +302,8 @@ ANNOUNCEMENTS_ROLE_ID = None
 MOD_ROLE_ID = None
 TIMED_CHANNELS = {}
 DAILY_POSTS_CHANNELS = []
+STORAGE_BACKEND = "json"
+KEYWORD_STEMS = False
 
 # Image URLs for daily posts
 BUMDAY_MONDAY_IMAGE_URL = "https://images-ext-1.discordapp.net/extbumernal/8FPhOjICXo6SVfWoVS3CgZUDp-Eut9pbVvVQYnUN6sM/https/cdn-longterm.mee6.xyz/plugins/embeds/images/824204389421023282/c742221693daadcf6ed5b3d6885dc5bda3d46d3bae77d62ebe76715446e92375.gif"
@@ -311,31 +369,34 @@ async def role_id_name_autocomplete(interaction: discord.Interaction, current: s
 # --- Utility Functions for Data Persistence and AI ---
 def update_dynamic_config(key, value):
     global bot_config
-    bot_config[key] = value
-    save_data(bot_config, BOT_CONFIG_FILE)
-    reload_globals()
+    with key_locks.hold(BOT_CONFIG_FILE):
+        bot_config[key] = value
+        save_data(bot_config, BOT_CONFIG_FILE)
+        reload_globals()
 
 def remove_dynamic_config(key):
     global bot_config
-    if key in bot_config:
-        del bot_config[key]
-        save_data(bot_config, BOT_CONFIG_FILE)
-        reload_globals()
+    with key_locks.hold(BOT_CONFIG_FILE):
+        if key in bot_config:
+            del bot_config[key]
+            save_data(bot_config, BOT_CONFIG_FILE)
+            reload_globals()
 
 def update_dynamic_role(role_name, role_id):
     """Updates a specific role ID in the nested 'role_ids' dictionary or at the top level."""
     global bot_config
-    if role_name == "PLAYER_ROLE_ID":
-        bot_config[role_name] = role_id
-    else:
-        if "role_ids" not in bot_config:
-            bot_config["role_ids"] = {}
-        bot_config["role_ids"][role_name] = role_id
-    save_data(bot_config, BOT_CONFIG_FILE)
-    reload_globals()
+    with key_locks.hold(BOT_CONFIG_FILE):
+        if role_name == "PLAYER_ROLE_ID":
+            bot_config[role_name] = role_id
+        else:
+            if "role_ids" not in bot_config:
+                bot_config["role_ids"] = {}
+            bot_config["role_ids"][role_name] = role_id
+        save_data(bot_config, BOT_CONFIG_FILE)
+        reload_globals()
 
 def reload_globals():
-    global MAIN_GUILD_ID, TEST_CHANNEL_ID, PLAYER_ROLE_ID, ADVENTURE_MAIN_CHANNEL_ID, CHAT_REVIVE_CHANNEL_ID, DAILY_COMMENTS_CHANNEL_ID, SELF_ROLES_CHANNEL_ID, SINNER_CHAT_CHANNEL_ID, BUMDAY_MONDAY_CHANNEL_ID, TITS_OUT_TUESDAY_CHANNEL_ID, WET_WEDNESDAY_CHANNEL_ID, FURBABY_THURSDAY_CHANNEL_ID, FRISKY_FRIDAY_CHANNEL_ID, SELFIE_SATURDAY_CHANNEL_ID, SLUTTY_SUNDAY_CHANNEL_ID, ANAGRAM_CHANNEL_ID, BUMP_BATTLE_CHANNEL_ID, ANNOUNCEMENTS_CHANNEL_ID, VOTE_CHANNEL_ID, VOTE_COOLDOWN_HOURS, ROLE_IDS, CHAT_REVIVE_ROLE_ID, ANNOUNCEMENTS_ROLE_ID, MOD_ROLE_ID, TIMED_CHANNELS, DAILY_POSTS_CHANNELS, TREE_CHANNEL_ID, COUNTING_CHANNEL_ID, REVIVE_INTERVAL_HOURS, QOTD_CHANNEL_ID, QOTD_ROLE_ID, CHECKIN_CHANNEL_ID, DAILY_MESSAGE_REWARD_CHANNEL_ID, BOOSTER_REWARD_CHANNEL_ID
+    global MAIN_GUILD_ID, TEST_CHANNEL_ID, PLAYER_ROLE_ID, ADVENTURE_MAIN_CHANNEL_ID, CHAT_REVIVE_CHANNEL_ID, DAILY_COMMENTS_CHANNEL_ID, SELF_ROLES_CHANNEL_ID, SINNER_CHAT_CHANNEL_ID, BUMDAY_MONDAY_CHANNEL_ID, TITS_OUT_TUESDAY_CHANNEL_ID, WET_WEDNESDAY_CHANNEL_ID, FURBABY_THURSDAY_CHANNEL_ID, FRISKY_FRIDAY_CHANNEL_ID, SELFIE_SATURDAY_CHANNEL_ID, SLUTTY_SUNDAY_CHANNEL_ID, ANAGRAM_CHANNEL_ID, BUMP_BATTLE_CHANNEL_ID, ANNOUNCEMENTS_CHANNEL_ID, VOTE_CHANNEL_ID, VOTE_COOLDOWN_HOURS, ROLE_IDS, CHAT_REVIVE_ROLE_ID, ANNOUNCEMENTS_ROLE_ID, MOD_ROLE_ID, TIMED_CHANNELS, DAILY_POSTS_CHANNELS, TREE_CHANNEL_ID, COUNTING_CHANNEL_ID, REVIVE_INTERVAL_HOURS, QOTD_CHANNEL_ID, QOTD_ROLE_ID, CHECKIN_CHANNEL_ID, DAILY_MESSAGE_REWARD_CHANNEL_ID, BOOSTER_REWARD_CHANNEL_ID, STORAGE_BACKEND, KEYWORD_STEMS
 
     bot_config_reloaded = load_data(BOT_CONFIG_FILE, {})
 
@@ -386,7 +447,35 @@ def reload_globals():
     MOD_ROLE_ID = ROLE_IDS.get("Staff", [])
 
     TIMED_CHANNELS = bot_config_reloaded.get("timed_channels", {})
-    DAILY_POSTS_CHANNELS = [channel_id for channel_id, _, _ in TIMED_CHANNELS.values()]
+    # A frozenset: checked on every message and never modified in place.
+    DAILY_POSTS_CHANNELS = frozenset(channel_id for channel_id, _, _ in TIMED_CHANNELS.values())
+
+    # "json" (default) or "sqlite"; see get_sqlite_store() below.
+    STORAGE_BACKEND = bot_config_reloaded.get("STORAGE_BACKEND", "json")
+    # Off by default: with it on, the swear and sorry jars also count "damned", "shitty", "sorrys".
+    KEYWORD_STEMS = bool(bot_config_reloaded.get("KEYWORD_STEMS", False))
+
+    store.configure(
+        flush_interval=bot_config_reloaded.get("DATA_FLUSH_INTERVAL_SECONDS"),
+        max_pending=bot_config_reloaded.get("DATA_FLUSH_MAX_PENDING"),
+        fsync_policy=bot_config_reloaded.get("DATA_FSYNC_POLICY"),
+        formats=bot_config_reloaded.get("DATA_FILE_FORMATS")
+    )
+    journal.configure(compact_after=bot_config_reloaded.get("JOURNAL_COMPACT_RECORDS"))
+    snapshots.keep = max(1, int(bot_config_reloaded.get("SNAPSHOT_KEEP", DEFAULT_SNAPSHOT_KEEP)))
+    # Channel ids may have changed; the message routes resolve them again.
+    message_router.invalidate()
+    # So may the storage backend the scores come from.
+    leaderboards.invalidate()
+    # None keeps message-rate histograms for every channel.
+    activity.configure(bot_config_reloaded.get("ACTIVITY_HISTOGRAM_CHANNELS"))
+    # Drop the channels resolved for the old ids and resolve the new ones.
+    resolver.configure([
+        TEST_CHANNEL_ID, QOTD_CHANNEL_ID, CHAT_REVIVE_CHANNEL_ID, ADVENTURE_MAIN_CHANNEL_ID, DAILY_COMMENTS_CHANNEL_ID,
+        SELF_ROLES_CHANNEL_ID, SINNER_CHAT_CHANNEL_ID, ANAGRAM_CHANNEL_ID, BUMP_BATTLE_CHANNEL_ID,
+        ANNOUNCEMENTS_CHANNEL_ID, VOTE_CHANNEL_ID, TREE_CHANNEL_ID, COUNTING_CHANNEL_ID, CHECKIN_CHANNEL_ID,
+        DAILY_MESSAGE_REWARD_CHANNEL_ID, BOOSTER_REWARD_CHANNEL_ID, *DAILY_POSTS_CHANNELS
+    ])
 
 # Call reload_globals() once at the start to load initial config
 reload_globals()
@@ -487,9 +576,10 @@ def load_user_roles(user_id: int) -> list[int]:
 
 def save_user_roles(user_id: int, roles: list[int]):
     """Saves a user's roles to a JSON file."""
-    all_roles = load_data(USER_ROLES_FILE, {})
-    all_roles[str(user_id)] = roles
-    save_data(all_roles, USER_ROLES_FILE)
+    with key_locks.hold(USER_ROLES_FILE, user_id):
+        all_roles = load_data(USER_ROLES_FILE, {})
+        all_roles[str(user_id)] = roles
+        save_data(all_roles, USER_ROLES_FILE)
 
 def save_adventure_channel_id(channel_id: int):
     """Saves the adventure channel ID to the bot configuration."""
@@ -619,8 +709,7 @@ def get_ai_restrictions() -> List[str]:
                 'rape', 'torture', 'non-consensual_acts', 'pedophilia', 'zoophilia',
                 'violence', 'death'
             ]
-            with open(ADVENTURE_AI_RESTRICTIONS_FILE, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(default_restrictions))
+            atomic_write_text(ADVENTURE_AI_RESTRICTIONS_FILE, '\n'.join(default_restrictions))
             return default_restrictions
     except Exception as e:
         print(f"Error loading AI restrictions: {e}")
@@ -646,78 +735,331 @@ def load_timed_channels():
 def load_daily_posts_channels():
     return DAILY_POSTS_CHANNELS
 
-def get_user_money(user_id: int) -> int:
-    """Gets a user's wallet balance."""
-    balances = load_data(BALANCES_FILE, {})
-    user_id_str = str(user_id)
-    user_data = balances.get(user_id_str, {"wallet": 0, "bank": 0})
+# --- Economy, inventory and bug collection storage ---
+# These helpers read and write either the JSON files or, when STORAGE_BACKEND is
+# "sqlite" in bot_config.json, one row per user in SQLITE_DB_FILE.
+# Read-modify-write helpers here hold key_locks for the file and user they change, so
+# concurrent updates for the same user can't overwrite each other.
+_sqlite_store: Optional[SQLiteStore] = None
+
+def using_sqlite() -> bool:
+    return STORAGE_BACKEND == "sqlite"
+
+def get_sqlite_store() -> SQLiteStore:
+    """Returns the shared SQLite connection, opening the database on first use."""
+    global _sqlite_store
+    if _sqlite_store is None:
+        _sqlite_store = SQLiteStore(bot_config.get("SQLITE_DB_FILE", SQLITE_DB_FILE))
+    return _sqlite_store
+
+def migrate_json_to_sqlite() -> Dict[str, int]:
+    """Imports balances, user inventories and the bug collection from JSON into SQLite.
+
+    The JSON files are left untouched, so switching STORAGE_BACKEND back is always possible.
+    Returns how many rows were imported per table.
+    """
+    store.flush()
+    return get_sqlite_store().import_json(
+        load_data(BALANCES_FILE, {}),
+        load_data(USER_INVENTORY_FILE, {}),
+        load_data(BUG_COLLECTION_FILE, {})
+    )
+
+# --- Data snapshots ---
+
+def _snapshot_backups() -> Dict[str, Any]:
+    """An open SQLite database is copied with its backup API, not byte by byte."""
+    if _sqlite_store is None:
+        return {}
+    return {_sqlite_store.db_path: _sqlite_store.backup_to}
+
+def take_snapshot(reason: str = "manual") -> Dict[str, Any]:
+    """Snapshots DATA_DIR after flushing pending writes and returns the snapshot's manifest."""
+    return snapshots.take(reason, _snapshot_backups())
+
+async def take_snapshot_async(reason: str = "scheduled") -> Dict[str, Any]:
+    return await snapshots.take_async(reason, _snapshot_backups())
+
+def list_snapshots() -> List[Dict[str, Any]]:
+    """Returns the manifests of the kept snapshots, newest first."""
+    return snapshots.list()
+
+def _after_restore():
+    # Runs on the I/O thread, before anything else can touch the restored files.
+    journal.reset_all()
+    ledger.reset()
+    activity.reset()
+
+def restore_snapshot(name: str) -> List[str]:
+    """Puts DATA_DIR back to the given snapshot while the bot keeps running.
+
+    The current state is snapshotted first. Every cache is dropped, the journals and the
+    SQLite connection are reopened on the restored files and the globals are reloaded
+    from the restored bot_config.json. Cogs that keep their own copy of some data need
+    to be reloaded by the caller. Blocks the event loop on purpose: nothing may read or
+    write data files while they are swapped. Raises ValueError for an unknown snapshot.
+    """
+    global _sqlite_store, bot_config
+    if not any(manifest["name"] == name for manifest in snapshots.list()):
+        raise ValueError(f"There is no complete snapshot called '{name}'.")
+    if _sqlite_store is not None:
+        # Closing the last connection also folds the -wal file into the database.
+        _sqlite_store.close()
+        _sqlite_store = None
+    restored = snapshots.restore(name, after=_after_restore)
+    bot_config = load_data(BOT_CONFIG_FILE, {})
+    reload_globals()
+    return restored
 
-    # Check for the old format (integer) and migrate it
-    if isinstance(user_data, int):
-        new_data = {"wallet": user_data, "bank": 0}
-        balances[user_id_str] = new_data
-        save_data(balances, BALANCES_FILE)
-        return new_data["wallet"]
+def load_all_balances() -> Dict[str, Any]:
+    """Returns every user's balance record, keyed by user id string."""
+    if using_sqlite():
+        return get_sqlite_store().all_balances()
+    return load_data(BALANCES_FILE, {})
 
-    return user_data.get("wallet", 0)
+def get_balance(user_id: int) -> Balance:
+    """Gets a user's wallet and bank balance."""
+    if using_sqlite():
+        return Balance(*get_sqlite_store().get_balance(user_id))
+    return Balance.from_record(load_data(BALANCES_FILE, {}).get(str(user_id)))
+
+def get_user_money(user_id: int) -> int:
+    """Gets a user's wallet balance."""
+    return get_balance(user_id).wallet
 
 def get_user_bank_money(user_id: int) -> int:
     """Gets a user's bank balance."""
-    balances = load_data(BALANCES_FILE, {})
-    user_id_str = str(user_id)
-    user_data = balances.get(user_id_str, {"wallet": 0, "bank": 0})
-
-    # Check for the old format (integer) and migrate it
-    if isinstance(user_data, int):
-        new_data = {"wallet": user_data, "bank": 0}
-        balances[user_id_str] = new_data
-        save_data(balances, BALANCES_FILE)
-        return new_data["bank"]
-
-    return user_data.get("bank", 0)
-
-def update_user_money(user_id: int, amount: int):
-    """Updates a user's wallet balance."""
-    balances = load_data(BALANCES_FILE, {})
-    user_id_str = str(user_id)
-    user_data = balances.get(user_id_str, {"wallet": 0, "bank": 0})
-
-    # Check for the old format and migrate before updating
-    if isinstance(user_data, int):
-        user_data = {"wallet": user_data, "bank": 0}
-
-    user_data["wallet"] += amount
-    balances[user_id_str] = user_data
-    save_data(balances, BALANCES_FILE)
-
-def update_user_bank_money(user_id: int, amount: int):
-    """Updates a user's bank balance."""
-    balances = load_data(BALANCES_FILE, {})
-    user_id_str = str(user_id)
-    user_data = balances.get(user_id_str, {"wallet": 0, "bank": 0})
-
-    # Check for the old format and migrate before updating
-    if isinstance(user_data, int):
-        user_data = {"wallet": user_data, "bank": 0}
-
-    user_data["bank"] += amount
-    balances[user_id_str] = user_data
-    save_data(balances, BALANCES_FILE)
+    return get_balance(user_id).bank
+
+def _add_to_balance(user_id: int, wallet_delta: int = 0, bank_delta: int = 0, source: str = "other"):
+    if using_sqlite():
+        # A single upsert, so SQLite already applies it atomically.
+        get_sqlite_store().add_balance(user_id, wallet_delta, bank_delta)
+        _update_coins_board(user_id)
+    else:
+        with key_locks.hold(BALANCES_FILE, user_id):
+            balances = load_data(BALANCES_FILE, {})
+            balance = Balance.from_record(balances.get(str(user_id)))
+            balance.add(wallet_delta, bank_delta)
+            balances[str(user_id)] = balance.to_record()
+            save_data(balances, BALANCES_FILE)
+            leaderboards.update("coins", user_id, balance.total)
+    # Moves between wallet and bank add up to 0 and aren't recorded.
+    ledger.record(user_id, wallet_delta + bank_delta, source)
+
+def _update_coins_board(user_id: Any):
+    """Re-reads a balance for the coins board, but only once someone has looked at the board."""
+    if leaderboards.is_built("coins"):
+        leaderboards.update("coins", user_id, get_balance(user_id).total)
+
+def update_user_money(user_id: int, amount: int, source: str = "other"):
+    """Updates a user's wallet balance. source names what paid or charged it in the ledger."""
+    _add_to_balance(user_id, wallet_delta=amount, source=source)
+
+def update_user_bank_money(user_id: int, amount: int, source: str = "other"):
+    """Updates a user's bank balance. source names what paid or charged it in the ledger."""
+    _add_to_balance(user_id, bank_delta=amount, source=source)
 
 def transfer_money(user_id: int, amount: int, from_type: str, to_type: str):
     """Transfers money between a user's wallet and bank."""
-    balances = load_data(BALANCES_FILE, {})
-    user_id_str = str(user_id)
+    deltas = {"wallet": 0, "bank": 0}
+    deltas[from_type] -= amount
+    deltas[to_type] += amount
+    _add_to_balance(user_id, wallet_delta=deltas["wallet"], bank_delta=deltas["bank"])
+
+# --- Economy transactions ---
+class EconomyTransaction:
+    """Stages balance, inventory and bug book changes for one command so they commit together.
+
+    Reads see the transaction's own pending changes. Inventories and bug book entries are
+    models built from the stored records, so a transaction that raises or is aborted
+    leaves the stored data untouched.
+    Use it through economy_transaction().
+    """
+
+    def __init__(self, user_ids: List[str]):
+        self._user_ids = user_ids
+        self._balance_deltas: Dict[str, List[int]] = {}
+        self._inventories: Dict[str, Inventory] = {}
+        self._bug_data: Dict[str, BugBookEntry] = {}
+        self._ledger_entries: List[Tuple[str, int, str]] = []
+        self.aborted = False
+
+    def _check_user(self, user_id: int):
+        if self._user_ids and str(user_id) not in self._user_ids:
+            raise ValueError(f"User {user_id} was not passed to economy_transaction().")
+
+    def get_balance(self, user_id: int) -> Tuple[int, int]:
+        """Returns (wallet, bank) for a user, including this transaction's pending changes."""
+        self._check_user(user_id)
+        balance = get_balance(user_id)
+        wallet_delta, bank_delta = self._balance_deltas.get(str(user_id), (0, 0))
+        return balance.wallet + wallet_delta, balance.bank + bank_delta
+
+    def get_money(self, user_id: int) -> int:
+        return self.get_balance(user_id)[0]
+
+    def get_bank_money(self, user_id: int) -> int:
+        return self.get_balance(user_id)[1]
+
+    def add_money(self, user_id: int, wallet: int = 0, bank: int = 0, source: str = "other"):
+        self._check_user(user_id)
+        deltas = self._balance_deltas.setdefault(str(user_id), [0, 0])
+        deltas[0] += wallet
+        deltas[1] += bank
+        if wallet + bank:
+            self._ledger_entries.append((str(user_id), wallet + bank, source))
+
+    def transfer(self, user_id: int, amount: int, from_type: str, to_type: str):
+        """Moves money between a user's wallet and bank, like transfer_money()."""
+        deltas = {"wallet": 0, "bank": 0}
+        deltas[from_type] -= amount
+        deltas[to_type] += amount
+        self.add_money(user_id, wallet=deltas["wallet"], bank=deltas["bank"])
+
+    def inventory(self, user_id: int) -> Inventory:
+        """Returns a user's inventory for this transaction; changes to it are saved on commit."""
+        self._check_user(user_id)
+        key = str(user_id)
+        if key not in self._inventories:
+            self._inventories[key] = load_inventory(user_id)
+        return self._inventories[key]
+
+    def bug_data(self, user_id: int) -> BugBookEntry:
+        """Returns a user's bug book entry for this transaction; changes to it are saved on commit."""
+        self._check_user(user_id)
+        key = str(user_id)
+        if key not in self._bug_data:
+            self._bug_data[key] = load_bug_book_entry(user_id)
+        return self._bug_data[key]
+
+    def abort(self):
+        """Discards everything staged so far; nothing is written when the block exits."""
+        self.aborted = True
+
+    def commit(self):
+        if self.aborted:
+            return
+        if using_sqlite():
+            sqlite_store = get_sqlite_store()
+            for user_id, (wallet_delta, bank_delta) in self._balance_deltas.items():
+                sqlite_store.add_balance(user_id, wallet_delta, bank_delta)
+                _update_coins_board(user_id)
+            for user_id, user_inventory in self._inventories.items():
+                sqlite_store.put_inventory(user_id, user_inventory.to_record())
+            for user_id, user_data in self._bug_data.items():
+                sqlite_store.put_bug_data(user_id, user_data.to_record())
+                leaderboards.update("bugbook", user_id, len(user_data.caught))
+            return
+
+        # One save per touched file, however many users the command changed.
+        if self._balance_deltas:
+            balances = load_data(BALANCES_FILE, {})
+            for user_id, (wallet_delta, bank_delta) in self._balance_deltas.items():
+                balance = Balance.from_record(balances.get(user_id))
+                balance.add(wallet_delta, bank_delta)
+                balances[user_id] = balance.to_record()
+                leaderboards.update("coins", user_id, balance.total)
+            save_data(balances, BALANCES_FILE)
+        if self._inventories:
+            inventory_data = load_data(USER_INVENTORY_FILE, {})
+            for user_id, user_inventory in self._inventories.items():
+                inventory_data[user_id] = user_inventory.to_record()
+            save_data(inventory_data, USER_INVENTORY_FILE)
+        if self._bug_data:
+            bug_collection = load_data(BUG_COLLECTION_FILE, {})
+            for user_id, user_data in self._bug_data.items():
+                bug_collection[user_id] = user_data.to_record()
+                leaderboards.update("bugbook", user_id, len(user_data.caught))
+            save_data(bug_collection, BUG_COLLECTION_FILE)
+
+    def record_ledger(self):
+        """Records the committed balance changes in the ledger."""
+        if self.aborted:
+            return
+        for user_id, amount, source in self._ledger_entries:
+            ledger.record(user_id, amount, source)
+
+@contextlib.contextmanager
+def economy_transaction(*user_ids):
+    """Groups the balance, inventory and bug book reads and writes of one command.
+
+    Usage:
+        with utils.economy_transaction(user_id) as txn:
+            if txn.get_money(user_id) < price:
+                txn.abort()
+            else:
+                txn.add_money(user_id, -price)
+                txn.inventory(user_id).add_item("net")
+
+    Changes are written once when the block exits normally and dropped if it raises.
+    On the SQLite backend the whole block runs inside one database transaction.
+    Only the given users are locked and may be touched; with no ids the three files are
+    locked whole. Don't await inside the block.
+    """
+    user_ids = [str(user_id) for user_id in user_ids]
+    resources = {BALANCES_FILE: user_ids, USER_INVENTORY_FILE: user_ids, BUG_COLLECTION_FILE: user_ids}
+    with key_locks.hold_many(resources):
+        txn = EconomyTransaction(user_ids)
+        if using_sqlite():
+            with get_sqlite_store().transaction():
+                yield txn
+                txn.commit()
+        else:
+            yield txn
+            txn.commit()
+        txn.record_ledger()
+
+# --- Bulk economy operations ---
+class BulkMoneyResult:
+    """What bulk_update_money() did (or, for a dry run, would do)."""
+
+    __slots__ = ("changes", "capped", "dry_run")
 
-    user_data = balances.get(user_id_str, {"wallet": 0, "bank": 0})
-    # Check for the old format and migrate before updating
-    if isinstance(user_data, int):
-        user_data = {"wallet": user_data, "bank": 0}
+    def __init__(self, dry_run: bool):
+        # user id -> (wallet before, wallet after)
+        self.changes: Dict[str, Tuple[int, int]] = {}
+        # users whose debit was cut short so their wallet stops at 0
+        self.capped: List[str] = []
+        self.dry_run = dry_run
 
-    user_data[from_type] -= amount
-    user_data[to_type] += amount
-    balances[user_id_str] = user_data
-    save_data(balances, BALANCES_FILE)
+    @property
+    def credited(self) -> int:
+        return sum(after - before for before, after in self.changes.values() if after > before)
+
+    @property
+    def debited(self) -> int:
+        return sum(before - after for before, after in self.changes.values() if after < before)
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+def bulk_update_money(amounts: Dict[Any, int], dry_run: bool = False, source: str = "admin") -> BulkMoneyResult:
+    """Adds (or, for negative amounts, removes) wallet coins for many users in one write.
+
+    amounts maps user id -> coins. A debit never takes a wallet below 0; the users it
+    was cut short for are listed in the result's capped. With dry_run nothing is saved,
+    but the result shows exactly what would change.
+    """
+    result = BulkMoneyResult(dry_run)
+    merged: Dict[str, int] = {}
+    for user_id, amount in amounts.items():
+        merged[str(user_id)] = merged.get(str(user_id), 0) + amount
+    # No ids: the files are locked whole, which is one lock instead of one per user.
+    with economy_transaction() as txn:
+        for user_id, amount in merged.items():
+            if not amount:
+                continue
+            wallet = txn.get_money(user_id)
+            if amount < 0 and wallet + amount < 0:
+                amount = -max(wallet, 0)
+                result.capped.append(user_id)
+            if amount:
+                txn.add_money(user_id, amount, source=source)
+                result.changes[user_id] = (wallet, wallet + amount)
+        if dry_run:
+            txn.abort()
+    return result
 
 def load_chat_revive_channel() -> Optional[int]:
     return CHAT_REVIVE_CHANNEL_ID
@@ -727,15 +1069,7 @@ def save_chat_revive_channel(channel_id: int):
 
 def load_timed_roles():
     """Loads all timed roles from the JSON file."""
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    if not os.path.exists(TIMED_ROLES_FILE):
-        return {}
-    with open(TIMED_ROLES_FILE, 'r') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+    return load_data(TIMED_ROLES_FILE, {})
 
 def save_timed_role_data(guild_id, role_id, expiration_date=None, repeatable=False, day_of_week=None, hours=None):
     """
@@ -748,35 +1082,32 @@ def save_timed_role_data(guild_id, role_id, expiration_date=None, repeatable=Fal
         day_of_week (str): The day of the week for repeatable roles (e.g., 'Monday', 'daily').
         hours (int): The duration in hours for daily repeatable roles.
     """
-    all_timed_roles = load_timed_roles()
     guild_id_str = str(guild_id)
     role_id_str = str(role_id)
 
-    if guild_id_str not in all_timed_roles:
-        all_timed_roles[guild_id_str] = {}
-
-    all_timed_roles[guild_id_str][role_id_str] = {
-        "expiration_date": expiration_date,
-        "repeatable": repeatable,
-        "day_of_week": day_of_week,
-        "hours": hours
-    }
+    with key_locks.hold(TIMED_ROLES_FILE, guild_id_str):
+        all_timed_roles = load_timed_roles()
+        if guild_id_str not in all_timed_roles:
+            all_timed_roles[guild_id_str] = {}
 
-    # Initialize last_action_time for new daily repeatable roles
-    if repeatable and day_of_week == "daily":
-        all_timed_roles[guild_id_str][role_id_str]["last_action_time"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        all_timed_roles[guild_id_str][role_id_str] = {
+            "expiration_date": expiration_date,
+            "repeatable": repeatable,
+            "day_of_week": day_of_week,
+            "hours": hours
+        }
 
+        # Initialize last_action_time for new daily repeatable roles
+        if repeatable and day_of_week == "daily":
+            all_timed_roles[guild_id_str][role_id_str]["last_action_time"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-    with open(TIMED_ROLES_FILE, "w") as f:
-        json.dump(all_timed_roles, f, indent=4)
+        save_data(all_timed_roles, TIMED_ROLES_FILE)
 
 
 def save_timed_roles_full_data(data):
     """Saves the entire timed roles dictionary to the JSON file."""
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    with open(TIMED_ROLES_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    with key_locks.hold(TIMED_ROLES_FILE):
+        save_data(data, TIMED_ROLES_FILE)
 
 def load_last_image_post_date(user_id: int) -> Optional[datetime.datetime]:
     data = load_data(LAST_IMAGE_POST_FILE, {})
@@ -786,9 +1117,10 @@ def load_last_image_post_date(user_id: int) -> Optional[datetime.datetime]:
     return None
 
 def save_last_image_post_date(user_id: int, post_date: datetime.datetime):
-    data = load_data(LAST_IMAGE_POST_FILE, {})
-    data[str(user_id)] = post_date.isoformat()
-    save_data(data, LAST_IMAGE_POST_FILE)
+    with key_locks.hold(LAST_IMAGE_POST_FILE, user_id):
+        data = load_data(LAST_IMAGE_POST_FILE, {})
+        data[str(user_id)] = post_date.isoformat()
+        save_data(data, LAST_IMAGE_POST_FILE)
 
 def load_last_daily_post_date():
     return load_data(LAST_DAILY_POST_DATE_FILE, {})
@@ -800,40 +1132,59 @@ def save_last_daily_post_date(post_date: datetime.datetime, weekday_name: str):
 def rebuild_daily_posts():
     reload_globals()
 
-def load_counting_game_state():
-    return load_data(COUNTING_GAME_STATE_FILE, {
-        "counting_channel_id": COUNTING_CHANNEL_ID,
-        "current_count": 0,
-        "last_counter_id": None,
-        "guess_game_active": False,
-        "guess_game_number": 0,
-        "guess_attempts": 0,
-        "lucky_number": 0,
-        "lucky_number_active": False
-    })
+COUNTING_CHANNEL_DEFAULTS = {
+    "current_count": 0,
+    "last_counter_id": None,
+    "guess_game_active": False,
+    "guess_game_number": 0,
+    "guess_attempts": 0,
+    "lucky_number": 0,
+    "lucky_number_active": False
+}
+
+def load_counting_channels() -> Dict[int, Dict[str, Any]]:
+    """Returns the state of every counting channel, keyed by channel id.
 
-def save_counting_game_state(state: Dict[str, Any]):
-    save_data(state, COUNTING_GAME_STATE_FILE)
+    The file is {"channels": {"<channel id>": {...}}}. Older files hold one channel's
+    state at the top level with its id in "counting_channel_id"; they are read as that
+    channel and rewritten in the new shape on the next save.
+    """
+    state = load_data(COUNTING_GAME_STATE_FILE, {})
+    if "channels" in state:
+        channels = state["channels"]
+    else:
+        channel_id = state.get("counting_channel_id", COUNTING_CHANNEL_ID) if state else COUNTING_CHANNEL_ID
+        channels = {str(channel_id): state} if channel_id else {}
+    return {
+        int(channel_id): {**COUNTING_CHANNEL_DEFAULTS, **{key: value for key, value in channel_state.items() if key != "counting_channel_id"}}
+        for channel_id, channel_state in channels.items()
+    }
+
+def save_counting_channels(channels: Dict[int, Dict[str, Any]]):
+    save_data({"channels": {str(channel_id): state for channel_id, state in channels.items()}}, COUNTING_GAME_STATE_FILE)
 
 def check_if_user_counted(user_id: int) -> bool:
     counted_users = load_data(COUNTED_USERS_FILE, [])
     return str(user_id) in counted_users
 
 def set_user_counted(user_id: int):
-    counted_users = load_data(COUNTED_USERS_FILE, [])
-    user_id_str = str(user_id)
-    if user_id_str not in counted_users:
-        counted_users.append(user_id_str)
-        save_data(counted_users, COUNTED_USERS_FILE)
+    # The file is a plain list, so the whole file is locked.
+    with key_locks.hold(COUNTED_USERS_FILE):
+        counted_users = load_data(COUNTED_USERS_FILE, [])
+        user_id_str = str(user_id)
+        if user_id_str not in counted_users:
+            counted_users.append(user_id_str)
+            save_data(counted_users, COUNTED_USERS_FILE)
 
 def load_user_pins(user_id: int) -> list[str]:
     all_pins = load_data(PINS_FILE, {})
     return all_pins.get(str(user_id), [])
 
 def save_user_pins(user_id: int, pins: list[str]):
-    all_pins = load_data(PINS_FILE, {})
-    all_pins[str(user_id)] = pins
-    save_data(all_pins, PINS_FILE)
+    with key_locks.hold(PINS_FILE, user_id):
+        all_pins = load_data(PINS_FILE, {})
+        all_pins[str(user_id)] = pins
+        save_data(all_pins, PINS_FILE)
 
 def load_counting_preferences():
     return load_data(COUNTING_PREFERENCES_FILE, {
@@ -955,64 +1306,60 @@ def get_item_data(item_name: str) -> Optional[Dict[str, Any]]:
     items = load_items()
     return next((item for item in items if item['name'].lower() == item_name.lower()), None)
 
-def load_user_inventory(user_id: int) -> Dict[str, Any]:
+def load_user_inventory(user_id: int, default_value: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns a user's inventory, or default_value ({} if not given) if they have none yet."""
+    if default_value is None:
+        default_value = {}
+    if using_sqlite():
+        user_inventory = get_sqlite_store().get_inventory(user_id)
+        return user_inventory if user_inventory is not None else default_value
     inventory_data = load_data(USER_INVENTORY_FILE, {})
-    return inventory_data.get(str(user_id), {})
+    return inventory_data.get(str(user_id), default_value)
 
 def save_user_inventory(user_id: int, user_inventory: Dict[str, Any]):
-    inventory_data = load_data(USER_INVENTORY_FILE, {})
-    inventory_data[str(user_id)] = user_inventory
-    save_data(inventory_data, USER_INVENTORY_FILE)
+    if using_sqlite():
+        get_sqlite_store().put_inventory(user_id, user_inventory)
+        return
+    with key_locks.hold(USER_INVENTORY_FILE, user_id):
+        inventory_data = load_data(USER_INVENTORY_FILE, {})
+        inventory_data[str(user_id)] = user_inventory
+        save_data(inventory_data, USER_INVENTORY_FILE)
+
+def load_inventory(user_id: int, default_value: Optional[Dict[str, Any]] = None) -> Inventory:
+    """Returns a user's inventory as an Inventory, built from default_value if they have none yet.
+
+    The Inventory is a copy; pass it to save_inventory() to store changes.
+    """
+    return Inventory.from_record(load_user_inventory(user_id, default_value))
 
-def add_item_to_inventory(user_id: int, item_name: str, item_data: Optional[Dict[str, Any]] = None, count: int = 1):
-    """Adds a generic item to a user's inventory, handling stacks and nets."""
-    user_inventory_data = load_data(USER_INVENTORY_FILE, {})
-    user_data = user_inventory_data.get(str(user_id), {"items": {}, "nets": [], "net_durability": 0, "xp": 0})
+def save_inventory(user_id: int, inventory: Inventory):
+    save_user_inventory(user_id, inventory.to_record())
 
+def _add_item_to_inventory_model(inventory: Inventory, item_name: str, item_data: Optional[Dict[str, Any]] = None, count: int = 1):
+    """Adds an item to an Inventory, handling stacks and nets."""
     if item_data and item_data.get('type') == 'net':
-        # Add a new net entry
-        new_net = {
-            "name": item_name,
-            "durability": item_data.get("durability", 0)
-        }
-        user_data["nets"].append(new_net)
+        # Nets don't stack; each one keeps its own durability.
+        inventory.add_net(item_name, item_data.get("durability", 0))
     else:
-        # Handle regular items with a counter
-        user_items = user_data.get("items", {})
-        item_name_lower = item_name.lower()
-        user_items[item_name_lower] = user_items.get(item_name_lower, 0) + count
-        user_data["items"] = user_items
+        inventory.add_item(item_name, count)
 
-    user_inventory_data[str(user_id)] = user_data
-    save_data(user_inventory_data, USER_INVENTORY_FILE)
+def add_item_to_inventory(user_id: int, item_name: str, item_data: Optional[Dict[str, Any]] = None, count: int = 1):
+    """Adds a generic item to a user's inventory, handling stacks and nets."""
+    with key_locks.hold(USER_INVENTORY_FILE, user_id):
+        inventory = load_inventory(user_id)
+        _add_item_to_inventory_model(inventory, item_name, item_data, count)
+        save_inventory(user_id, inventory)
 
 def remove_item_from_inventory(user_id: int, item_name: str, count: int = 1):
     """Removes a specified number of items from a user's inventory."""
-    user_inventory_data = load_data(USER_INVENTORY_FILE, {})
-    user_data = user_inventory_data.get(str(user_id), {"items": {}, "nets": [], "net_durability": 0, "xp": 0})
-    user_items = user_data.get("items", {})
-    item_name_lower = item_name.lower()
-
-    if user_items.get(item_name_lower, 0) > count:
-        user_items[item_name_lower] -= count
-    else:
-        # If the count is greater than or equal to the total, remove the item completely.
-        if item_name_lower in user_items:
-            del user_items[item_name_lower]
-
-    user_data["items"] = user_items
-    user_inventory_data[str(user_id)] = user_data
-    save_data(user_inventory_data, USER_INVENTORY_FILE)
+    with key_locks.hold(USER_INVENTORY_FILE, user_id):
+        inventory = load_inventory(user_id)
+        # If the count is greater than or equal to the total, the item is removed completely.
+        inventory.remove_item(item_name, count)
+        save_inventory(user_id, inventory)
 
 async def handle_buy_item(interaction: discord.Interaction, item_to_buy: Dict[str, Any], quantity: int = 1, free_purchase: bool = False):
-    user_id = str(interaction.user.id)
-
-    # Get user money using the dedicated function
-    user_money = get_user_money(interaction.user.id)
-
-    # Load user inventory from the correct file (user_inventory.json)
-    user_inventory_data = load_data(USER_INVENTORY_FILE, {})
-    user_items = user_inventory_data.get(user_id, {}).get('items', {})
+    user_id = interaction.user.id
 
     total_price = item_to_buy.get('price', 0) * quantity
 
@@ -1027,27 +1374,37 @@ async def handle_buy_item(interaction: discord.Interaction, item_to_buy: Dict[st
         if not required_role:
             return await interaction.followup.send(f"You do not meet the requirement to buy this item. You need the '{required_role_name}' role.", ephemeral=True)
 
-    if not free_purchase:
-        if user_money < total_price:
-            return await interaction.followup.send("You don't have enough coins to purchase this item.", ephemeral=True)
-
-    # Update user's money
-    if not free_purchase:
-        update_user_money(interaction.user.id, -total_price)
+    # The balance check, the payment and the new items are committed together.
+    with economy_transaction(user_id) as txn:
+        can_afford = free_purchase or txn.get_money(user_id) >= total_price
+        if not can_afford:
+            txn.abort()
+        else:
+            if not free_purchase:
+                txn.add_money(user_id, -total_price, source="shop")
+
+            # Add item to inventory based on type
+            inventory = txn.inventory(user_id)
+            if item_to_buy.get('type') == 'net':
+                for _ in range(quantity):
+                    _add_item_to_inventory_model(inventory, item_to_buy.get('name'), item_data=item_to_buy)
+            else:
+                _add_item_to_inventory_model(inventory, item_to_buy.get('name'), count=quantity)
 
-    # Add item to inventory based on type
-    if item_to_buy.get('type') == 'net':
-        for _ in range(quantity):
-            add_item_to_inventory(interaction.user.id, item_to_buy.get('name'), item_data=item_to_buy)
-    else:
-        # This function call now uses the corrected argument name
-        add_item_to_inventory(interaction.user.id, item_to_buy.get('name'), count=quantity)
+    if not can_afford:
+        return await interaction.followup.send("You don't have enough coins to purchase this item.", ephemeral=True)
 
     await interaction.followup.send(f"Successfully purchased {quantity} '{item_to_buy.get('name')}' for {total_price} coins!", ephemeral=True)
 
-def load_swear_jar_data():
+def load_swear_jar_data(read_only: bool = False):
+    if read_only:
+        return load_data_view(SWEAR_JAR_FILE, {'words': [], 'tally': {}})
     return load_data(SWEAR_JAR_FILE, {'words': [], 'tally': {}})
 
+def add_swear_to_tally(user_id: int) -> int:
+    """Adds one swear to a user's tally and returns their new total."""
+    return increment_counter(SWEAR_JAR_FILE, 'tally', user_id, default_value={'words': [], 'tally': {}})
+
 def get_item_emoji(item_name: str, emoji_str: str) -> str:
     """Helper function to get the correct emoji string."""
     if emoji_str:
@@ -1095,15 +1452,6 @@ def save_tree_of_life_state(guild_id: int, state: Dict[str, Any]):
     game_data["trees"][str(guild_id)] = state
     save_tree_game_data(game_data)
 
-def load_user_cooldowns():
-    game_data = load_tree_game_data()
-    return game_data.get("user_cooldowns", {})
-
-def save_user_cooldowns(cooldowns: Dict[str, str]):
-    game_data = load_tree_game_data()
-    game_data["user_cooldowns"] = cooldowns
-    save_tree_game_data(game_data)
-
 def load_bump_battle_state():
     return load_data(BUMP_BATTLE_STATE_FILE, {
         'sub': {'points': 0, 'users': {}},
@@ -1113,11 +1461,81 @@ def load_bump_battle_state():
 def save_bump_battle_state(state: Dict[str, Any]):
     save_data(state, BUMP_BATTLE_STATE_FILE)
 
-def load_vote_cooldowns():
-    return load_data(VOTE_COOLDOWNS_FILE, {})
+# --- Cooldowns ---
 
-def save_vote_cooldowns(data: Dict[str, str]):
-    save_data(data, VOTE_COOLDOWNS_FILE)
+def _legacy_cooldowns() -> Dict[str, Dict[str, int]]:
+    """Reads the cooldowns kept in the tree and rewards files before COOLDOWNS_FILE existed."""
+    imported: Dict[str, Dict[str, int]] = {}
+
+    def add(bucket: str, user_id: str, timestamp: Any):
+        try:
+            imported.setdefault(bucket, {})[str(user_id)] = int(datetime.datetime.fromisoformat(timestamp).timestamp())
+        except (TypeError, ValueError):
+            pass
+
+    tree_cooldowns = load_data(TREE_FILE, {}).get("cooldowns", {})
+    for action_type in ("water", "bug_catch"):
+        for user_id, timestamp in tree_cooldowns.get(action_type, {}).items():
+            add(f"tree_{action_type}", user_id, timestamp)
+    for user_id, periods in load_data(REWARDS_FILE, {}).get("cooldowns", {}).items():
+        for period_type, timestamp in periods.items():
+            add(f"checkin_{period_type}", user_id, timestamp)
+    return imported
+
+def persistent_cooldown(bucket: str, seconds: float):
+    """Like app_commands.checks.cooldown(1, seconds) per user, but kept in COOLDOWNS_FILE,
+    so restarts and cog reloads don't reset it. Raises the same CommandOnCooldown."""
+    cooldowns.define(bucket, seconds)
+
+    def predicate(interaction: discord.Interaction) -> bool:
+        retry_after = cooldowns.try_use(bucket, interaction.user.id)
+        if retry_after > 0:
+            raise app_commands.CommandOnCooldown(app_commands.Cooldown(1, seconds), retry_after)
+        return True
+    return app_commands.check(predicate)
+
+# --- Leaderboards ---
+
+def _sorry_scores():
+    # User ids are top-level keys next to the swear jar's own keys and the *_last_apology timestamps.
+    sorry_jar = load_data(SORRY_COUNTS_FILE, {})
+    return [(key, count) for key, count in sorry_jar.items() if key.isdigit() and isinstance(count, int)]
+
+def _bump_scores(team: str):
+    return load_data(BUMP_BATTLE_STATE_FILE, {}).get(team, {}).get('users', {}).items()
+
+def _json_source(file_path: str):
+    return lambda: None if using_sqlite() else load_data(file_path, {})
+
+leaderboards.register(
+    "coins",
+    load=lambda: [(user_id, Balance.from_record(record).total) for user_id, record in load_all_balances().items()],
+    source=_json_source(BALANCES_FILE)
+)
+leaderboards.register(
+    "bugbook",
+    load=lambda: [(user_id, len(user_data.get('caught', []))) for user_id, user_data in load_bug_collection().items()],
+    source=_json_source(BUG_COLLECTION_FILE)
+)
+leaderboards.register(
+    "swears",
+    load=lambda: load_data(SWEAR_JAR_FILE, {}).get('tally', {}).items(),
+    source=lambda: load_data(SWEAR_JAR_FILE, {}),
+    counter=(SWEAR_JAR_FILE, ('tally',))
+)
+leaderboards.register("sorry", load=_sorry_scores, source=lambda: load_data(SORRY_COUNTS_FILE, {}), counter=(SORRY_COUNTS_FILE, ()))
+for _team in ('sub', 'dom'):
+    leaderboards.register(
+        f"bumps_{_team}",
+        load=lambda team=_team: _bump_scores(team),
+        source=lambda: load_data(BUMP_BATTLE_STATE_FILE, {}),
+        counter=(BUMP_BATTLE_STATE_FILE, (_team, 'users'))
+    )
+leaderboards.register(
+    "hangry_wins",
+    load=lambda: load_data(HANGRY_SERVER_WINS_FILE, {}).get(str(MAIN_GUILD_ID), {}).items(),
+    source=lambda: load_data(HANGRY_SERVER_WINS_FILE, {})
+)
 
 def load_vote_points():
     return load_data(VOTE_POINTS_FILE, {'subs': {}, 'doms': {}})
@@ -1138,8 +1556,7 @@ def get_ai_restrictions() -> str:
             Do not break character.
             Keep your responses concise and focused on the current scene.
         """).strip()
-        with open(ADVENTURE_AI_RESTRICTIONS_FILE, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(default_restrictions))
+        atomic_write_text(ADVENTURE_AI_RESTRICTIONS_FILE, '\n'.join(default_restrictions))
         return default_restrictions
     except Exception as e:
         print(f"Error loading AI restrictions: {e}")
@@ -1160,9 +1577,10 @@ def load_user_roles(user_id: int) -> list[int]:
 
 def save_user_roles(user_id: int, roles: list[int]):
     """Saves a user's roles to a JSON file."""
-    all_roles = load_data(USER_ROLES_FILE, {})
-    all_roles[str(user_id)] = roles
-    save_data(all_roles, USER_ROLES_FILE)
+    with key_locks.hold(USER_ROLES_FILE, user_id):
+        all_roles = load_data(USER_ROLES_FILE, {})
+        all_roles[str(user_id)] = roles
+        save_data(all_roles, USER_ROLES_FILE)
 
 def save_adventure_channel_id(channel_id: int):
     """Saves the adventure channel ID to the bot configuration."""
@@ -1201,10 +1619,43 @@ async def add_role_to_member(member: discord.Member, role_name: str):
             print(f"Failed to add role '{role_name}' to {member}. Bot lacks permissions or role hierarchy is wrong.")
 
 def load_bug_collection():
+    if using_sqlite():
+        return get_sqlite_store().all_bug_data()
     return load_data(BUG_COLLECTION_FILE, {})
 
 def save_bug_collection(data):
-    save_data(data, BUG_COLLECTION_FILE)
+    with key_locks.hold(BUG_COLLECTION_FILE):
+        leaderboards.invalidate("bugbook")
+        if using_sqlite():
+            get_sqlite_store().replace_bug_collection(data)
+            return
+        save_data(data, BUG_COLLECTION_FILE)
+
+def load_user_bug_data(user_id: int, default_value: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Returns one user's bug book entry without loading everyone else's on the SQLite backend."""
+    if default_value is None:
+        default_value = {"caught": [], "xp": 0, "shinies_caught": []}
+    if using_sqlite():
+        user_data = get_sqlite_store().get_bug_data(user_id)
+        return user_data if user_data is not None else default_value
+    return load_data(BUG_COLLECTION_FILE, {}).get(str(user_id), default_value)
+
+def save_user_bug_data(user_id: int, user_data: Dict[str, Any]):
+    leaderboards.update("bugbook", user_id, len(user_data.get("caught", [])))
+    if using_sqlite():
+        get_sqlite_store().put_bug_data(user_id, user_data)
+        return
+    with key_locks.hold(BUG_COLLECTION_FILE, user_id):
+        bug_collection = load_data(BUG_COLLECTION_FILE, {})
+        bug_collection[str(user_id)] = user_data
+        save_data(bug_collection, BUG_COLLECTION_FILE)
+
+def load_bug_book_entry(user_id: int) -> BugBookEntry:
+    """Returns a copy of a user's bug book entry as a BugBookEntry; save it with save_bug_book_entry()."""
+    return BugBookEntry.from_record(load_user_bug_data(user_id))
+
+def save_bug_book_entry(user_id: int, entry: BugBookEntry):
+    save_user_bug_data(user_id, entry.to_record())
 
 def load_pending_trades():
     return load_data(PENDING_TRADES_FILE, {})
@@ -1263,65 +1714,65 @@ async def generate_anagram_word_with_gemini() -> Optional[str]:
         print(f"Error during Gemini word generation: {e}")
         return None
 
-async def generate_work_phrase_with_gemini(is_success: bool) -> Optional[str]:
-    """Generates a new phrase for the work command using the Gemini AI."""
+def _parse_phrase_lines(text: str) -> List[str]:
+    """Splits a list of phrases from Gemini into clean phrases, dropping numbering and bullets."""
+    phrases = []
+    for line in text.splitlines():
+        phrase = re.sub(r'^\s*(?:[-*•]|\d+[.)])\s*', '', line).strip().strip('"\'').rstrip('.!').strip()
+        if 3 <= len(phrase) <= 200:
+            phrases.append(phrase)
+    return phrases
+
+async def _generate_phrases_with_gemini(prompt: str) -> List[str]:
     if not GEMINI_API_KEY:
         print("Gemini API not set. Skipping AI generation.")
-        return None
+        return []
     try:
         model = genai.GenerativeModel(DEFAULT_TRANSLATION_MODEL_NAME)
-        if is_success:
-            prompt = (
-                "Generate a single, short, and funny phrase describing a successful work task. "
-                "The tone should be slightly absurd and lighthearted, similar to these examples: "
-                "'worked as a chef in a bustling restaurant kitchen', "
-                "'answered customer calls with a smile as a call center representative'. "
-                "Do not include any extra text or punctuation."
-            )
-        else:
-            prompt = (
-                "Generate a single, short, and comically disastrous phrase for a failed work task. "
-                "The outcome should be ironic and humorous, similar to these examples: "
-                "'spilled coffee on the boss's new suit and were fired on the spot', "
-                "'lost an important file and had to pay for its replacement'. "
-                "Do not include any extra text or punctuation."
-            )
-
         response = await asyncio.wait_for(
             model.generate_content_async(prompt),
             timeout=AI_GENERATION_TIMEOUT
         )
-        return response.text.strip()
+        return _parse_phrase_lines(response.text)
     except Exception as e:
         print(f"Error during Gemini phrase generation: {e}")
-        return None
+        return []
 
-async def generate_crime_phrase_with_gemini(is_success: bool) -> Optional[str]:
-    """Generates a new phrase for the crime command using the Gemini AI."""
-    if not GEMINI_API_KEY:
-        print("Gemini API not set. Skipping AI generation.")
-        return None
-    try:
-        model = genai.GenerativeModel(DEFAULT_TRANSLATION_MODEL_NAME)
-        if is_success:
-            prompt = (
-                "Generate a single, short, and creative phrase describing an unexpectedly successful crime. "
-                "The phrase should be descriptive and slightly absurd. Do not include any extra text or punctuation."
-            )
-        else:
-            prompt = (
-                "Generate a single, short, and funny phrase describing a clumsy, failed crime attempt. "
-                "The phrasing should be embarrassing and humorous. Do not include any extra text or punctuation."
-            )
+async def generate_work_phrases_with_gemini(is_success: bool, count: int) -> List[str]:
+    """Generates count phrases for the work command in one Gemini request."""
+    if is_success:
+        prompt = (
+            f"Generate {count} different short and funny phrases, each describing a successful work task. "
+            "The tone should be slightly absurd and lighthearted, similar to these examples: "
+            "'worked as a chef in a bustling restaurant kitchen', "
+            "'answered customer calls with a smile as a call center representative'. "
+            "Put each phrase on its own line. Do not include any extra text, numbering or punctuation."
+        )
+    else:
+        prompt = (
+            f"Generate {count} different short and comically disastrous phrases, each for a failed work task. "
+            "The outcome should be ironic and humorous, similar to these examples: "
+            "'spilled coffee on the boss's new suit and were fired on the spot', "
+            "'lost an important file and had to pay for its replacement'. "
+            "Put each phrase on its own line. Do not include any extra text, numbering or punctuation."
+        )
+    return await _generate_phrases_with_gemini(prompt)
 
-        response = await asyncio.wait_for(
-            model.generate_content_async(prompt),
-            timeout=AI_GENERATION_TIMEOUT
+async def generate_crime_phrases_with_gemini(is_success: bool, count: int) -> List[str]:
+    """Generates count phrases for the crime command in one Gemini request."""
+    if is_success:
+        prompt = (
+            f"Generate {count} different short and creative phrases, each describing an unexpectedly successful crime. "
+            "The phrases should be descriptive and slightly absurd. "
+            "Put each phrase on its own line. Do not include any extra text, numbering or punctuation."
         )
-        return response.text.strip()
-    except Exception as e:
-        print(f"Error during Gemini phrase generation: {e}")
-        return None
+    else:
+        prompt = (
+            f"Generate {count} different short and funny phrases, each describing a clumsy, failed crime attempt. "
+            "The phrasing should be embarrassing and humorous. "
+            "Put each phrase on its own line. Do not include any extra text, numbering or punctuation."
+        )
+    return await _generate_phrases_with_gemini(prompt)
 
 def get_item_emoji(item_name: str, emoji_str: str) -> str:
     """Helper function to get the correct emoji string."""